@@ -5,11 +5,17 @@ from __future__ import annotations
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
+import hashlib
+import logging
 from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
+import numpy as np
+
 from ..config.settings import AttendanceRules, MetricThresholds
 from ..utils.issues import IssuePayload
-from ..utils.records import get_field
+from ..utils.record_store import RecordStore, RecordTable
+from ..utils.windowing import window_bounds, window_starts
+from .attendance_state import AttendanceState, Buckets, Contribution, StoredRecord, StoredStudent
 
 ABSENT_STATUSES = {
     "absent",
@@ -20,6 +26,16 @@ ABSENT_STATUSES = {
 }
 TARDY_STATUSES = {"tardy", "late"}
 
+logger = logging.getLogger(__name__)
+
+# Columns read by _normalize_attendance (exact names) and _index_students
+# (RecordTable column keys). Fetch projection only downloads these columns.
+ATTENDANCE_SOURCE_FIELDS = [
+    "Student", "student_id", "Class", "class_id", "Date", "date", "Status", "status",
+    "Minutes Attended", "minutes_attended", "Scheduled Minutes", "minutes_scheduled",
+]
+STUDENT_SOURCE_FIELDS = ["enrollment_start", "Enrollment Date", "classes_per_week", "Classes Per Week"]
+
 
 @dataclass
 class AttendanceEntry:
@@ -51,18 +67,38 @@ class StudentInfo:
     classes_per_week: Optional[float]
 
 
-def run(records: Dict[str, list], attendance_rules: AttendanceRules) -> List[IssuePayload]:
-    attendance_entries = _normalize_attendance(records.get("attendance", []))
-    if not attendance_entries:
-        return []
-    students = _index_students(records.get("students", []))
-    grouped = defaultdict(list)
-    for entry in attendance_entries:
-        grouped[entry.student_id].append(entry)
+def run(
+    records: Dict[str, list],
+    attendance_rules: AttendanceRules,
+    state: Optional[AttendanceState] = None,
+) -> List[IssuePayload]:
+    """Run attendance anomaly checks.
+
+    Args:
+        records: Dictionary mapping entity names to lists of raw records
+        attendance_rules: Metric thresholds, grace period and schedule threshold
+        state: Optional AttendanceState; only attendance records changed since
+            the last run are normalized, and only their students' metrics are
+            recomputed.
+    """
+    raw_records = records.get("attendance", [])
+    metrics_by_student = None
+    # An empty attendance table (not fetched) leaves the state alone
+    if state is not None and raw_records:
+        students = _index_students(RecordStore.wrap(records).table("students"))
+        metrics_by_student = _incremental_metrics(state, raw_records, students, attendance_rules)
+    if metrics_by_student is None:
+        attendance_entries = _normalize_attendance(raw_records)
+        if not attendance_entries:
+            return []
+        students = _index_students(RecordStore.wrap(records).table("students"))
+        grouped = defaultdict(list)
+        for entry in attendance_entries:
+            grouped[entry.student_id].append(entry)
+        metrics_by_student = _calculate_all_metrics(grouped, students, attendance_rules)
+
     issues: List[IssuePayload] = []
-    for student_id, entries in grouped.items():
-        student_info = students.get(student_id)
-        metrics = _calculate_metrics(entries, student_info, attendance_rules)
+    for student_id, metrics in metrics_by_student.items():
         for metric_name, value in metrics.items():
             severity, threshold = _classify(metric_name, value, attendance_rules.thresholds.get(metric_name))
             if severity:
@@ -124,19 +160,19 @@ def _normalize_attendance(records: Iterable[dict]) -> List[AttendanceEntry]:
     return entries
 
 
-def _index_students(records: Iterable[dict]) -> Dict[str, StudentInfo]:
+def _index_students(table: RecordTable) -> Dict[str, StudentInfo]:
     indexed: Dict[str, StudentInfo] = {}
-    for record in records:
-        record_id = record.get("id")
-        fields = record.get("fields", {})
-        enrollment_start = _parse_date(
-            get_field(fields, "enrollment_start") or get_field(fields, "Enrollment Date")
-        )
-        classes_per_week = _to_float(get_field(fields, "classes_per_week") or get_field(fields, "Classes Per Week"))
+    for record_id, start, start_alt, per_week, per_week_alt in zip(
+        table.ids,
+        table.column("enrollment_start"),
+        table.column("Enrollment Date"),
+        table.column("classes_per_week"),
+        table.column("Classes Per Week"),
+    ):
         indexed[record_id] = StudentInfo(
             record_id=record_id,
-            enrollment_start=enrollment_start,
-            classes_per_week=classes_per_week,
+            enrollment_start=_parse_date(start or start_alt),
+            classes_per_week=_to_float(per_week or per_week_alt),
         )
     return indexed
 
@@ -178,6 +214,436 @@ def _calculate_metrics(
     return metrics
 
 
+# ---------------------------------------------------------------------------
+# Vectorized metrics
+# ---------------------------------------------------------------------------
+
+# date(1970, 1, 1).toordinal(): converts date ordinals to datetime64[D]
+_EPOCH_ORDINAL = 719163
+
+# Metric order of _calculate_metrics
+_METRIC_NAMES = (
+    "absence_rate_30d",
+    "absences_4w",
+    "absence_rate_term",
+    "consecutive_absences",
+    "consecutive_weeks_absences",
+    "tardy_rate",
+    "partial_attendance",
+)
+
+
+def _calculate_all_metrics(
+    grouped: Dict[str, List[AttendanceEntry]],
+    students: Dict[str, StudentInfo],
+    rules: AttendanceRules,
+) -> Dict[str, Dict[str, float]]:
+    """_calculate_metrics for every student at once.
+
+    Entries become flat arrays (student index, date ordinal, status code,
+    class code, minutes) and go through _metrics_from_rows with a weight of
+    one entry per row. Values are identical to the per-student
+    implementation, and students without entries after the onboarding grace
+    period are omitted the same way.
+
+    Args:
+        grouped: Student id -> that student's entries (every list non-empty)
+        students: Student id -> StudentInfo
+        rules: Attendance rules (grace period, limited schedule threshold)
+
+    Returns:
+        Student id -> metric name -> value, in ``grouped`` order
+    """
+    student_ids = list(grouped)
+    if not student_ids:
+        return {}
+    entries = [entry for student_id in student_ids for entry in grouped[student_id]]
+    n = len(entries)
+    counts = np.fromiter((len(grouped[student_id]) for student_id in student_ids), dtype=np.int64)
+    student = np.repeat(np.arange(len(student_ids), dtype=np.int64), counts)
+    day = np.fromiter((entry.date.toordinal() for entry in entries), dtype=np.int64, count=n)
+
+    status_codes: Dict[str, int] = {}
+    status = np.fromiter(
+        (status_codes.setdefault(entry.status, len(status_codes)) for entry in entries), dtype=np.int64, count=n
+    )
+    absent = np.array([name in ABSENT_STATUSES for name in status_codes], dtype=np.int64)[status]
+    tardy = np.array([name in TARDY_STATUSES for name in status_codes], dtype=np.int64)[status]
+
+    class_codes: Dict[str, int] = {}
+    class_code = np.fromiter(
+        (class_codes.setdefault(entry.class_id, len(class_codes)) if entry.class_id else -1 for entry in entries),
+        dtype=np.int64,
+        count=n,
+    )
+    attended = np.fromiter(
+        (np.nan if entry.minutes_attended is None else entry.minutes_attended for entry in entries),
+        dtype=np.float64,
+        count=n,
+    )
+    scheduled = np.fromiter(
+        (np.nan if entry.minutes_scheduled is None else entry.minutes_scheduled for entry in entries),
+        dtype=np.float64,
+        count=n,
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        partial = ((scheduled > 0) & ~np.isnan(attended) & (attended / scheduled < 0.5)).astype(np.int64)
+
+    return _metrics_from_rows(
+        student_ids,
+        [students.get(student_id) for student_id in student_ids],
+        rules,
+        student,
+        day,
+        class_code,
+        np.ones(n, dtype=np.int64),
+        absent,
+        tardy,
+        partial,
+    )
+
+
+def _metrics_from_rows(
+    student_ids: List[str],
+    infos: List[Optional[StudentInfo]],
+    rules: AttendanceRules,
+    student: np.ndarray,
+    day: np.ndarray,
+    class_code: np.ndarray,
+    entries: np.ndarray,
+    absent: np.ndarray,
+    tardy: np.ndarray,
+    partial: np.ndarray,
+) -> Dict[str, Dict[str, float]]:
+    """Metrics for every student from weighted attendance rows.
+
+    A row is one entry, or a day bucket of several entries with the same
+    student, date and class; ``entries``, ``absent``, ``tardy`` and
+    ``partial`` are its counts. Windowed counts are prefix-sum differences
+    between searchsorted bounds on a (student, date) key; streaks are run
+    lengths over sorted unique (student, class, date) and (student, week)
+    rows.
+
+    Args:
+        student_ids: Student ids, in output order
+        infos: StudentInfo per student id (None if unknown)
+        rules: Attendance rules (grace period, limited schedule threshold)
+        student: Index into ``student_ids`` per row
+        day: Date ordinal per row
+        class_code: Class per row as a non-negative code, -1 for no class
+        entries, absent, tardy, partial: Counts per row
+
+    Returns:
+        Student id -> metric name -> value, for students with entries
+        after the grace period
+    """
+    groups = len(student_ids)
+    # Anchor is the latest entry before the grace filter, as in _calculate_metrics
+    anchor = np.zeros(groups, dtype=np.int64)
+    np.maximum.at(anchor, student, day)
+    cutoff = np.array(
+        [
+            (info.enrollment_start + timedelta(days=rules.onboarding_grace_days)).toordinal()
+            if info and info.enrollment_start
+            else 0
+            for info in infos
+        ],
+        dtype=np.int64,
+    )
+    keep = day >= cutoff[student]
+
+    student, day, class_code = student[keep], day[keep], class_code[keep]
+    entries, absent, tardy, partial = entries[keep], absent[keep], tardy[keep], partial[keep]
+
+    # Rows ordered by (student, date); the stride leaves each student's
+    # 30-day window clear of the previous student's dates
+    stride = int(day.max()) + 31 if len(day) else 1
+    key = student * stride + day
+    order = np.argsort(key, kind="stable")
+    key = key[order]
+    entries_sum = np.concatenate(([0], np.cumsum(entries[order])))
+    absent_sum = np.concatenate(([0], np.cumsum(absent[order])))
+    partial_sum = np.concatenate(([0], np.cumsum(partial[order])))
+    ends = np.cumsum(np.bincount(student, minlength=groups))
+    firsts = np.concatenate(([0], ends[:-1]))
+    group = np.arange(groups, dtype=np.int64)
+
+    def window(prefix: np.ndarray, days: int) -> np.ndarray:
+        # No row is after its student's anchor, so every window ends at ``ends``
+        return prefix[ends] - prefix[window_starts(key, group * stride + anchor, days)]
+
+    total_30d = window(entries_sum, 30)
+    absent_30d = window(absent_sum, 30)
+    absences_4w = window(absent_sum, 28).astype(np.float64)
+    partial_30d = window(partial_sum, 30).astype(np.float64)
+    total = entries_sum[ends] - entries_sum[firsts]
+    absent_term = (absent_sum[ends] - absent_sum[firsts]).astype(np.float64)
+    tardy_term = np.bincount(student, weights=tardy, minlength=groups)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate_30d = np.where(total_30d > 0, absent_30d / np.maximum(total_30d, 1), 0.0)
+        rate_term = np.where(total > 0, absent_term / np.maximum(total, 1), 0.0)
+        tardy_rate = np.where(total > 0, tardy_term / np.maximum(total, 1), 0.0)
+
+    # Limited schedules use small denominators
+    limited = np.array(
+        [
+            bool(info and info.classes_per_week and info.classes_per_week < rules.limited_schedule_threshold)
+            for info in infos
+        ],
+        dtype=bool,
+    ) & (total > 0)
+    rate_30d = np.where(limited, absences_4w / np.maximum(total, 1), rate_30d)
+    rate_term = np.where(limited, absent_term / np.maximum(total, 1), rate_term)
+
+    absent_rows = absent > 0
+    consecutive = _vectorized_max_consecutive(student, class_code, day, absent_rows, groups)
+    consecutive_weeks = _vectorized_consecutive_weeks(student, day, absent_rows, groups)
+
+    results: Dict[str, Dict[str, float]] = {}
+    columns = zip(
+        student_ids,
+        total.tolist(),
+        rate_30d.tolist(),
+        absences_4w.tolist(),
+        rate_term.tolist(),
+        consecutive.tolist(),
+        consecutive_weeks.tolist(),
+        tardy_rate.tolist(),
+        partial_30d.tolist(),
+    )
+    for student_id, count, *values in columns:
+        if count:
+            results[student_id] = dict(zip(_METRIC_NAMES, values))
+    return results
+
+
+def _run_lengths(starts_run: np.ndarray, owner: np.ndarray, groups: int) -> np.ndarray:
+    """Longest run per group, given run-start flags and each row's group."""
+    best = np.zeros(groups, dtype=np.float64)
+    if not len(starts_run):
+        return best
+    lengths = np.bincount(np.cumsum(starts_run) - 1)
+    np.maximum.at(best, owner[starts_run], lengths)
+    return best
+
+
+def _vectorized_max_consecutive(
+    student: np.ndarray, class_code: np.ndarray, day: np.ndarray, absent: np.ndarray, groups: int
+) -> np.ndarray:
+    """_max_consecutive per student: absence streaks per class, gaps of at most 7 days."""
+    mask = absent & (class_code >= 0)
+    student, class_code, day = student[mask], class_code[mask], day[mask]
+    order = np.lexsort((day, class_code, student))
+    student, class_code, day = student[order], class_code[order], day[order]
+    # Streaks count distinct dates: drop repeats of the same class date
+    repeat = np.zeros(len(day), dtype=bool)
+    repeat[1:] = (student[1:] == student[:-1]) & (class_code[1:] == class_code[:-1]) & (day[1:] == day[:-1])
+    student, class_code, day = student[~repeat], class_code[~repeat], day[~repeat]
+    same_class = np.zeros(len(day), dtype=bool)
+    same_class[1:] = (student[1:] == student[:-1]) & (class_code[1:] == class_code[:-1])
+    gap = np.zeros(len(day), dtype=np.int64)
+    gap[1:] = np.diff(day)
+    return _run_lengths(~(same_class & (gap <= 7)), student, groups)
+
+
+def _vectorized_consecutive_weeks(
+    student: np.ndarray, day: np.ndarray, absent: np.ndarray, groups: int
+) -> np.ndarray:
+    """_consecutive_weeks_with_absences per student over ISO weeks."""
+    student, day = student[absent], day[absent]
+    # Ordinal 1 (0001-01-01) is a Monday, so this numbers Monday-Sunday weeks
+    week = (day - 1) // 7
+    stride = int(week.max()) + 1 if len(week) else 1
+    key = np.unique(student * stride + week)
+    student, week = key // stride, key % stride
+    # ISO week of each week: the week holding its Thursday, counted from Jan 1
+    thursday = week * 7 + 4
+    jan1 = (
+        (thursday - _EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[Y]").astype("datetime64[D]").astype(np.int64)
+        + _EPOCH_ORDINAL
+    )
+    iso_week = (thursday - jan1) // 7 + 1
+    same_student = np.zeros(len(week), dtype=bool)
+    same_student[1:] = student[1:] == student[:-1]
+    step = np.zeros(len(week), dtype=np.int64)
+    step[1:] = np.diff(week)
+    # _consecutive_weeks_with_absences also chains week 52 into week 1 of the
+    # next ISO year when that year had a week 53 in between
+    follows = (step == 1) | ((step == 2) & (np.roll(iso_week, 1) == 52) & (iso_week == 1))
+    return _run_lengths(~(same_student & follows), student, groups)
+
+
+# ---------------------------------------------------------------------------
+# Cross-run state
+# ---------------------------------------------------------------------------
+
+
+def _incremental_metrics(
+    state: AttendanceState,
+    raw_records: List[dict],
+    students: Dict[str, StudentInfo],
+    rules: AttendanceRules,
+) -> Optional[Dict[str, Dict[str, float]]]:
+    """_calculate_all_metrics via the AttendanceState, saving this run's state.
+
+    Changed and removed attendance records move their counts between the
+    stored day buckets; metrics are recomputed for students whose buckets or
+    fingerprint changed and reused for everyone else.
+
+    Returns:
+        Student id -> metric name -> value in first-entry order, or None if
+        the state can't be used for these records (missing or repeated
+        record ids, unreadable state); the caller computes from scratch.
+    """
+    with state.lock:
+        stored = state.load()
+        # Record id -> student id (None for records normalization skips)
+        student_of: Dict[str, Optional[str]] = {}
+        changed: Dict[str, StoredRecord] = {}
+        for record in raw_records:
+            record_id = record.get("id")
+            if not record_id or record_id in student_of:
+                return None
+            digest = _record_digest(record)
+            previous = stored.records.get(record_id)
+            if previous is not None and previous[0] == digest:
+                student_of[record_id] = previous[1]
+                continue
+            entries = _normalize_attendance([record])
+            contribution = _contribution(entries[0]) if entries else None
+            student_of[record_id] = contribution.student_id if contribution else None
+            changed[record_id] = StoredRecord(digest, contribution)
+        removed = [record_id for record_id in stored.records if record_id not in student_of]
+        previous_contributions = state.load_contributions(
+            record_id for record_id in [*changed, *removed] if record_id in stored.records
+        )
+        if previous_contributions is None:
+            return None
+
+        deltas: Dict[str, Buckets] = defaultdict(dict)
+
+        def shift(contribution: Optional[Contribution], sign: int) -> None:
+            if contribution is None:
+                return
+            bucket = deltas[contribution.student_id].setdefault(
+                (contribution.day, contribution.class_id), [0, 0, 0, 0]
+            )
+            bucket[0] += sign
+            bucket[1] += sign * contribution.absent
+            bucket[2] += sign * contribution.tardy
+            bucket[3] += sign * contribution.partial
+
+        for contribution in previous_contributions.values():
+            shift(contribution, -1)
+        for record in changed.values():
+            shift(record.contribution, 1)
+
+        # Students in order of their first entry, like the grouped entries
+        student_ids = [student_id for student_id in dict.fromkeys(student_of.values()) if student_id is not None]
+        fingerprints = {student_id: _student_fingerprint(students.get(student_id), rules) for student_id in student_ids}
+        recompute = [
+            student_id
+            for student_id in student_ids
+            if student_id in deltas
+            or student_id not in stored.students
+            or stored.students[student_id].fingerprint != fingerprints[student_id]
+        ]
+        removed_students = [student_id for student_id in stored.students if student_id not in fingerprints]
+
+        buckets = state.load_buckets(student_id for student_id in recompute if student_id in stored.students)
+        if buckets is None:
+            return None
+        for student_id in recompute:
+            student_buckets = buckets.setdefault(student_id, {})
+            for key, delta in deltas.get(student_id, {}).items():
+                counts = [a + b for a, b in zip(student_buckets.get(key, [0, 0, 0, 0]), delta)]
+                if counts[0]:
+                    student_buckets[key] = counts
+                else:
+                    student_buckets.pop(key, None)
+        fresh = _metrics_from_buckets(recompute, buckets, students, rules)
+
+        state.save(
+            changed,
+            removed,
+            {
+                student_id: StoredStudent(fingerprints[student_id], fresh.get(student_id, {}), buckets[student_id])
+                for student_id in recompute
+            },
+            removed_students,
+        )
+    logger.info(
+        "Attendance state reused prior metrics",
+        extra={
+            "records": len(student_of),
+            "records_changed": len(changed),
+            "records_removed": len(removed),
+            "students": len(student_ids),
+            "students_recomputed": len(recompute),
+        },
+    )
+
+    results: Dict[str, Dict[str, float]] = {}
+    recomputed = set(recompute)
+    for student_id in student_ids:
+        metrics = fresh.get(student_id) if student_id in recomputed else stored.students[student_id].metrics
+        if metrics:
+            results[student_id] = metrics
+    return results
+
+
+def _record_digest(record: dict) -> str:
+    """Hash of the columns _normalize_attendance reads."""
+    fields = record.get("fields", {})
+    payload = repr([fields.get(name) for name in ATTENDANCE_SOURCE_FIELDS])
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _contribution(entry: AttendanceEntry) -> Contribution:
+    return Contribution(
+        student_id=entry.student_id,
+        day=entry.date.toordinal(),
+        class_id=entry.class_id or "",
+        absent=int(entry.is_absent),
+        tardy=int(entry.is_tardy),
+        partial=int(_is_partial(entry)),
+    )
+
+
+def _student_fingerprint(info: Optional[StudentInfo], rules: AttendanceRules) -> str:
+    """Every input besides a student's entries that their metrics depend on."""
+    return repr(
+        (
+            info.enrollment_start.isoformat() if info and info.enrollment_start else None,
+            info.classes_per_week if info else None,
+            rules.onboarding_grace_days,
+            rules.limited_schedule_threshold,
+        )
+    )
+
+
+def _metrics_from_buckets(
+    student_ids: List[str],
+    buckets: Dict[str, Buckets],
+    students: Dict[str, StudentInfo],
+    rules: AttendanceRules,
+) -> Dict[str, Dict[str, float]]:
+    """_metrics_from_rows over stored day buckets."""
+    class_codes: Dict[str, int] = {}
+    rows = [
+        (index, day, class_codes.setdefault(class_id, len(class_codes)) if class_id else -1, *counts)
+        for index, student_id in enumerate(student_ids)
+        for (day, class_id), counts in buckets[student_id].items()
+    ]
+    if not rows:
+        return {}
+    columns = np.array(rows, dtype=np.int64).T
+    return _metrics_from_rows(
+        student_ids, [students.get(student_id) for student_id in student_ids], rules, *columns
+    )
+
+
 def _absence_rate(entries: List[AttendanceEntry], anchor: date, window_days: Optional[int]) -> float:
     window_entries = _window_entries(entries, anchor, window_days)
     total = len(window_entries)
@@ -282,22 +748,27 @@ def _tardy_rate(entries: List[AttendanceEntry]) -> float:
 
 def _partial_count(entries: List[AttendanceEntry], anchor: date, window_days: Optional[int]) -> float:
     window_entries = _window_entries(entries, anchor, window_days)
-    count = 0
-    for entry in window_entries:
-        if entry.minutes_attended is None or entry.minutes_scheduled is None:
-            continue
-        if entry.minutes_scheduled <= 0:
-            continue
-        ratio = entry.minutes_attended / entry.minutes_scheduled
-        if ratio < 0.5:
-            count += 1
-    return float(count)
+    return float(sum(1 for entry in window_entries if _is_partial(entry)))
+
+
+def _is_partial(entry: AttendanceEntry) -> bool:
+    if entry.minutes_attended is None or entry.minutes_scheduled is None:
+        return False
+    if entry.minutes_scheduled <= 0:
+        return False
+    return entry.minutes_attended / entry.minutes_scheduled < 0.5
 
 
 def _window_entries(entries: List[AttendanceEntry], anchor: date, window_days: Optional[int]) -> List[AttendanceEntry]:
+    """Entries (sorted by date) in the ``window_days`` ending at ``anchor``."""
     if window_days is None:
         return entries
-    return [entry for entry in entries if 0 <= (anchor - entry.date).days < window_days]
+    start, end = window_bounds(entries, window_days, anchor, key=_entry_date)
+    return entries[start:end]
+
+
+def _entry_date(entry: AttendanceEntry) -> date:
+    return entry.date
 
 
 def _classify(metric: str, value: float, thresholds: Optional[MetricThresholds]) -> Tuple[Optional[str], Optional[float]]:
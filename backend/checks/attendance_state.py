@@ -0,0 +1,266 @@
+"""Persistent attendance state reused across runs.
+
+A SQLite file on local disk remembers, after the last run:
+
+    records   attendance record id -> content hash and the day bucket it
+              counted in (student, date, class, absent/tardy/partial flags)
+    students  student id -> day buckets (entry, absence, tardy and partial
+              counts per date and class), plus the metrics derived from them
+              and a fingerprint of their other inputs (enrollment start,
+              classes per week, grace period and schedule threshold)
+
+A run only normalizes attendance records whose content hash changed, moves
+their counts between buckets, and recomputes metrics for students whose
+buckets or fingerprint changed; every other student reuses last run's
+metrics. Windowed counts, class streaks and ISO-week absence sets are all
+derived from the buckets, so edits and deletions of old rows stay exact.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..utils.local_state import ProcessDefault, SQLiteState, state_enabled, state_path
+
+ATTENDANCE_STATE_PATH = state_path("ATTENDANCE_STATE_PATH", "attendance-state.sqlite3")
+ATTENDANCE_STATE_ENABLED = state_enabled("ATTENDANCE_STATE_ENABLED")
+
+# Bump when normalization or metric code changes in a way that makes stored
+# buckets or metrics stale
+STATE_FORMAT_VERSION = 1
+
+# (date ordinal, class id or "") -> [entries, absent, tardy, partial]
+Buckets = Dict[Tuple[int, str], List[int]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    record_id TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    student_id TEXT,
+    day INTEGER,
+    class_id TEXT,
+    absent INTEGER,
+    tardy INTEGER,
+    partial INTEGER
+);
+CREATE TABLE IF NOT EXISTS students (
+    student_id TEXT PRIMARY KEY,
+    buckets TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    metrics TEXT NOT NULL
+);
+"""
+
+# SQLite's default limit on host parameters per statement is 999
+_IN_CHUNK = 500
+
+
+@dataclass(frozen=True)
+class Contribution:
+    """The bucket one attendance record counts in."""
+
+    student_id: str
+    day: int
+    class_id: str
+    absent: int
+    tardy: int
+    partial: int
+
+
+@dataclass
+class StoredRecord:
+    content_hash: str
+    # None for records normalization skipped (no student or date)
+    contribution: Optional[Contribution]
+
+
+@dataclass
+class StoredStudent:
+    fingerprint: str
+    metrics: Dict[str, float]
+    buckets: Optional[Buckets] = None
+
+
+@dataclass
+class StoredAttendance:
+    """State after the last run; contributions and buckets are loaded on demand."""
+
+    # Record id -> (content hash, student id or None)
+    records: Dict[str, Tuple[str, Optional[str]]] = field(default_factory=dict)
+    students: Dict[str, StoredStudent] = field(default_factory=dict)
+
+
+class AttendanceState(SQLiteState):
+    """Reads and updates the on-disk attendance state (empty after any error)."""
+
+    SCHEMA = _SCHEMA
+    LABEL = "attendance state"
+
+    def __init__(self, path: str | os.PathLike = ATTENDANCE_STATE_PATH):
+        super().__init__(path)
+        # One pass at a time: load, update and save must not interleave
+        self.lock = threading.RLock()
+
+    def load(self) -> StoredAttendance:
+        """Load record hashes and per-student metrics (empty if never saved)."""
+        with self.lock:
+            try:
+                conn = self._connect()
+                try:
+                    row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+                    if row is None or row[0] != str(STATE_FORMAT_VERSION):
+                        # Stale rows would be subtracted from buckets they were never added to
+                        with conn:
+                            conn.execute("DELETE FROM records")
+                            conn.execute("DELETE FROM students")
+                        return StoredAttendance()
+                    records = {
+                        record_id: (digest, student_id)
+                        for record_id, digest, student_id in conn.execute(
+                            "SELECT record_id, content_hash, student_id FROM records"
+                        )
+                    }
+                    students = {
+                        student_id: StoredStudent(fingerprint, json.loads(metrics))
+                        for student_id, fingerprint, metrics in conn.execute(
+                            "SELECT student_id, fingerprint, metrics FROM students"
+                        )
+                    }
+                finally:
+                    conn.close()
+            except Exception as exc:
+                self._discard(exc)
+                return StoredAttendance()
+        return StoredAttendance(records, students)
+
+    def load_contributions(self, record_ids: Iterable[str]) -> Optional[Dict[str, Contribution]]:
+        """Contributions of ``record_ids`` (skipped or unknown records are left out).
+
+        Returns None if the state couldn't be read; it has been discarded.
+        """
+        contributions: Dict[str, Contribution] = {}
+        try:
+            for record_id, *row in self._select_in(
+                "SELECT record_id, student_id, day, class_id, absent, tardy, partial FROM records "
+                "WHERE student_id IS NOT NULL AND record_id IN ({})",
+                record_ids,
+            ):
+                contributions[record_id] = Contribution(*row)
+        except Exception as exc:
+            self._discard(exc)
+            return None
+        return contributions
+
+    def load_buckets(self, student_ids: Iterable[str]) -> Optional[Dict[str, Buckets]]:
+        """Day buckets of ``student_ids`` (students never saved are left out).
+
+        Returns None if the state couldn't be read; it has been discarded.
+        """
+        buckets: Dict[str, Buckets] = {}
+        try:
+            for student_id, payload in self._select_in(
+                "SELECT student_id, buckets FROM students WHERE student_id IN ({})", student_ids
+            ):
+                buckets[student_id] = {(day, class_id): counts for day, class_id, *counts in json.loads(payload)}
+        except Exception as exc:
+            self._discard(exc)
+            return None
+        return buckets
+
+    def _select_in(self, query: str, keys: Iterable[str]) -> List[Tuple]:
+        """Rows of ``query`` with its IN ({}) list bound to ``keys``, in chunks."""
+        keys = list(keys)
+        rows: List[Tuple] = []
+        with self.lock:
+            conn = self._connect()
+            try:
+                for start in range(0, len(keys), _IN_CHUNK):
+                    chunk = keys[start:start + _IN_CHUNK]
+                    rows.extend(conn.execute(query.format(",".join("?" * len(chunk))), chunk))
+            finally:
+                conn.close()
+        return rows
+
+    def save(
+        self,
+        records: Dict[str, StoredRecord],
+        removed_ids: Iterable[str],
+        students: Dict[str, StoredStudent],
+        removed_students: Iterable[str],
+    ) -> None:
+        """Apply this run's changes in one transaction.
+
+        Args:
+            records: New or changed attendance records
+            removed_ids: Attendance records that no longer exist
+            students: Students whose buckets or metrics were recomputed
+                (``buckets`` must be set)
+            removed_students: Students left without attendance records
+        """
+        with self.lock:
+            try:
+                conn = self._connect()
+                try:
+                    with conn:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(STATE_FORMAT_VERSION),)
+                        )
+                        conn.executemany(
+                            "DELETE FROM records WHERE record_id = ?", [(record_id,) for record_id in removed_ids]
+                        )
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            [
+                                (record_id, stored.content_hash, *_contribution_row(stored.contribution))
+                                for record_id, stored in records.items()
+                            ],
+                        )
+                        conn.executemany(
+                            "DELETE FROM students WHERE student_id = ?",
+                            [(student_id,) for student_id in removed_students],
+                        )
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO students VALUES (?, ?, ?, ?)",
+                            [
+                                (
+                                    student_id,
+                                    json.dumps([[day, class_id, *counts] for (day, class_id), counts in stored.buckets.items()]),
+                                    stored.fingerprint,
+                                    json.dumps(stored.metrics),
+                                )
+                                for student_id, stored in students.items()
+                            ],
+                        )
+                finally:
+                    conn.close()
+            except Exception as exc:
+                self._discard(exc)
+
+
+def _contribution_row(contribution: Optional[Contribution]) -> Tuple:
+    if contribution is None:
+        return (None, None, None, None, None, None)
+    return (
+        contribution.student_id,
+        contribution.day,
+        contribution.class_id,
+        contribution.absent,
+        contribution.tardy,
+        contribution.partial,
+    )
+
+
+_default_state = ProcessDefault(AttendanceState, ATTENDANCE_STATE_ENABLED)
+
+
+def get_attendance_state() -> Optional[AttendanceState]:
+    """Process-wide state at ATTENDANCE_STATE_PATH, or None when disabled."""
+    return _default_state.get()
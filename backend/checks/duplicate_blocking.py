@@ -0,0 +1,164 @@
+"""Candidate pair generation for duplicate detection.
+
+Duplicate detection only compares records that share a block key. Comparing
+every pair inside a block is quadratic, so one large block (a shared school
+phone number, a common soundex + campus key) can stall a run. Blocks larger
+than DUPLICATE_MAX_BLOCK_SIZE are sub-blocked with MinHash/LSH on name
+shingles, and any sub-block that is still too large falls back to a
+sorted-neighbourhood window over normalized names.
+
+The strategy is pluggable through DUPLICATE_BLOCKING_STRATEGY:
+    capped               all pairs for small blocks, LSH + window for large ones (default)
+    exact                all pairs in every block (previous behaviour)
+    sorted_neighbourhood window over normalized names in every block
+    lsh                  LSH sub-blocks in every block
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import zlib
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Blocks with more records than this are sub-blocked instead of compared exhaustively
+DUPLICATE_MAX_BLOCK_SIZE = int(os.getenv("DUPLICATE_MAX_BLOCK_SIZE", "250"))
+# Neighbours each record is compared with in the sorted-neighbourhood pass
+DUPLICATE_SORTED_WINDOW = int(os.getenv("DUPLICATE_SORTED_WINDOW", "10"))
+# MinHash signature = LSH bands x rows per band
+DUPLICATE_LSH_BANDS = int(os.getenv("DUPLICATE_LSH_BANDS", "8"))
+DUPLICATE_LSH_ROWS = int(os.getenv("DUPLICATE_LSH_ROWS", "2"))
+# Name shingle length (characters)
+DUPLICATE_SHINGLE_SIZE = int(os.getenv("DUPLICATE_SHINGLE_SIZE", "3"))
+DUPLICATE_BLOCKING_STRATEGY = os.getenv("DUPLICATE_BLOCKING_STRATEGY", "capped")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240101)  # fixed seed: identical signatures across runs
+_HASH_PARAMS: List[Tuple[int, int]] = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(DUPLICATE_LSH_BANDS * DUPLICATE_LSH_ROWS)
+]
+
+Pair = Tuple[str, str]
+
+
+@dataclass
+class BlockStats:
+    """Pair counts for one block key."""
+
+    records: int
+    strategy: str
+    pairs_generated: int = 0
+    pairs_compared: int = 0
+
+
+def _sort_key(record_id: str, normalized: Dict[str, Any]) -> Tuple[str, str]:
+    return (getattr(normalized[record_id], "normalized_name", "") or "", record_id)
+
+
+def exact_pairs(record_ids: Sequence[str], normalized: Dict[str, Any]) -> Iterator[Pair]:
+    """Every pair in the block."""
+    return combinations(record_ids, 2)
+
+
+def sorted_neighbourhood_pairs(
+    record_ids: Sequence[str],
+    normalized: Dict[str, Any],
+    window: Optional[int] = None,
+) -> Iterator[Pair]:
+    """Pairs of records within ``window`` positions when sorted by normalized name."""
+    window = window or DUPLICATE_SORTED_WINDOW
+    ordered = sorted(record_ids, key=lambda record_id: _sort_key(record_id, normalized))
+    for index, a_id in enumerate(ordered):
+        for b_id in ordered[index + 1:index + 1 + window]:
+            yield a_id, b_id
+
+
+def name_shingles(name: str, size: int = DUPLICATE_SHINGLE_SIZE) -> set:
+    """Character shingles of a name, padded so short names still shingle."""
+    padded = f" {name} " if name else ""
+    if len(padded) <= size:
+        return {padded} if padded else set()
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+
+def minhash_signature(shingles: set) -> List[int]:
+    """MinHash signature with one value per (band x row) hash function."""
+    hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _HASH_PARAMS]
+
+
+def lsh_buckets(record_ids: Sequence[str], normalized: Dict[str, Any]) -> Dict[Tuple, List[str]]:
+    """Group records whose name signatures agree on at least one LSH band.
+
+    Records without a name can't be compared by name; they share one bucket.
+    """
+    buckets: Dict[Tuple, List[str]] = {}
+    for record_id in record_ids:
+        name = getattr(normalized[record_id], "normalized_name", "") or ""
+        shingles = name_shingles(name)
+        if not shingles:
+            buckets.setdefault(("unnamed",), []).append(record_id)
+            continue
+        signature = minhash_signature(shingles)
+        for band in range(DUPLICATE_LSH_BANDS):
+            rows = signature[band * DUPLICATE_LSH_ROWS:(band + 1) * DUPLICATE_LSH_ROWS]
+            buckets.setdefault((band, *rows), []).append(record_id)
+    return buckets
+
+
+def lsh_pairs(
+    record_ids: Sequence[str],
+    normalized: Dict[str, Any],
+    max_block_size: Optional[int] = None,
+) -> Iterator[Pair]:
+    """Pairs within LSH sub-blocks; oversized sub-blocks use a sorted window."""
+    max_block_size = max_block_size or DUPLICATE_MAX_BLOCK_SIZE
+    for sub_block in lsh_buckets(record_ids, normalized).values():
+        if len(sub_block) < 2:
+            continue
+        if len(sub_block) > max_block_size:
+            yield from sorted_neighbourhood_pairs(sub_block, normalized)
+        else:
+            yield from combinations(sub_block, 2)
+
+
+def capped_pairs(
+    record_ids: Sequence[str],
+    normalized: Dict[str, Any],
+    max_block_size: Optional[int] = None,
+) -> Iterator[Pair]:
+    """All pairs for blocks up to ``max_block_size``, LSH sub-blocking above it."""
+    max_block_size = max_block_size or DUPLICATE_MAX_BLOCK_SIZE
+    if len(record_ids) <= max_block_size:
+        return combinations(record_ids, 2)
+    return lsh_pairs(record_ids, normalized, max_block_size)
+
+
+BLOCKING_STRATEGIES: Dict[str, Callable[[Sequence[str], Dict[str, Any]], Iterator[Pair]]] = {
+    "capped": capped_pairs,
+    "exact": exact_pairs,
+    "sorted_neighbourhood": sorted_neighbourhood_pairs,
+    "lsh": lsh_pairs,
+}
+
+
+def block_strategy_name(strategy: str, block_size: int) -> str:
+    """Name of the strategy that actually runs for a block (for stats)."""
+    if strategy == "capped":
+        return "exact" if block_size <= DUPLICATE_MAX_BLOCK_SIZE else "lsh"
+    return strategy
+
+
+def get_blocking_strategy(
+    name: str = DUPLICATE_BLOCKING_STRATEGY,
+) -> Callable[[Sequence[str], Dict[str, Any]], Iterator[Pair]]:
+    """Look up a blocking strategy, raising ValueError for unknown names."""
+    try:
+        return BLOCKING_STRATEGIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown duplicate blocking strategy '{name}' (expected one of {', '.join(BLOCKING_STRATEGIES)})"
+        ) from None
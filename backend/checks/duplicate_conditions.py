@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import date
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from ..config.models import DuplicateCondition
 from ..utils.similarity import jaccard_ratio, jaro_winkler
@@ -50,6 +51,12 @@ CONTRACTOR_FIELD_MAP = {
     "vendor_id": "ein",
 }
 
+_FIELD_MAPS = {
+    "student": STUDENT_FIELD_MAP,
+    "parent": PARENT_FIELD_MAP,
+    "contractor": CONTRACTOR_FIELD_MAP,
+}
+
 
 def get_field_value(record: Any, field_name: str, entity: str) -> Any:
     """Get field value from normalized record using config field name.
@@ -62,11 +69,7 @@ def get_field_value(record: Any, field_name: str, entity: str) -> Any:
     Returns:
         Field value or None if not found
     """
-    field_map = {
-        "student": STUDENT_FIELD_MAP,
-        "parent": PARENT_FIELD_MAP,
-        "contractor": CONTRACTOR_FIELD_MAP,
-    }.get(entity, {})
+    field_map = _FIELD_MAPS.get(entity, {})
     
     mapped_field = field_map.get(field_name)
     if mapped_field is None:
@@ -108,6 +111,7 @@ def evaluate_condition(
     record_a: Any,
     record_b: Any,
     entity: str,
+    similarity: Optional[float] = None,
 ) -> Tuple[bool, Dict[str, Any]]:
     """Evaluate a duplicate condition against two records.
     
@@ -116,6 +120,8 @@ def evaluate_condition(
         record_a: First normalized record
         record_b: Second normalized record
         entity: Entity type ("student", "parent", "contractor")
+        similarity: Optional precomputed score for a similarity condition
+            (see jaro_winkler_batch); computed on demand if None
         
     Returns:
         Tuple of (matches: bool, evidence: dict)
@@ -125,7 +131,7 @@ def evaluate_condition(
     if condition_type == "exact_match":
         return _evaluate_exact_match(condition, record_a, record_b, entity)
     elif condition_type == "similarity":
-        return _evaluate_similarity(condition, record_a, record_b, entity)
+        return _evaluate_similarity(condition, record_a, record_b, entity, similarity)
     elif condition_type == "date_delta":
         return _evaluate_date_delta(condition, record_a, record_b, entity)
     elif condition_type == "set_overlap":
@@ -159,6 +165,7 @@ def _evaluate_similarity(
     record_a: Any,
     record_b: Any,
     entity: str,
+    precomputed: Optional[float] = None,
 ) -> Tuple[bool, Dict[str, Any]]:
     """Evaluate similarity condition."""
     if condition.similarity is None:
@@ -186,7 +193,7 @@ def _evaluate_similarity(
     if not str_a or not str_b:
         return False, {field_key: {"a": str_a, "b": str_b, "similarity": 0.0, "match": False}}
     
-    similarity_score = jaro_winkler(str_a, str_b)
+    similarity_score = precomputed if precomputed is not None else jaro_winkler(str_a, str_b)
     matches = similarity_score >= condition.similarity
     
     return matches, {
@@ -282,3 +289,137 @@ def _evaluate_set_overlap(
             "match": matches,
         }
     }
+
+
+# ---------------------------------------------------------------------------
+# Compiled conditions
+# ---------------------------------------------------------------------------
+
+# Relative cost of each condition type; compiled rules test cheapest first
+CONDITION_COSTS = {
+    "exact_match": 0,
+    "date_delta": 1,
+    "set_overlap": 2,
+    "similarity": 3,
+}
+
+
+@dataclass
+class CompiledCondition:
+    """A condition with its field accessors bound for one entity.
+
+    ``test`` answers match / no match without building evidence; evidence is
+    produced by evaluate_condition only for pairs whose rule matched.
+    """
+
+    condition: DuplicateCondition
+    cost: int
+    test: Callable[[Any, Any, Optional[float]], bool]
+    text: Optional[Callable[[Any], str]] = None  # similarity conditions only
+
+
+def _bind_field(field_name: str, entity: str) -> Callable[[Any], Any]:
+    mapped_field = _FIELD_MAPS.get(entity, {}).get(field_name)
+    if mapped_field is None:
+        return lambda record: None
+    return lambda record: getattr(record, mapped_field, None)
+
+
+def _bind_text(condition: DuplicateCondition, entity: str) -> Optional[Callable[[Any], str]]:
+    """Accessor for the stripped string a similarity condition compares ("" if missing).
+
+    Mirrors the value handling in _evaluate_similarity. Returns None if the
+    condition names no fields.
+    """
+    if condition.fields:
+        fields = condition.fields
+        if entity == "student" and len(fields) == 2 and "legal_first_name" in fields and "legal_last_name" in fields:
+            return lambda record: (getattr(record, "normalized_name", "") or "").strip()
+        getters = [_bind_field(field_name, entity) for field_name in fields]
+        return lambda record: " ".join(str(v) for v in (get(record) for get in getters) if v).strip()
+    if condition.field:
+        get = _bind_field(condition.field, entity)
+
+        def text(record: Any) -> str:
+            value = get(record)
+            return str(value).strip() if value else ""
+
+        return text
+    return None
+
+
+def _never(record_a: Any, record_b: Any, similarity: Optional[float] = None) -> bool:
+    return False
+
+
+def compile_condition(condition: DuplicateCondition, entity: str) -> CompiledCondition:
+    """Bind a condition's accessors once so it can be tested on many pairs.
+
+    ``test(a, b, similarity)`` returns exactly what evaluate_condition's
+    match flag would. Misconfigured conditions compile to a test that never
+    matches, like their interpreted counterparts.
+    """
+    condition_type = condition.type
+    cost = CONDITION_COSTS.get(condition_type, 0)
+
+    if condition_type == "exact_match" and condition.field:
+        get = _bind_field(condition.field, entity)
+
+        def test(a: Any, b: Any, similarity: Optional[float] = None) -> bool:
+            value_a = get(a)
+            value_b = get(b)
+            return value_a is not None and value_b is not None and value_a == value_b
+
+        return CompiledCondition(condition, cost, test)
+
+    if condition_type == "similarity" and condition.similarity is not None:
+        text = _bind_text(condition, entity)
+        if text is None:
+            return CompiledCondition(condition, 0, _never)
+        threshold = condition.similarity
+
+        def test(a: Any, b: Any, similarity: Optional[float] = None) -> bool:
+            str_a = text(a)
+            str_b = text(b)
+            if not str_a or not str_b:
+                return False
+            score = similarity if similarity is not None else jaro_winkler(str_a, str_b)
+            return score >= threshold
+
+        return CompiledCondition(condition, cost, test, text)
+
+    if condition_type == "date_delta" and condition.field and condition.tolerance_days is not None:
+        get = _bind_field(condition.field, entity)
+        tolerance = condition.tolerance_days
+
+        def test(a: Any, b: Any, similarity: Optional[float] = None) -> bool:
+            value_a = get(a)
+            value_b = get(b)
+            if not isinstance(value_a, date) or not isinstance(value_b, date):
+                return False
+            return abs((value_a - value_b).days) <= tolerance
+
+        return CompiledCondition(condition, cost, test)
+
+    if condition_type == "set_overlap" and condition.field and condition.overlap_ratio is not None:
+        get = _bind_field(condition.field, entity)
+        ratio = condition.overlap_ratio
+
+        def as_set(value: Any) -> set:
+            values = value if isinstance(value, (set, list)) else {value}
+            return {str(v) for v in values if v}
+
+        def test(a: Any, b: Any, similarity: Optional[float] = None) -> bool:
+            value_a = get(a)
+            value_b = get(b)
+            if not value_a or not value_b:
+                return False
+            set_a = as_set(value_a)
+            set_b = as_set(value_b)
+            if not set_a or not set_b:
+                return False
+            return jaccard_ratio(set_a, set_b) >= ratio
+
+        return CompiledCondition(condition, cost, test)
+
+    return CompiledCondition(condition, 0, _never)
@@ -0,0 +1,196 @@
+"""Persistent duplicate index reused across runs.
+
+A SQLite file on local disk remembers, per entity, the state after the last
+run:
+
+    records  record id -> content hash, normalized record, block keys and the
+             records it was paired with (as the first record of the pair)
+    matches  matching pairs -> PairMatch
+
+A run only normalizes records whose content hash changed, and only scores a
+candidate pair if it wasn't a candidate last run or either record changed;
+every other pair reuses last run's result (its stored match, or no match).
+Only matches are stored, so the index stays small however many pairs the
+blocks produce. Everything is keyed by a fingerprint of the duplicate rules
+and blocking strategy, so a rule change rescans all pairs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..utils.local_state import ProcessDefault, SQLiteState, state_enabled, state_path
+
+DUPLICATE_INDEX_PATH = state_path("DUPLICATE_INDEX_PATH", "duplicate-index.sqlite3")
+DUPLICATE_INDEX_ENABLED = state_enabled("DUPLICATE_INDEX_ENABLED")
+
+# Bump when normalization, blocking or classification code changes in a way
+# that makes stored records or results stale
+INDEX_FORMAT_VERSION = 1
+
+Pair = Tuple[str, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    entity TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    entity TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    normalized BLOB NOT NULL,
+    block_keys TEXT NOT NULL,
+    partners TEXT NOT NULL,
+    PRIMARY KEY (entity, record_id)
+);
+CREATE TABLE IF NOT EXISTS matches (
+    entity TEXT NOT NULL,
+    a_id TEXT NOT NULL,
+    b_id TEXT NOT NULL,
+    match BLOB NOT NULL,
+    PRIMARY KEY (entity, a_id, b_id)
+);
+"""
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """Stable hash of a raw Airtable record's fields."""
+    payload = json.dumps(record.get("fields", {}), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def rules_fingerprint(entity: str, dup_def: Any, strategy: str) -> str:
+    """Fingerprint of everything besides record content that decides a pair result."""
+    rules = dup_def.model_dump_json() if dup_def is not None else "legacy"
+    payload = f"{INDEX_FORMAT_VERSION}|{entity}|{strategy}|{rules}"
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class IndexedRecord:
+    content_hash: str
+    normalized: Any
+    block_keys: List[str]
+    # Record ids this record was paired with last run, as the pair's first record
+    partners: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class IndexedEntity:
+    """An entity's state after the last run."""
+
+    fingerprint: Optional[str] = None
+    records: Dict[str, IndexedRecord] = field(default_factory=dict)
+    matches: Dict[Pair, Any] = field(default_factory=dict)
+
+
+class DuplicateIndex(SQLiteState):
+    """Reads and updates the on-disk duplicate index (empty after any error)."""
+
+    SCHEMA = _SCHEMA
+    LABEL = "duplicate index"
+
+    def __init__(self, path: str | os.PathLike = DUPLICATE_INDEX_PATH):
+        super().__init__(path)
+        # One writer at a time; overlapping runs otherwise hit SQLITE_BUSY
+        self._lock = threading.Lock()
+
+    def load(self, entity: str) -> IndexedEntity:
+        """Load an entity's state after the last run (empty if never indexed)."""
+        with self._lock:
+            try:
+                conn = self._connect()
+                try:
+                    row = conn.execute("SELECT fingerprint FROM entities WHERE entity = ?", (entity,)).fetchone()
+                    if row is None:
+                        return IndexedEntity()
+                    records = {
+                        record_id: IndexedRecord(
+                            digest, pickle.loads(normalized), json.loads(block_keys), set(json.loads(partners))
+                        )
+                        for record_id, digest, normalized, block_keys, partners in conn.execute(
+                            "SELECT record_id, content_hash, normalized, block_keys, partners FROM records WHERE entity = ?",
+                            (entity,),
+                        )
+                    }
+                    matches = {
+                        (a_id, b_id): pickle.loads(match)
+                        for a_id, b_id, match in conn.execute(
+                            "SELECT a_id, b_id, match FROM matches WHERE entity = ?", (entity,)
+                        )
+                    }
+                finally:
+                    conn.close()
+            except Exception as exc:
+                self._discard(exc)
+                return IndexedEntity()
+        return IndexedEntity(row[0], records, matches)
+
+    def save(
+        self,
+        entity: str,
+        fingerprint: str,
+        records: Dict[str, IndexedRecord],
+        changed_ids: Iterable[str],
+        removed_ids: Iterable[str],
+        matches: Dict[Pair, Any],
+    ) -> None:
+        """Replace an entity's state with this run's, in one transaction.
+
+        Args:
+            entity: Entity name
+            fingerprint: rules_fingerprint() this run scored under
+            records: Every record of this run
+            changed_ids: Records whose row must be rewritten (new, changed or
+                with a different partner set)
+            removed_ids: Records that no longer exist
+            matches: Every matching pair of this run
+        """
+        with self._lock:
+            try:
+                conn = self._connect()
+                try:
+                    with conn:
+                        conn.execute("INSERT OR REPLACE INTO entities VALUES (?, ?)", (entity, fingerprint))
+                        conn.executemany(
+                            "DELETE FROM records WHERE entity = ? AND record_id = ?",
+                            [(entity, record_id) for record_id in removed_ids],
+                        )
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?)",
+                            [
+                                (
+                                    entity,
+                                    record_id,
+                                    records[record_id].content_hash,
+                                    pickle.dumps(records[record_id].normalized),
+                                    json.dumps(records[record_id].block_keys),
+                                    json.dumps(sorted(records[record_id].partners)),
+                                )
+                                for record_id in changed_ids
+                            ],
+                        )
+                        conn.execute("DELETE FROM matches WHERE entity = ?", (entity,))
+                        conn.executemany(
+                            "INSERT INTO matches VALUES (?, ?, ?, ?)",
+                            [(entity, a_id, b_id, pickle.dumps(match)) for (a_id, b_id), match in matches.items()],
+                        )
+                finally:
+                    conn.close()
+            except Exception as exc:
+                self._discard(exc)
+
+
+_default_index = ProcessDefault(DuplicateIndex, DUPLICATE_INDEX_ENABLED)
+
+
+def get_duplicate_index() -> Optional[DuplicateIndex]:
+    """Process-wide index at DUPLICATE_INDEX_PATH, or None when disabled."""
+    return _default_index.get()
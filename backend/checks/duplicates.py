@@ -2,22 +2,53 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, fields as dataclass_fields
 from datetime import date, datetime
-from itertools import combinations
+import logging
+import multiprocessing
+import os
+import threading
 import uuid
+import zlib
 from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from ..config.models import DuplicateDefinition, DuplicateRule, SchemaConfig
 from ..utils.issues import IssuePayload
 from ..utils.normalization import normalize_name, normalize_phone
-from ..utils.similarity import jaccard_ratio, jaro_winkler
-from .duplicate_conditions import evaluate_condition
+from ..utils.similarity import jaccard_ratio, jaro_winkler, jaro_winkler_batch
+from .duplicate_blocking import (
+    DUPLICATE_BLOCKING_STRATEGY,
+    BlockStats,
+    block_strategy_name,
+    get_blocking_strategy,
+)
+from .duplicate_conditions import CompiledCondition, compile_condition, evaluate_condition
+from .duplicate_index import DuplicateIndex, IndexedRecord, content_hash, rules_fingerprint
 
 LIKELY_THRESHOLD = 0.8
 POSSIBLE_THRESHOLD = 0.6
 LIKELY_SEVERITY = "warning"
 POSSIBLE_SEVERITY = "info"
+# Lowest name similarity the legacy parent/contractor classifiers act on;
+# pairs that can't reach it are not scored
+PARENT_MIN_NAME_SIMILARITY = 0.9
+CONTRACTOR_MIN_NAME_SIMILARITY = 0.9
+# Number of largest blocks included in the blocking stats log line
+BLOCK_STATS_LOG_LIMIT = 10
+# Worker processes that classify candidate pairs; 0 uses one per CPU and 1
+# keeps classification in-process
+DUPLICATE_PROCESS_WORKERS = int(os.getenv("DUPLICATE_PROCESS_WORKERS", "0"))
+# Below this many candidate pairs (all entities together) the pool isn't worth
+# the cost of pickling records to the workers
+DUPLICATE_PARALLEL_MIN_PAIRS = int(os.getenv("DUPLICATE_PARALLEL_MIN_PAIRS", "20000"))
+# Shards per worker; more shards even out uneven shards at some pickling cost
+DUPLICATE_SHARDS_PER_WORKER = int(os.getenv("DUPLICATE_SHARDS_PER_WORKER", "4"))
+# Fetched entity key -> entity name on the duplicate issues it produces
+ISSUE_ENTITIES = {"students": "student", "parents": "parent", "contractors": "contractor"}
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -79,20 +110,53 @@ class PairMatch:
     evidence: Dict[str, Any]
 
 
-def run(records: Dict[str, list], schema_config: Optional[SchemaConfig] = None) -> List[IssuePayload]:
+def run(
+    records: Dict[str, list],
+    schema_config: Optional[SchemaConfig] = None,
+    index: Optional[DuplicateIndex] = None,
+) -> List[IssuePayload]:
     """Run duplicate detection checks.
     
     Args:
         records: Dictionary mapping entity names to lists of raw records
         schema_config: Optional SchemaConfig with duplicate rules. If None, uses hardcoded logic.
+        index: Optional DuplicateIndex; unchanged records and pairs are reused from it
+            instead of being normalized and scored again.
     """
-    issues: List[IssuePayload] = []
-    
     dup_config = schema_config.duplicates if schema_config else {}
-    
-    issues.extend(_process_students(records.get("students", []), dup_config.get("students")))
-    issues.extend(_process_parents(records.get("parents", []), dup_config.get("parents")))
-    issues.extend(_process_contractors(records.get("contractors", []), dup_config.get("contractors")))
+
+    prepared: List[Tuple[str, Dict[str, Any], Optional[DuplicateDefinition], List[Tuple[str, str]]]] = []
+    candidates: List[Tuple[List[Tuple[str, str]], Optional[_IndexedPass]]] = []
+    for key, normalize in (
+        ("students", _normalize_students),
+        ("parents", _normalize_parents),
+        ("contractors", _normalize_contractors),
+    ):
+        entity = ISSUE_ENTITIES[key]
+        raw_records = records.get(key, [])
+        dup_def = dup_config.get(key)
+        indexed = None
+        block_keys = None
+        # An entity that wasn't fetched looks empty; leave its index alone
+        if index is not None and raw_records:
+            indexed = _IndexedPass(index, entity, dup_def, raw_records, normalize)
+            normalized, block_keys = indexed.normalized, indexed.block_keys
+        else:
+            normalized = normalize(raw_records)
+        stats: Dict[str, BlockStats] = {}
+        pairs = _candidate_pairs(normalized, stats=stats, block_keys=block_keys)
+        _log_block_stats(stats)
+        to_score = indexed.unscored(pairs) if indexed else pairs
+        prepared.append((entity, normalized, dup_def, to_score))
+        candidates.append((pairs, indexed))
+
+    issues: List[IssuePayload] = []
+    for (entity, normalized, _, _), (pairs, indexed), matches in zip(
+        prepared, candidates, _classify_candidates(prepared)
+    ):
+        if indexed:
+            matches = indexed.merge(pairs, matches)
+        issues.extend(_build_group_issues(entity, normalized, matches))
     return issues
 
 
@@ -100,6 +164,28 @@ def run(records: Dict[str, list], schema_config: Optional[SchemaConfig] = None)
 # Normalization helpers
 # ---------------------------------------------------------------------------
 
+# Raw field keys read by the _normalize_* helpers below, per entity. Keep in
+# sync with those helpers: fetch projection only downloads these columns.
+SOURCE_FIELDS: Dict[str, List[str]] = {
+    "students": [
+        "legal_first_name", "first_name", "legal_middle_name", "middle_name",
+        "legal_last_name", "last_name", "last", "preferred_name", "nickname",
+        "name", "full_name", "primary_campus", "campus", "grade_level", "grade",
+        "parents", "parent_links", "linked_parents", "truth_id",
+        "date_of_birth", "dob", "birth_date", "primary_email", "email",
+        "primary_phone", "phone",
+    ],
+    "parents": [
+        "full_name", "name", "contact_email", "email", "primary_email",
+        "contact_phone", "phone", "primary_phone", "students", "linked_students",
+        "mailing_zip", "zip_code", "postal_code",
+    ],
+    "contractors": [
+        "legal_name", "email", "phone", "campuses", "campus_assignments",
+        "ein", "vendor_id",
+    ],
+}
+
 
 def _extract_field(fields: Dict[str, Any], *keys: str) -> Any:
     for key in keys:
@@ -295,56 +381,139 @@ def _normalize_contractors(records: Iterable[dict]) -> Dict[str, ContractorRecor
 # ---------------------------------------------------------------------------
 
 
-def _process_students(raw_records: List[dict], dup_def: Optional[DuplicateDefinition] = None) -> List[IssuePayload]:
-    normalized = _normalize_students(raw_records)
-    classifier = lambda a, b: _classify_pair(a, b, "student", dup_def) if dup_def else _classify_student_pair(a, b)
-    pairs = _detect_pairs(normalized, classifier)
-    return _build_group_issues("student", normalized, pairs)
+def _classify_batch(
+    entity: str,
+    records_a: List[Any],
+    records_b: List[Any],
+    dup_def: Optional[DuplicateDefinition],
+) -> List[Optional[PairMatch]]:
+    """Classify pairs with the entity's rules, or the legacy classifier without them."""
+    if dup_def:
+        return _classify_pairs(records_a, records_b, entity, dup_def)
+    # Student name similarity feeds the score directly, so every pair is scored
+    classifier, min_name_similarity = _LEGACY_CLASSIFIERS[entity]
+    return _classify_legacy_pairs(records_a, records_b, classifier, min_name_similarity)
+
+
+def _classify_pair_list(
+    entity: str,
+    normalized: Dict[str, Any],
+    pairs: List[Tuple[str, str]],
+    dup_def: Optional[DuplicateDefinition],
+) -> List[PairMatch]:
+    """Classify candidate pairs in one batch and keep the matches, in pair order."""
+    if not pairs:
+        return []
+    records_a = [normalized[a_id] for a_id, _ in pairs]
+    records_b = [normalized[b_id] for _, b_id in pairs]
+    return [match for match in _classify_batch(entity, records_a, records_b, dup_def) if match]
 
 
-def _process_parents(raw_records: List[dict], dup_def: Optional[DuplicateDefinition] = None) -> List[IssuePayload]:
-    normalized = _normalize_parents(raw_records)
-    classifier = lambda a, b: _classify_pair(a, b, "parent", dup_def) if dup_def else _classify_parent_pair(a, b)
-    pairs = _detect_pairs(normalized, classifier)
-    return _build_group_issues("parent", normalized, pairs)
+def _classify_candidates(
+    prepared: List[Tuple[str, Dict[str, Any], Optional[DuplicateDefinition], List[Tuple[str, str]]]],
+) -> List[List[PairMatch]]:
+    """Classify the candidate pairs of every entity, in a process pool when worthwhile.
 
+    Args:
+        prepared: (entity, normalized records, duplicate definition, candidate pairs) per entity
 
-def _process_contractors(raw_records: List[dict], dup_def: Optional[DuplicateDefinition] = None) -> List[IssuePayload]:
-    normalized = _normalize_contractors(raw_records)
-    classifier = lambda a, b: _classify_pair(a, b, "contractor", dup_def) if dup_def else _classify_contractor_pair(a, b)
-    pairs = _detect_pairs(normalized, classifier)
-    return _build_group_issues("contractor", normalized, pairs)
+    Returns:
+        Matches per entity, in candidate pair order whichever mode ran.
+    """
+    workers = _process_workers()
+    total_pairs = sum(len(pairs) for _, _, _, pairs in prepared)
+    if workers > 1 and total_pairs and total_pairs >= DUPLICATE_PARALLEL_MIN_PAIRS:
+        try:
+            return _classify_in_pool(prepared, workers, total_pairs)
+        except BrokenProcessPool as exc:
+            logger.warning(
+                "Duplicate process pool failed; classifying in-process",
+                extra={"error": str(exc), "workers": workers},
+            )
+            _shutdown_process_pool()
+    return [
+        _classify_pair_list(entity, normalized, pairs, dup_def)
+        for entity, normalized, dup_def, pairs in prepared
+    ]
 
 
-def _detect_pairs(
+def _candidate_pairs(
     normalized: Dict[str, Any],
-    classifier: Callable[[Any, Any], Optional[PairMatch]],
-) -> List[PairMatch]:
-    buckets = _build_blocks(normalized)
+    strategy: str = DUPLICATE_BLOCKING_STRATEGY,
+    stats: Optional[Dict[str, BlockStats]] = None,
+    block_keys: Optional[Dict[str, List[str]]] = None,
+) -> List[Tuple[str, str]]:
+    """Unique record ID pairs sharing at least one block, in block order.
+
+    Args:
+        normalized: Normalized records keyed by record ID
+        strategy: Blocking strategy name (see duplicate_blocking)
+        stats: Optional dict filled with BlockStats per block key; pairs
+            compared counts only pairs not already produced by an earlier block
+        block_keys: Optional precomputed block keys per record ID
+    """
+    block_pairs = get_blocking_strategy(strategy)
+    buckets = _build_blocks(normalized, block_keys)
     seen_pairs: Set[Tuple[str, str]] = set()
-    matches: List[PairMatch] = []
+    pairs: List[Tuple[str, str]] = []
 
-    for bucket in buckets.values():
+    for block_key, bucket in buckets.items():
         if len(bucket) < 2:
             continue
-        for a_id, b_id in combinations(bucket, 2):
-            pair_key = tuple(sorted((a_id, b_id)))
+        block_stats = BlockStats(records=len(bucket), strategy=block_strategy_name(strategy, len(bucket)))
+        for a_id, b_id in block_pairs(bucket, normalized):
+            block_stats.pairs_generated += 1
+            pair_key = (a_id, b_id) if a_id < b_id else (b_id, a_id)
             if pair_key in seen_pairs:
                 continue
             seen_pairs.add(pair_key)
-            record_a = normalized[a_id]
-            record_b = normalized[b_id]
-            match = classifier(record_a, record_b)
-            if match:
-                matches.append(match)
-    return matches
+            pairs.append((a_id, b_id))
+            block_stats.pairs_compared += 1
+        if stats is not None:
+            stats[block_key] = block_stats
+    return pairs
+
+
+def _redact_block_key(key: str) -> str:
+    """Block key safe to log: keeps the key kind, hashes the contact/name value."""
+    parts = key.split(":")
+    kind = parts[:2] if len(parts) > 2 and parts[1] in ("phone", "email", "truth", "ein") else parts[:1]
+    return ":".join([*kind, f"{zlib.crc32(key.encode('utf-8')):08x}"])
+
+
+def _log_block_stats(stats: Dict[str, BlockStats]) -> None:
+    if not stats:
+        return
+    largest = sorted(stats.items(), key=lambda item: item[1].pairs_generated, reverse=True)
+    logger.info(
+        "Duplicate blocking stats",
+        extra={
+            "blocks": len(stats),
+            "pairs_generated": sum(s.pairs_generated for s in stats.values()),
+            "pairs_compared": sum(s.pairs_compared for s in stats.values()),
+            "sub_blocked": sum(1 for s in stats.values() if s.strategy != "exact"),
+            "largest_blocks": [
+                {
+                    "key": _redact_block_key(key),
+                    "records": s.records,
+                    "strategy": s.strategy,
+                    "pairs_generated": s.pairs_generated,
+                    "pairs_compared": s.pairs_compared,
+                }
+                for key, s in largest[:BLOCK_STATS_LOG_LIMIT]
+            ],
+        },
+    )
 
 
-def _build_blocks(normalized: Dict[str, Any]) -> Dict[str, List[str]]:
+def _build_blocks(
+    normalized: Dict[str, Any],
+    block_keys: Optional[Dict[str, List[str]]] = None,
+) -> Dict[str, List[str]]:
     buckets: Dict[str, List[str]] = {}
     for record_id, record in normalized.items():
-        block_keys = _compute_blocks(record)
-        for key in block_keys:
+        keys = block_keys[record_id] if block_keys is not None else _compute_blocks(record)
+        for key in keys:
             if not key:
                 continue
             buckets.setdefault(key, []).append(record_id)
@@ -385,98 +554,174 @@ def _compute_blocks(record: Any) -> List[str]:
 # ---------------------------------------------------------------------------
 
 
-def _evaluate_rule(
-    rule: DuplicateRule,
-    record_a: Any,
-    record_b: Any,
-    entity: str,
-    match_type: str,
-) -> Optional[PairMatch]:
-    """Evaluate a duplicate rule against two records.
-    
+@dataclass
+class CompiledRule:
+    rule: DuplicateRule
+    match_type: str
+    severity: str
+    conditions: List[CompiledCondition]  # cheapest first
+
+
+@dataclass
+class RulePlan:
+    """A DuplicateDefinition compiled once per run for one entity."""
+
+    entity: str
+    rules: List[CompiledRule]  # likely rules, then possible rules, in config order
+    # Similarity conditions grouped by the text they compare, with the lowest
+    # threshold in the group (one batch scoring pass per group)
+    similarity_groups: List[Tuple[Callable[[Any], str], float, List[int]]]
+
+
+def compile_rule_plan(dup_def: DuplicateDefinition, entity: str) -> RulePlan:
+    """Compile duplicate rules into a plan of bound, cost-ordered conditions.
+
     Args:
-        rule: DuplicateRule to evaluate
-        record_a: First normalized record
-        record_b: Second normalized record
+        dup_def: DuplicateDefinition with likely/possible rules
         entity: Entity type ("student", "parent", "contractor")
-        match_type: "likely" or "possible"
-        
-    Returns:
-        PairMatch if all conditions match, None otherwise
     """
+    rules: List[CompiledRule] = []
+    groups: Dict[Tuple, Tuple[Callable[[Any], str], float, List[int]]] = {}
+    for match_type, rule_list in (("likely", dup_def.likely), ("possible", dup_def.possible)):
+        for rule in rule_list:
+            compiled = [compile_condition(condition, entity) for condition in rule.conditions]
+            for item in compiled:
+                if item.text is None:
+                    continue
+                condition = item.condition
+                signature = (tuple(condition.fields or ()), condition.field)
+                text, threshold, members = groups.get(signature, (item.text, condition.similarity, []))
+                members.append(id(condition))
+                groups[signature] = (text, min(threshold, condition.similarity), members)
+            rules.append(
+                CompiledRule(
+                    rule=rule,
+                    match_type=match_type,
+                    severity=rule.severity or (LIKELY_SEVERITY if match_type == "likely" else POSSIBLE_SEVERITY),
+                    conditions=sorted(compiled, key=lambda item: item.cost),
+                )
+            )
+    return RulePlan(entity=entity, rules=rules, similarity_groups=list(groups.values()))
+
+
+def _materialize_match(
+    compiled: CompiledRule,
+    record_a: Any,
+    record_b: Any,
+    entity: str,
+    similarity_scores: Dict[int, float],
+) -> PairMatch:
+    """Build evidence and confidence for a pair whose rule matched."""
     all_evidence: Dict[str, Any] = {}
-    all_conditions_match = True
-    
-    for condition in rule.conditions:
-        matches, evidence = evaluate_condition(condition, record_a, record_b, entity)
+    for condition in compiled.rule.conditions:
+        _, evidence = evaluate_condition(
+            condition, record_a, record_b, entity, similarity_scores.get(id(condition))
+        )
         all_evidence.update(evidence)
-        
-        if not matches:
-            all_conditions_match = False
-            break
-    
-    if not all_conditions_match:
-        return None
-    
-    # Calculate confidence based on match type and evidence
-    confidence = 0.95 if match_type == "likely" else 0.7
-    
-    # Adjust confidence based on evidence quality
-    if "similarity" in str(all_evidence):
-        for key, value in all_evidence.items():
-            if isinstance(value, dict) and "similarity" in value:
-                confidence = max(confidence, value.get("similarity", 0.7))
-    
+
+    # Calculate confidence based on match type and evidence quality
+    confidence = 0.95 if compiled.match_type == "likely" else 0.7
+    for value in all_evidence.values():
+        if isinstance(value, dict) and "similarity" in value:
+            confidence = max(confidence, value.get("similarity", 0.7))
+
     return PairMatch(
         entity=entity,
         primary_id=record_a.record_id,
         secondary_id=record_b.record_id,
-        rule_id=rule.rule_id,
-        match_type=match_type,
-        severity=rule.severity or (LIKELY_SEVERITY if match_type == "likely" else POSSIBLE_SEVERITY),
+        rule_id=compiled.rule.rule_id,
+        match_type=compiled.match_type,
+        severity=compiled.severity,
         confidence=round(confidence, 3),
         evidence=all_evidence,
     )
 
 
-def _classify_pair(
+def _classify_with_plan(
+    plan: RulePlan,
     record_a: Any,
     record_b: Any,
-    entity: str,
-    dup_def: DuplicateDefinition,
+    similarity_scores: Dict[int, float],
 ) -> Optional[PairMatch]:
-    """Generic rule-based classifier for duplicate pairs.
-    
-    Args:
-        record_a: First normalized record
-        record_b: Second normalized record
-        entity: Entity type ("student", "parent", "contractor")
-        dup_def: DuplicateDefinition with likely/possible rules
-        
-    Returns:
-        PairMatch if any rule matches, None otherwise
+    """First matching rule (likely before possible) for one pair, or None.
+
+    Conditions short-circuit without building evidence; evidence is only
+    materialized for the rule that matched.
     """
-    # Try likely rules first
-    for rule in dup_def.likely:
-        match = _evaluate_rule(rule, record_a, record_b, entity, "likely")
-        if match:
-            return match
-    
-    # Then try possible rules
-    for rule in dup_def.possible:
-        match = _evaluate_rule(rule, record_a, record_b, entity, "possible")
-        if match:
-            return match
-    
+    for compiled in plan.rules:
+        for item in compiled.conditions:
+            if not item.test(record_a, record_b, similarity_scores.get(id(item.condition))):
+                break
+        else:
+            return _materialize_match(compiled, record_a, record_b, plan.entity, similarity_scores)
     return None
 
 
+def _classify_pairs(
+    records_a: List[Any],
+    records_b: List[Any],
+    entity: str,
+    dup_def: DuplicateDefinition,
+) -> List[Optional[PairMatch]]:
+    """Rule-based classification of many pairs.
+
+    The rules are compiled once, then each group of similarity conditions is
+    scored for all pairs in one jaro_winkler_batch call, pruned by the
+    group's lowest threshold.
+    """
+    plan = compile_rule_plan(dup_def, entity)
+
+    batch_scores: Dict[int, List[float]] = {}
+    for text, threshold, members in plan.similarity_groups:
+        scores = jaro_winkler_batch(
+            [text(record) for record in records_a],
+            [text(record) for record in records_b],
+            threshold=threshold,
+        )
+        for condition_id in members:
+            batch_scores[condition_id] = scores
+
+    results: List[Optional[PairMatch]] = []
+    for index, (record_a, record_b) in enumerate(zip(records_a, records_b)):
+        pair_scores = {key: scores[index] for key, scores in batch_scores.items()}
+        results.append(_classify_with_plan(plan, record_a, record_b, pair_scores))
+    return results
+
+
 # ---------------------------------------------------------------------------
 # Legacy hardcoded classification logic (fallback)
 # ---------------------------------------------------------------------------
 
 
-def _classify_student_pair(a: StudentRecord, b: StudentRecord) -> Optional[PairMatch]:
+def _classify_legacy_pairs(
+    records_a: List[Any],
+    records_b: List[Any],
+    classifier: Callable[[Any, Any, Optional[float]], Optional[PairMatch]],
+    min_name_similarity: Optional[float] = None,
+) -> List[Optional[PairMatch]]:
+    """Score all pair names in one batch, then run a legacy classifier per pair.
+
+    Args:
+        records_a: Left record of each pair
+        records_b: Right record of each pair
+        classifier: One of the _classify_*_pair functions
+        min_name_similarity: Lowest name similarity the classifier acts on;
+            pairs that can't reach it get 0.0 without being scored
+    """
+    similarities = jaro_winkler_batch(
+        [record.normalized_name for record in records_a],
+        [record.normalized_name for record in records_b],
+        threshold=min_name_similarity,
+    )
+    return [
+        classifier(record_a, record_b, similarity)
+        for record_a, record_b, similarity in zip(records_a, records_b, similarities)
+    ]
+
+
+def _classify_student_pair(
+    a: StudentRecord, b: StudentRecord, name_similarity: Optional[float] = None
+) -> Optional[PairMatch]:
     evidence: Dict[str, Any] = {}
     if a.truth_id and a.truth_id == b.truth_id:
         evidence["truth_id"] = True
@@ -495,7 +740,8 @@ def _classify_student_pair(a: StudentRecord, b: StudentRecord) -> Optional[PairM
     evidence["email_match"] = email_match
     phone_match = bool(a.normalized_phone and a.normalized_phone == b.normalized_phone)
     evidence["phone_match"] = phone_match
-    name_similarity = jaro_winkler(a.normalized_name, b.normalized_name)
+    if name_similarity is None:
+        name_similarity = jaro_winkler(a.normalized_name, b.normalized_name)
     evidence["name_similarity"] = round(name_similarity, 3)
 
     dob_match = bool(a.dob and b.dob and abs((a.dob - b.dob).days) <= 1)
@@ -569,7 +815,9 @@ def _classify_student_pair(a: StudentRecord, b: StudentRecord) -> Optional[PairM
     return None
 
 
-def _classify_parent_pair(a: ParentRecord, b: ParentRecord) -> Optional[PairMatch]:
+def _classify_parent_pair(
+    a: ParentRecord, b: ParentRecord, name_similarity: Optional[float] = None
+) -> Optional[PairMatch]:
     evidence: Dict[str, Any] = {}
     if a.normalized_email and a.normalized_email == b.normalized_email:
         evidence["email_match"] = True
@@ -596,7 +844,8 @@ def _classify_parent_pair(a: ParentRecord, b: ParentRecord) -> Optional[PairMatc
             evidence=evidence,
         )
 
-    name_similarity = jaro_winkler(a.normalized_name, b.normalized_name)
+    if name_similarity is None:
+        name_similarity = jaro_winkler(a.normalized_name, b.normalized_name)
     evidence["name_similarity"] = round(name_similarity, 3)
     student_overlap = jaccard_ratio(a.students, b.students)
     evidence["student_overlap"] = round(student_overlap, 3)
@@ -626,7 +875,9 @@ def _classify_parent_pair(a: ParentRecord, b: ParentRecord) -> Optional[PairMatc
     return None
 
 
-def _classify_contractor_pair(a: ContractorRecord, b: ContractorRecord) -> Optional[PairMatch]:
+def _classify_contractor_pair(
+    a: ContractorRecord, b: ContractorRecord, name_similarity: Optional[float] = None
+) -> Optional[PairMatch]:
     evidence: Dict[str, Any] = {}
     if a.ein and a.ein == b.ein:
         evidence["ein_match"] = True
@@ -655,7 +906,8 @@ def _classify_contractor_pair(a: ContractorRecord, b: ContractorRecord) -> Optio
 
     phone_match = bool(a.normalized_phone and a.normalized_phone == b.normalized_phone)
     evidence["phone_match"] = phone_match
-    name_similarity = jaro_winkler(a.normalized_name, b.normalized_name)
+    if name_similarity is None:
+        name_similarity = jaro_winkler(a.normalized_name, b.normalized_name)
     evidence["name_similarity"] = round(name_similarity, 3)
     campus_overlap = jaccard_ratio(a.campuses, b.campuses)
     evidence["campus_overlap"] = round(campus_overlap, 3)
@@ -685,49 +937,301 @@ def _classify_contractor_pair(a: ContractorRecord, b: ContractorRecord) -> Optio
     return None
 
 
+_LEGACY_CLASSIFIERS: Dict[str, Tuple[Callable[[Any, Any, Optional[float]], Optional[PairMatch]], Optional[float]]] = {
+    "student": (_classify_student_pair, None),
+    "parent": (_classify_parent_pair, PARENT_MIN_NAME_SIMILARITY),
+    "contractor": (_classify_contractor_pair, CONTRACTOR_MIN_NAME_SIMILARITY),
+}
+
+
+# ---------------------------------------------------------------------------
+# Process-pool classification
+# ---------------------------------------------------------------------------
+
+_RECORD_TYPES: Dict[str, type] = {
+    "student": StudentRecord,
+    "parent": ParentRecord,
+    "contractor": ContractorRecord,
+}
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers = 0
+_process_pool_lock = threading.Lock()
+
+
+def _process_workers() -> int:
+    return DUPLICATE_PROCESS_WORKERS or os.cpu_count() or 1
+
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the shared pool, starting it on first use.
+
+    Workers are spawned rather than forked: the API process runs fetch and
+    check threads, and forking a threaded process can copy held locks.
+    """
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_workers != workers:
+            if _process_pool is not None:
+                _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _process_pool_workers = workers
+        return _process_pool
+
+
+def _shutdown_process_pool() -> None:
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
+        _process_pool_workers = 0
+
+
+def _pack_shard(
+    normalized: Dict[str, Any],
+    pairs: List[Tuple[str, str]],
+) -> Tuple[List[tuple], List[Tuple[int, int]]]:
+    """Compact picklable form of a shard: the records it reads as plain tuples
+    (field order of the record dataclass) and its pairs as indexes into them."""
+    index: Dict[str, int] = {}
+    rows: List[tuple] = []
+    index_pairs: List[Tuple[int, int]] = []
+    for a_id, b_id in pairs:
+        for record_id in (a_id, b_id):
+            if record_id not in index:
+                index[record_id] = len(rows)
+                record = normalized[record_id]
+                rows.append(tuple(getattr(record, field.name) for field in dataclass_fields(record)))
+        index_pairs.append((index[a_id], index[b_id]))
+    return rows, index_pairs
+
+
+def _classify_shard(
+    entity: str,
+    dup_def: Optional[DuplicateDefinition],
+    rows: List[tuple],
+    index_pairs: List[Tuple[int, int]],
+) -> List[PairMatch]:
+    """Worker entry point: rebuild the shard's records and classify its pairs."""
+    record_type = _RECORD_TYPES[entity]
+    records = [record_type(*row) for row in rows]
+    records_a = [records[a] for a, _ in index_pairs]
+    records_b = [records[b] for _, b in index_pairs]
+    return [match for match in _classify_batch(entity, records_a, records_b, dup_def) if match]
+
+
+def _classify_in_pool(
+    prepared: List[Tuple[str, Dict[str, Any], Optional[DuplicateDefinition], List[Tuple[str, str]]]],
+    workers: int,
+    total_pairs: int,
+) -> List[List[PairMatch]]:
+    """Split every entity's candidate pairs into contiguous shards and classify
+    them on the process pool.
+
+    Shards of all entities are queued together so one entity's shards can run
+    while another's are still classifying. Each pair is classified on its
+    own, so concatenating the shard results in submission order gives exactly
+    the serial output.
+    """
+    pool = _get_process_pool(workers)
+    shard_size = max(1, -(-total_pairs // (workers * max(1, DUPLICATE_SHARDS_PER_WORKER))))
+    submitted = []
+    for entity, normalized, dup_def, pairs in prepared:
+        futures = []
+        for start in range(0, len(pairs), shard_size):
+            rows, index_pairs = _pack_shard(normalized, pairs[start:start + shard_size])
+            futures.append(pool.submit(_classify_shard, entity, dup_def, rows, index_pairs))
+        submitted.append(futures)
+    logger.info(
+        "Duplicate pairs sharded across process pool",
+        extra={"workers": workers, "pairs": total_pairs, "shards": sum(len(futures) for futures in submitted)},
+    )
+    return [[match for future in futures for match in future.result()] for futures in submitted]
+
+
+# ---------------------------------------------------------------------------
+# Cross-run index
+# ---------------------------------------------------------------------------
+
+
+class _IndexedPass:
+    """One entity's pass through the DuplicateIndex.
+
+    Unchanged records come back normalized with their block keys; candidate
+    pairs that last run scored with the same records reuse its result.
+    merge() combines reused and fresh results in candidate order and writes
+    this run's state back.
+    """
+
+    def __init__(
+        self,
+        index: DuplicateIndex,
+        entity: str,
+        dup_def: Optional[DuplicateDefinition],
+        raw_records: List[dict],
+        normalize: Callable[[Iterable[dict]], Dict[str, Any]],
+    ):
+        self._index = index
+        self._entity = entity
+        self._fingerprint = rules_fingerprint(entity, dup_def, DUPLICATE_BLOCKING_STRATEGY)
+        self._stored = index.load(entity)
+        if self._stored.fingerprint != self._fingerprint:
+            # Normalized records survive a rule change; pair results don't
+            for stored in self._stored.records.values():
+                stored.partners = set()
+            self._stored.matches = {}
+
+        self._hashes: Dict[str, str] = {}
+        changed_raw: List[dict] = []
+        for record in raw_records:
+            record_id = record.get("id")
+            if not record_id:
+                continue
+            digest = content_hash(record)
+            self._hashes[record_id] = digest
+            stored = self._stored.records.get(record_id)
+            if stored is None or stored.content_hash != digest:
+                changed_raw.append(record)
+        fresh = normalize(changed_raw)
+
+        # Keep fetch order: block and pair order (and so the issues) follow it
+        self.normalized: Dict[str, Any] = {}
+        self.block_keys: Dict[str, List[str]] = {}
+        self._records: Dict[str, IndexedRecord] = {}
+        for record_id, digest in self._hashes.items():
+            if record_id in fresh:
+                record = fresh[record_id]
+                indexed = IndexedRecord(digest, record, _compute_blocks(record))
+            else:
+                stored = self._stored.records[record_id]
+                indexed = IndexedRecord(digest, stored.normalized, stored.block_keys)
+            self._records[record_id] = indexed
+            self.normalized[record_id] = indexed.normalized
+            self.block_keys[record_id] = indexed.block_keys
+        self._changed = set(fresh)
+        self._removed = [record_id for record_id in self._stored.records if record_id not in self._hashes]
+        self._reused: Set[Tuple[str, str]] = set()
+
+    def unscored(self, pairs: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Candidate pairs without a reusable result, in candidate order."""
+        # Last run's partners of records that haven't changed since
+        partners = {
+            record_id: stored.partners
+            for record_id, stored in self._stored.records.items()
+            if record_id in self._hashes and record_id not in self._changed
+        }
+        unscored = []
+        for pair in pairs:
+            a_partners = partners.get(pair[0])
+            if a_partners is not None and pair[1] in a_partners and pair[1] in partners:
+                self._reused.add(pair)
+            else:
+                unscored.append(pair)
+        return unscored
+
+    def merge(self, pairs: List[Tuple[str, str]], scored: List[PairMatch]) -> List[PairMatch]:
+        """Reused plus freshly scored matches in candidate order; saves the index."""
+        fresh = {(match.primary_id, match.secondary_id): match for match in scored}
+        stored_matches = self._stored.matches
+        matches: List[PairMatch] = []
+        run_matches: Dict[Tuple[str, str], PairMatch] = {}
+        records = self._records
+        reused = self._reused
+        for pair in pairs:
+            match = stored_matches.get(pair) if pair in reused else fresh.get(pair)
+            if match:
+                matches.append(match)
+                run_matches[pair] = match
+            records[pair[0]].partners.add(pair[1])
+
+        changed = set(self._changed)
+        for record_id, record in self._records.items():
+            stored = self._stored.records.get(record_id)
+            if stored is None or stored.partners != record.partners:
+                changed.add(record_id)
+        self._index.save(self._entity, self._fingerprint, self._records, changed, self._removed, run_matches)
+        logger.info(
+            "Duplicate index reused prior results",
+            extra={
+                "entity": self._entity,
+                "records": len(self._records),
+                "records_changed": len(self._changed),
+                "records_removed": len(self._removed),
+                "pairs": len(pairs),
+                "pairs_reused": len(self._reused),
+            },
+        )
+        return matches
+
+
 # ---------------------------------------------------------------------------
 # Grouping logic
 # ---------------------------------------------------------------------------
 
 
+class _UnionFind:
+    """Disjoint sets over record IDs with iterative path compression."""
+
+    def __init__(self) -> None:
+        self.parent: Dict[str, str] = {}
+
+    def find(self, x: str) -> str:
+        parent = self.parent
+        root = parent.setdefault(x, x)
+        while parent[root] != root:
+            root = parent[root]
+        # Point every node on the path straight at the root
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, x: str, y: str) -> None:
+        root_x = self.find(x)
+        root_y = self.find(y)
+        if root_x != root_y:
+            self.parent[root_y] = root_x
+
+
 def _build_group_issues(
     entity: str,
     normalized: Dict[str, Any],
     matches: List[PairMatch],
 ) -> List[IssuePayload]:
+    """Group matched pairs into connected components and emit one issue per group.
+
+    Runs in O(records + matches): members and matches are bucketed by
+    union-find root in single passes instead of rescanning every match per
+    group.
+    """
     if not matches:
         return []
 
-    parent: Dict[str, str] = {}
-
-    def find(x: str) -> str:
-        parent.setdefault(x, x)
-        if parent[x] != x:
-            parent[x] = find(parent[x])
-        return parent[x]
-
-    def union(x: str, y: str) -> None:
-        root_x = find(x)
-        root_y = find(y)
-        if root_x != root_y:
-            parent[root_y] = root_x
-
+    sets = _UnionFind()
     for match in matches:
-        union(match.primary_id, match.secondary_id)
+        sets.union(match.primary_id, match.secondary_id)
 
-    groups: Dict[str, Set[str]] = {}
+    # Groups keep the order of their first member in `normalized`
+    groups: Dict[str, List[str]] = {}
     for record_id in normalized:
-        root = find(record_id)
-        groups.setdefault(root, set()).add(record_id)
+        if record_id in sets.parent:
+            groups.setdefault(sets.find(record_id), []).append(record_id)
+
+    matches_by_root: Dict[str, List[PairMatch]] = {}
+    for match in matches:
+        matches_by_root.setdefault(sets.find(match.primary_id), []).append(match)
 
     issues: List[IssuePayload] = []
     severity_rank = {"info": 0, "warning": 1, "critical": 2}
 
-    for root, members in groups.items():
-        if len(members) < 2:
+    for root, member_list in groups.items():
+        if len(member_list) < 2:
             continue
+        members = set(member_list)
         member_ids = sorted(members)
-        group_matches = [m for m in matches if m.primary_id in members and m.secondary_id in members]
+        group_matches = matches_by_root[root]
         top_match = max(group_matches, key=lambda m: severity_rank.get(m.severity, 0))
         related = [m for m in member_ids]
         primary_id = _select_primary(entity, members, normalized)
@@ -0,0 +1,75 @@
+"""Which Airtable columns the checks read, per entity.
+
+Used to project Airtable fetches down to the columns that can influence a
+check result. Keys are expanded with the same variants `get_field` probes,
+so the set is a superset of what any check can look up.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+from ..config.models import SchemaConfig
+from ..config.settings import AttendanceRules
+from ..utils.records import ARCHIVED_INDICATOR_FIELDS, DEFAULT_STATUS_FIELDS, field_name_variants
+from .attendance import ATTENDANCE_SOURCE_FIELDS, STUDENT_SOURCE_FIELDS
+from .duplicates import SOURCE_FIELDS as DUPLICATE_SOURCE_FIELDS
+from .links import link_field_candidates
+
+
+def fields_read_by_checks(
+    schema_config: Optional[SchemaConfig],
+    attendance_rules: Optional[AttendanceRules],
+) -> Dict[str, Set[str]]:
+    """Return the candidate column names each entity's checks may read.
+
+    Args:
+        schema_config: SchemaConfig the run will use (already filtered by rule selection)
+        attendance_rules: AttendanceRules the run will use, or None if attendance is skipped
+
+    Returns:
+        Mapping of entity name to column names. Entities absent from the
+        mapping are only needed for their record IDs.
+    """
+    usage: Dict[str, Set[str]] = defaultdict(set)
+
+    def add(entity: str, key: str) -> None:
+        usage[entity].update(field_name_variants(key))
+
+    # Duplicate detection always runs for these entities (rule-based or legacy)
+    for entity, keys in DUPLICATE_SOURCE_FIELDS.items():
+        for key in keys:
+            add(entity, key)
+
+    if schema_config:
+        for entity_name, entity_schema in schema_config.entities.items():
+            for req in entity_schema.missing_key_data:
+                add(entity_name, req.field)
+                for alt in req.alternate_fields or []:
+                    add(entity_name, alt)
+                if req.condition_field:
+                    add(entity_name, req.condition_field)
+
+            for rel_key, rule in entity_schema.relationships.items():
+                for candidate in link_field_candidates(rel_key):
+                    add(entity_name, candidate)
+                if rule.condition_field:
+                    add(entity_name, rule.condition_field)
+                if rule.require_active:
+                    for key in DEFAULT_STATUS_FIELDS + ARCHIVED_INDICATOR_FIELDS:
+                        add(rule.target, key)
+                if rule.validate_bidirectional and rule.reverse_relationship_key:
+                    for candidate in link_field_candidates(rule.reverse_relationship_key):
+                        add(rule.target, candidate)
+                for source_field, target_field in (rule.cross_entity_validation or {}).items():
+                    add(entity_name, source_field)
+                    add(rule.target, target_field)
+
+    if attendance_rules:
+        # _normalize_attendance reads exact column names, no variants
+        usage["attendance"].update(ATTENDANCE_SOURCE_FIELDS)
+        for key in STUDENT_SOURCE_FIELDS:
+            add("students", key)
+
+    return dict(usage)
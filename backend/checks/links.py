@@ -2,38 +2,46 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from ..config.models import SchemaConfig, RelationshipRule
 from ..utils.issues import IssuePayload
-from ..utils.records import (
-    build_record_index,
-    get_list_field,
-    get_field,
-    matches_condition,
-    is_record_active,
-)
+from ..utils.record_store import RecordStore, RecordTable
+from ..utils.records import FieldResolver, build_record_index, is_record_active
 
 
 def run(records: Dict[str, list], schema_config: SchemaConfig) -> List[IssuePayload]:
     """Run link consistency checks with active status and orphan validation."""
     issues: List[IssuePayload] = []
+    store = RecordStore.wrap(records)
     record_index = build_record_index(records)
+    reverse_index = _build_reverse_index(schema_config, store)
+    # is_record_active per target entity and record id, filled on first use
+    active_status: Dict[str, Dict[str, bool]] = {}
     
     for entity_name, entity_schema in schema_config.entities.items():
-        entity_records = records.get(entity_name, [])
         if not entity_schema.relationships:
             continue
-        for record in entity_records:
-            record_id = record.get("id")
-            fields = record.get("fields", {})
-            for rel_key, rel_rule in entity_schema.relationships.items():
-                if not matches_condition(fields, rel_rule.condition_field, rel_rule.condition_value):
+        table = store.table(entity_name)
+        # Per relationship: which records it applies to and their link ids
+        relationship_columns = [
+            (
+                rel_key,
+                rel_rule,
+                table.condition_mask(rel_rule.condition_field, rel_rule.condition_value),
+                _link_column(table, rel_key),
+            )
+            for rel_key, rel_rule in entity_schema.relationships.items()
+        ]
+        for row, record in enumerate(table.records):
+            record_id = table.ids[row]
+            for rel_key, rel_rule, applies, link_column in relationship_columns:
+                if not applies[row]:
                     continue
                 
                 # Resolve links and get actual record objects
                 link_records = _resolve_and_validate_links(
-                    fields, rel_key, rel_rule.target, record_index
+                    link_column[row], rel_rule.target, record_index
                 )
                 
                 # Detect orphaned links
@@ -60,7 +68,10 @@ def run(records: Dict[str, list], schema_config: SchemaConfig) -> List[IssuePayl
                 
                 # Validate active status if required
                 active_ids, inactive_ids = _validate_active_links(
-                    valid_links, rel_rule.require_active
+                    valid_links,
+                    rel_rule.require_active,
+                    active_status.setdefault(rel_rule.target, {}),
+                    store.table(rel_rule.target).resolver,
                 )
                 
                 # Count active links (or all links if require_active is False)
@@ -154,6 +165,7 @@ def run(records: Dict[str, list], schema_config: SchemaConfig) -> List[IssuePayl
                         rel_rule.target,
                         rel_rule.reverse_relationship_key,
                         record_index,
+                        reverse_index[(rel_rule.target, rel_rule.reverse_relationship_key)],
                     )
                     issues.extend(bidirectional_issues)
                 
@@ -165,12 +177,43 @@ def run(records: Dict[str, list], schema_config: SchemaConfig) -> List[IssuePayl
                         rel_rule.cross_entity_validation,
                         entity_name,
                         rel_key,
+                        table.resolver,
+                        store.table(rel_rule.target).resolver,
                     )
                     issues.extend(cross_entity_issues)
     
     return issues
 
 
+def _build_reverse_index(
+    schema_config: SchemaConfig,
+    store: RecordStore,
+) -> Dict[Tuple[str, str], Dict[str, Set[str]]]:
+    """Resolve reverse links once per (target entity, reverse key).
+
+    Returns:
+        {(target_entity, reverse_key): {target_record_id: {linked source ids}}}
+        for every relationship that validates bidirectional links.
+    """
+    reverse_index: Dict[Tuple[str, str], Dict[str, Set[str]]] = {}
+    for entity_schema in schema_config.entities.values():
+        for rel_rule in (entity_schema.relationships or {}).values():
+            if not (rel_rule.validate_bidirectional and rel_rule.reverse_relationship_key):
+                continue
+            key = (rel_rule.target, rel_rule.reverse_relationship_key)
+            if key in reverse_index:
+                continue
+            target_table = store.table(rel_rule.target)
+            reverse_index[key] = {
+                target_id: set(links)
+                for target_id, links in zip(
+                    target_table.ids, _link_column(target_table, rel_rule.reverse_relationship_key)
+                )
+                if target_id
+            }
+    return reverse_index
+
+
 def _validate_bidirectional(
     entity_name: str,
     record_id: str,
@@ -179,9 +222,14 @@ def _validate_bidirectional(
     target_entity: str,
     reverse_key: str,
     record_index: Dict[str, Dict[str, dict]],
+    reverse_links: Dict[str, Set[str]],
 ) -> List[IssuePayload]:
     """Validate that linked records reference back to the source record.
     
+    Args:
+        reverse_links: Reverse link ids per target record for reverse_key
+            (from _build_reverse_index)
+
     Returns list of issues for missing reverse links.
     """
     issues: List[IssuePayload] = []
@@ -191,17 +239,12 @@ def _validate_bidirectional(
     if not source_record:
         return issues
     
-    target_entity_index = record_index.get(target_entity, {})
-    
     for link_id in link_ids:
-        linked_record = target_entity_index.get(link_id)
-        if not linked_record:
+        linked_back = reverse_links.get(link_id)
+        if linked_back is None:
             continue  # Already handled as orphan
         
-        linked_fields = linked_record.get("fields", {})
-        reverse_links = _resolve_links(linked_fields, reverse_key)
-        
-        if record_id not in reverse_links:
+        if record_id not in linked_back:
             issues.append(
                 IssuePayload(
                     rule_id=f"link.{entity_name}.{rel_key}.bidirectional",
@@ -228,6 +271,8 @@ def _validate_cross_entity(
     validation_rules: Dict[str, str],
     entity_name: str,
     rel_key: str,
+    source_resolver: FieldResolver,
+    target_resolver: FieldResolver,
 ) -> List[IssuePayload]:
     """Validate that linked records have matching field values.
     
@@ -237,6 +282,8 @@ def _validate_cross_entity(
         validation_rules: Dict mapping source_field -> target_field
         entity_name: Name of source entity
         rel_key: Relationship key
+        source_resolver: FieldResolver of the source entity
+        target_resolver: FieldResolver of the target entity
         
     Returns:
         List of issues for mismatched fields
@@ -252,8 +299,8 @@ def _validate_cross_entity(
         linked_fields = linked_record.get("fields", {})
         
         for source_field, target_field in validation_rules.items():
-            source_value = get_field(source_fields, source_field)
-            target_value = get_field(linked_fields, target_field)
+            source_value = source_resolver.get(source_fields, source_field)
+            target_value = target_resolver.get(linked_fields, target_field)
             
             if source_value is None or target_value is None:
                 continue  # Skip if either field is missing
@@ -284,31 +331,36 @@ def _validate_cross_entity(
     return issues
 
 
-def _resolve_links(fields: Dict[str, Any], rel_key: str) -> List[str]:
-    """Extract link IDs from record fields (backward compatibility)."""
-    candidates = [rel_key, f"{rel_key}_id", f"{rel_key}_ids", f"{rel_key}_links", f"{rel_key}s"]
-    seen = set()
-    values: List[str] = []
-    for candidate in candidates:
-        links = get_list_field(fields, candidate)
-        for value in links:
-            if value not in seen:
-                values.append(value)
-                seen.add(value)
-    return values
+def link_field_candidates(rel_key: str) -> List[str]:
+    """Logical field keys that may hold the links for a relationship."""
+    return [rel_key, f"{rel_key}_id", f"{rel_key}_ids", f"{rel_key}_links", f"{rel_key}s"]
+
+
+def _link_column(table: RecordTable, rel_key: str) -> List[List[str]]:
+    """Link IDs of every record in the table, merged across the candidate fields."""
+    candidate_columns = [table.list_column(candidate) for candidate in link_field_candidates(rel_key)]
+    column: List[List[str]] = []
+    for row_links in zip(*candidate_columns):
+        seen = set()
+        values: List[str] = []
+        for links in row_links:
+            for value in links:
+                if value not in seen:
+                    values.append(value)
+                    seen.add(value)
+        column.append(values)
+    return column
 
 
 def _resolve_and_validate_links(
-    fields: Dict[str, Any],
-    rel_key: str,
+    link_ids: List[str],
     target_entity: str,
     record_index: Dict[str, Dict[str, dict]],
 ) -> List[Tuple[str, Optional[dict]]]:
-    """Resolve link IDs and return tuples of (link_id, linked_record).
+    """Return tuples of (link_id, linked_record) for a record's link IDs.
     
     Returns None for linked_record if the link is orphaned (doesn't exist).
     """
-    link_ids = _resolve_links(fields, rel_key)
     target_index = record_index.get(target_entity, {})
     result: List[Tuple[str, Optional[dict]]] = []
     for link_id in link_ids:
@@ -330,9 +382,18 @@ def _detect_orphans(
 def _validate_active_links(
     link_records: List[Tuple[str, Optional[dict]]],
     require_active: bool,
+    active_status: Optional[Dict[str, bool]] = None,
+    resolver: Optional[FieldResolver] = None,
 ) -> Tuple[List[str], List[str]]:
     """Filter links by active status.
     
+    Args:
+        link_records: List of (link_id, linked_record) tuples
+        require_active: Whether to split links by active status at all
+        active_status: Optional memo of is_record_active by record id for the
+            target entity; shared across calls so each record is evaluated once
+        resolver: Optional FieldResolver of the target entity
+
     Returns (active_link_ids, inactive_link_ids).
     Only filters when require_active is True.
     """
@@ -347,7 +408,12 @@ def _validate_active_links(
     for link_id, record in link_records:
         if record is None:
             continue  # Orphans handled separately
-        if is_record_active(record):
+        active = active_status.get(link_id) if active_status is not None else None
+        if active is None:
+            active = is_record_active(record, resolver=resolver)
+            if active_status is not None:
+                active_status[link_id] = active
+        if active:
             active_ids.append(link_id)
         else:
             inactive_ids.append(link_id)
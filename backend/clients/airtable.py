@@ -4,10 +4,9 @@ from __future__ import annotations
 
 import logging
 import os
-import time
-from collections import defaultdict
-from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from tenacity import (
     retry,
@@ -18,12 +17,13 @@ from tenacity import (
 )
 
 # Constants
-MIN_REQUEST_INTERVAL = float(os.getenv("AIRTABLE_MIN_REQUEST_INTERVAL", "0.2"))  # Seconds between requests
 API_TIMEOUT_SECONDS = int(os.getenv("AIRTABLE_API_TIMEOUT_SECONDS", "30"))  # Timeout for retries
 # Socket-level timeout for large record fetches (~10k records per entity)
 REQUEST_TIMEOUT_SECONDS = int(os.getenv("AIRTABLE_REQUEST_TIMEOUT_SECONDS", "300"))  # 5 minutes default
 # Progress logging interval (log every N pages or every 500 records)
 PROGRESS_LOG_INTERVAL = int(os.getenv("AIRTABLE_PROGRESS_LOG_INTERVAL", "5"))  # Log every 5 pages
+# Request only the columns the enabled checks read (set to "false" to fetch every column)
+AIRTABLE_FIELD_PROJECTION = os.getenv("AIRTABLE_FIELD_PROJECTION", "true").lower() not in ("0", "false", "no")
 
 try:
     from pyairtable import Api
@@ -34,43 +34,63 @@ except ImportError:
     RequestException = Exception
 
 from ..config.settings import AirtableConfig
+from ..services.airtable_schema_service import schema_service
+from .airtable_rate_limiter import RateLimitedSession
+from .airtable_snapshots import SnapshotStore, TableSnapshot, modified_since_formula, next_watermark
 
 logger = logging.getLogger(__name__)
 
 
+class FetchCancelledError(Exception):
+    """Raised when a fetch is stopped through its cancel event."""
+
+
+def build_airtable_api(token: str, timeout: Optional[tuple] = None) -> Api:
+    """Create a pyairtable Api whose requests share the per-base rate limiter.
+
+    pyairtable's own 429 retry is disabled; RateLimitedSession handles
+    Retry-After so the pause applies to every caller of the base.
+    """
+    if Api is None:
+        raise ImportError(
+            "pyairtable not installed. Install with: pip install pyairtable"
+        )
+    api = Api(token, timeout=timeout, retry_strategy=False)
+    session = RateLimitedSession()
+    session.headers.update(api.session.headers)
+    api.session = session
+    return api
 
 
 class AirtableClient:
     """Thin wrapper around pyairtable with retry/rate limiting support."""
 
-    def __init__(self, config: AirtableConfig):
+    def __init__(self, config: AirtableConfig, snapshot_store: Optional[SnapshotStore] = None):
         self._config = config
-        self._last_request_time: Dict[str, float] = defaultdict(float)
+        self._snapshot_store = snapshot_store or SnapshotStore()
+        self._api_lock = threading.Lock()
         self._api: Optional[Api] = None
 
     def _get_api(self) -> Api:
         """Lazy initialization of pyairtable API client."""
-        if self._api is None:
-            if Api is None:
-                raise ImportError(
-                    "pyairtable not installed. Install with: pip install pyairtable"
-                )
-            # Use Personal Access Token (PAT) for Airtable authentication
-            pat = os.getenv("AIRTABLE_PAT")
+        with self._api_lock:
+            if self._api is None:
+                # Use Personal Access Token (PAT) for Airtable authentication
+                pat = os.getenv("AIRTABLE_PAT")
             
-            if not pat:
-                raise ValueError(
-                    "AIRTABLE_PAT environment variable must be set"
-                )
+                if not pat:
+                    raise ValueError(
+                        "AIRTABLE_PAT environment variable must be set"
+                    )
             
-            token = pat
+                token = pat
 
-            # Configure socket timeout: (connect_timeout, read_timeout)
-            # Both set to REQUEST_TIMEOUT_SECONDS to prevent hanging on network issues
-            timeout = (REQUEST_TIMEOUT_SECONDS, REQUEST_TIMEOUT_SECONDS)
-            self._api = Api(token, timeout=timeout)
-            logger.info(f"Initialized Airtable API with {REQUEST_TIMEOUT_SECONDS}s socket timeout")
-        return self._api
+                # Configure socket timeout: (connect_timeout, read_timeout)
+                # Both set to REQUEST_TIMEOUT_SECONDS to prevent hanging on network issues
+                timeout = (REQUEST_TIMEOUT_SECONDS, REQUEST_TIMEOUT_SECONDS)
+                self._api = build_airtable_api(token, timeout=timeout)
+                logger.info(f"Initialized Airtable API with {REQUEST_TIMEOUT_SECONDS}s socket timeout")
+            return self._api
 
     def _resolve_table(self, key: str) -> Dict[str, str]:
         """Resolve table configuration with validation."""
@@ -92,18 +112,6 @@ class AirtableClient:
             "table_id": table_id,
         }
 
-    def _throttle_request(self, base_id: str) -> None:
-        """Throttle requests to respect rate limits."""
-        now = time.time()
-        last_time = self._last_request_time[base_id]
-        elapsed = now - last_time
-        
-        if elapsed < MIN_REQUEST_INTERVAL:
-            sleep_time = MIN_REQUEST_INTERVAL - elapsed
-            time.sleep(sleep_time)
-        
-        self._last_request_time[base_id] = time.time()
-
     @retry(
         retry=retry_if_exception_type((HTTPError, RequestException)),
         stop=(stop_after_attempt(3) | stop_after_delay(API_TIMEOUT_SECONDS)),
@@ -116,17 +124,24 @@ class AirtableClient:
         base_id: str,
         table_id: str,
         progress_callback: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        formula: Optional[str] = None,
+        fields: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
-        """Fetch records with retry logic and rate limiting.
+        """Fetch records with retry logic.
+
+        Every page request is rate limited per base by the shared
+        RateLimitedSession (see build_airtable_api).
         
         Args:
             key: Entity key (e.g., "students", "parents")
             base_id: Airtable base ID
             table_id: Airtable table ID
             progress_callback: Optional callback function(message, metadata) called during pagination
+            cancel_event: Optional event; when set, pagination stops before the next page
+            formula: Optional filterByFormula restricting which records are returned
+            fields: Optional column names to return; None returns every column
         """
-        self._throttle_request(base_id)
-
         api = self._get_api()
         table = api.table(base_id, table_id)
 
@@ -136,25 +151,24 @@ class AirtableClient:
                 "entity": key,
                 "base": base_id,
                 "table": table_id,
+                "projected_fields": len(fields) if fields is not None else None,
             },
         )
 
-        # Fetch all records with pagination, throttling between pages
+        # Fetch all records with pagination (each page request is rate limited)
         records = []
         page_count = 0
         total_records = 0
         
         try:
-            # Use iterate() directly so we can throttle between pages
-            for page in table.iterate(page_size=100):
+            # Use iterate() directly so we can report progress between pages
+            for page in table.iterate(page_size=100, formula=formula, fields=fields):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise FetchCancelledError(f"Fetch of {key} cancelled after {page_count} page(s)")
                 records.extend(page)
                 total_records += len(page)
                 page_count += 1
                 
-                # Throttle between pages (first page already throttled above)
-                if page_count > 1:
-                    self._throttle_request(base_id)
-                
                 # Call progress callback if provided
                 if progress_callback:
                     try:
@@ -197,6 +211,9 @@ class AirtableClient:
                 },
             )
 
+        except FetchCancelledError:
+            logger.info("Airtable fetch cancelled", extra={"entity": key, "pages_fetched": page_count})
+            raise
         except Exception as exc:
             logger.error(
                 "Error fetching from Airtable",
@@ -218,12 +235,20 @@ class AirtableClient:
         self,
         key: str,
         progress_callback: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        incremental: bool = False,
+        fields: Optional[Iterable[str]] = None,
     ) -> List[Dict[str, Any]]:
         """Fetch records for the given logical entity.
 
         Args:
             key: Entity key (e.g., "students", "parents")
             progress_callback: Optional callback function(message, metadata) called during pagination
+            cancel_event: Optional event; when set, pagination stops before the next page
+            incremental: If True, fetch only records modified since the local
+                snapshot's watermark and merge them into the snapshot
+            fields: Optional candidate column names the caller reads. Names that
+                don't exist in the table are dropped; None fetches every column.
 
         Returns:
             List of record dictionaries
@@ -231,9 +256,14 @@ class AirtableClient:
         table_meta = self._resolve_table(key)
         base_id = table_meta["base_id"]
         table_id = table_meta["table_id"]
+        projection = self._project_fields(base_id, table_id, fields)
 
         try:
-            return self._fetch_with_retry(key, base_id, table_id, progress_callback)
+            return self._fetch_via_snapshot(
+                key, base_id, table_id, progress_callback, cancel_event, incremental, projection
+            )
+        except FetchCancelledError:
+            raise
         except Exception as exc:
             logger.error(
                 "Failed to fetch Airtable records after retries",
@@ -242,6 +272,149 @@ class AirtableClient:
             )
             raise
 
+    def _project_fields(
+        self,
+        base_id: str,
+        table_id: str,
+        candidates: Optional[Iterable[str]],
+    ) -> Optional[List[str]]:
+        """Narrow candidate column names to those that exist in the table.
+
+        Airtable rejects unknown field names, so candidates are intersected
+        with the table's columns from the schema snapshot. The primary field
+        is always kept. Returns None (fetch every column) when projection is
+        disabled or the table isn't in the snapshot.
+        """
+        if candidates is None or not AIRTABLE_FIELD_PROJECTION:
+            return None
+        try:
+            schema = schema_service.load()
+        except Exception:
+            return None
+        if schema.get("baseId") not in (None, base_id):
+            return None
+        table = next((t for t in schema.get("tables", []) if t.get("id") == table_id), None)
+        if table is None:
+            return None
+
+        wanted = set(candidates)
+        projection = {
+            f["name"]
+            for f in table.get("fields", [])
+            if f.get("name") in wanted or f.get("id") == table.get("primaryFieldId")
+        }
+        return sorted(projection)
+
+    def _fetch_projected(
+        self,
+        key: str,
+        base_id: str,
+        table_id: str,
+        progress_callback: Optional[Callable[[str, Optional[Dict[str, Any]]], None]],
+        cancel_event: Optional[threading.Event],
+        formula: Optional[str],
+        fields: Optional[List[str]],
+    ) -> tuple[List[Dict[str, Any]], Optional[List[str]]]:
+        """Fetch with a field projection, retrying unprojected if Airtable rejects it.
+
+        Returns the records and the projection that was actually applied.
+        """
+        try:
+            records = self._fetch_with_retry(
+                key, base_id, table_id, progress_callback, cancel_event, formula=formula, fields=fields
+            )
+            return records, fields
+        except HTTPError as exc:
+            response = getattr(exc, "response", None)
+            if fields is None or getattr(response, "status_code", None) != 422:
+                raise
+            # Schema snapshot is out of date (a column was renamed or removed)
+            logger.warning(
+                "Airtable rejected field projection, fetching all fields",
+                extra={"entity": key, "base": base_id, "table": table_id, "error": str(exc)},
+            )
+        records = self._fetch_with_retry(
+            key, base_id, table_id, progress_callback, cancel_event, formula=formula
+        )
+        return records, None
+
+    def _fetch_via_snapshot(
+        self,
+        key: str,
+        base_id: str,
+        table_id: str,
+        progress_callback: Optional[Callable[[str, Optional[Dict[str, Any]]], None]],
+        cancel_event: Optional[threading.Event],
+        incremental: bool,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetch a table, using and maintaining its local snapshot.
+
+        Full fetches refresh an existing snapshot; incremental fetches create
+        one on first use. An incremental fetch falls back to a full fetch when
+        the snapshot is missing, its last full sync is too old (that full pass
+        is what drops records deleted in Airtable), or it doesn't hold every
+        requested column.
+        """
+        fetch_started = datetime.now(timezone.utc)
+        snapshot = self._snapshot_store.load(base_id, table_id) if incremental else None
+
+        if (
+            snapshot is not None
+            and not snapshot.needs_full_sync(fetch_started)
+            and snapshot.covers(fields)
+        ):
+            changed, applied = self._fetch_projected(
+                key,
+                base_id,
+                table_id,
+                progress_callback,
+                cancel_event,
+                modified_since_formula(snapshot.watermark),
+                fields,
+            )
+            snapshot.merge(changed)
+            # Unchanged records keep their wider columns; only the new
+            # projection is guaranteed for every record now
+            if applied is not None:
+                snapshot.fields = applied
+            snapshot.watermark = next_watermark(fetch_started)
+            self._save_snapshot(snapshot)
+            logger.info(
+                "Incremental Airtable fetch merged into snapshot",
+                extra={
+                    "entity": key,
+                    "changed_records": len(changed),
+                    "snapshot_records": len(snapshot.records),
+                },
+            )
+            return snapshot.record_list()
+
+        records, applied = self._fetch_projected(
+            key, base_id, table_id, progress_callback, cancel_event, None, fields
+        )
+        if incremental or self._snapshot_store.exists(base_id, table_id):
+            snapshot = TableSnapshot(
+                base_id=base_id,
+                table_id=table_id,
+                watermark=next_watermark(fetch_started),
+                last_full_sync=fetch_started,
+                fields=applied,
+            )
+            snapshot.merge(records)
+            self._save_snapshot(snapshot)
+        return records
+
+    def _save_snapshot(self, snapshot: TableSnapshot) -> None:
+        """Persist a snapshot; failures only cost the next run a full fetch."""
+        try:
+            self._snapshot_store.save(snapshot)
+        except Exception as exc:
+            logger.warning(
+                "Failed to save Airtable snapshot",
+                extra={"base": snapshot.base_id, "table": snapshot.table_id, "error": str(exc)},
+            )
+
     def fetch_records_by_id(
         self,
         base_id: str,
@@ -0,0 +1,140 @@
+"""Process-wide, thread-safe rate limiting for Airtable API calls.
+
+Airtable allows 5 requests per second per base and answers bursts above that
+with a 429 and a ~30 second penalty. Every Airtable request made by this
+process goes through a per-base token bucket so concurrent fetchers and API
+endpoints share one budget instead of each tracking their own.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+# Requests per second allowed per base (Airtable documents 5 req/s)
+AIRTABLE_REQUESTS_PER_SECOND = float(os.getenv("AIRTABLE_REQUESTS_PER_SECOND", "5"))
+# Tokens that can accumulate while idle. 1 keeps requests evenly spaced so a
+# burst can never exceed the per-second budget.
+AIRTABLE_RATE_LIMIT_BURST = float(os.getenv("AIRTABLE_RATE_LIMIT_BURST", "1"))
+# Pause applied when a 429 carries no usable Retry-After header
+AIRTABLE_429_BACKOFF_SECONDS = float(os.getenv("AIRTABLE_429_BACKOFF_SECONDS", "30"))
+# How many times a single request is re-sent after a 429
+AIRTABLE_429_MAX_RETRIES = int(os.getenv("AIRTABLE_429_MAX_RETRIES", "3"))
+
+_BASE_ID_PATTERN = re.compile(r"/(app[A-Za-z0-9]{14})(?:/|$)")
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Callers reserve a token under the lock and sleep outside it, so waiting
+    threads never block each other's bookkeeping. The balance may go negative;
+    each reservation then waits until its share of the debt has refilled.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._rate = rate
+        self._capacity = max(capacity, 1.0)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def acquire(self) -> float:
+        """Block until a token is available. Returns the time spent waiting."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for at least ``seconds`` (e.g. after a 429).
+
+        Concurrent pauses don't stack: the bucket waits for the longest one.
+        """
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, -seconds * self._rate)
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_base_limiter(base_id: str) -> TokenBucket:
+    """Return the shared token bucket for a base, creating it on first use."""
+    with _limiters_lock:
+        limiter = _limiters.get(base_id)
+        if limiter is None:
+            limiter = TokenBucket(AIRTABLE_REQUESTS_PER_SECOND, AIRTABLE_RATE_LIMIT_BURST)
+            _limiters[base_id] = limiter
+        return limiter
+
+
+def base_id_from_url(url: str) -> Optional[str]:
+    """Extract the base ID from an Airtable API URL (data or meta endpoints)."""
+    match = _BASE_ID_PATTERN.search(str(url))
+    return match.group(1) if match else None
+
+
+def parse_retry_after(response: requests.Response) -> float:
+    """Seconds to wait after a 429, from Retry-After or the default penalty."""
+    value = response.headers.get("Retry-After")
+    if value:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+    return AIRTABLE_429_BACKOFF_SECONDS
+
+
+class RateLimitedSession(requests.Session):
+    """requests Session that routes every call through the per-base limiter.
+
+    A 429 pauses the base's bucket for Retry-After seconds (shared by every
+    thread using that base) before the request is re-sent.
+    """
+
+    def request(self, method, url, *args, **kwargs):  # type: ignore[override]
+        base_id = base_id_from_url(url)
+        limiter = get_base_limiter(base_id) if base_id else get_base_limiter("_global")
+
+        attempt = 0
+        while True:
+            limiter.acquire()
+            response = super().request(method, url, *args, **kwargs)
+            if response.status_code != 429 or attempt >= AIRTABLE_429_MAX_RETRIES:
+                return response
+            attempt += 1
+            delay = parse_retry_after(response)
+            logger.warning(
+                "Airtable rate limit hit, pausing base",
+                extra={"base": base_id, "retry_after": delay, "attempt": attempt},
+            )
+            limiter.pause(delay)
+            response.close()
@@ -0,0 +1,134 @@
+"""On-disk record snapshots that back incremental Airtable fetches.
+
+One JSON file per (base, table) holds every record seen so far plus a
+watermark. Incremental fetches request only records modified since the
+watermark and merge them in; a periodic full fetch replaces the snapshot so
+deleted records drop out.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..utils.local_state import state_path
+
+AIRTABLE_SNAPSHOT_DIR = state_path("AIRTABLE_SNAPSHOT_DIR", "airtable-snapshots")
+# Maximum age of the last full fetch before an incremental run reconciles deletions
+AIRTABLE_FULL_SYNC_INTERVAL_HOURS = float(os.getenv("AIRTABLE_FULL_SYNC_INTERVAL_HOURS", "168"))
+# Overlap subtracted from the watermark to absorb clock skew and in-flight edits
+AIRTABLE_WATERMARK_OVERLAP_SECONDS = int(os.getenv("AIRTABLE_WATERMARK_OVERLAP_SECONDS", "300"))
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TableSnapshot:
+    base_id: str
+    table_id: str
+    watermark: datetime
+    last_full_sync: datetime
+    records: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Columns every record is known to carry; None means all columns
+    fields: Optional[List[str]] = None
+
+    def needs_full_sync(self, now: datetime) -> bool:
+        return now - self.last_full_sync >= timedelta(hours=AIRTABLE_FULL_SYNC_INTERVAL_HOURS)
+
+    def covers(self, fields: Optional[List[str]]) -> bool:
+        """Whether every record holds the requested columns (None = all columns)."""
+        if self.fields is None:
+            return True
+        return fields is not None and set(fields) <= set(self.fields)
+
+    def merge(self, changed: List[Dict[str, Any]]) -> None:
+        """Insert or replace records returned by an incremental fetch."""
+        for record in changed:
+            record_id = record.get("id")
+            if record_id:
+                self.records[record_id] = record
+
+    def record_list(self) -> List[Dict[str, Any]]:
+        return list(self.records.values())
+
+
+def modified_since_formula(watermark: datetime) -> str:
+    """Airtable formula selecting records modified after the watermark."""
+    stamp = watermark.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    return f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{stamp}'))"
+
+
+def next_watermark(fetch_started: datetime) -> datetime:
+    return fetch_started - timedelta(seconds=AIRTABLE_WATERMARK_OVERLAP_SECONDS)
+
+
+class SnapshotStore:
+    """Reads and atomically writes TableSnapshot files."""
+
+    def __init__(self, root: str | os.PathLike = AIRTABLE_SNAPSHOT_DIR):
+        self._root = Path(root)
+
+    def _path(self, base_id: str, table_id: str) -> Path:
+        return self._root / base_id / f"{table_id}.json"
+
+    def exists(self, base_id: str, table_id: str) -> bool:
+        return self._path(base_id, table_id).exists()
+
+    def load(self, base_id: str, table_id: str) -> Optional[TableSnapshot]:
+        """Load a snapshot, or None if it is missing or unreadable."""
+        path = self._path(base_id, table_id)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get("version") != SNAPSHOT_FORMAT_VERSION:
+                return None
+            return TableSnapshot(
+                base_id=payload["base_id"],
+                table_id=payload["table_id"],
+                watermark=datetime.fromisoformat(payload["watermark"]),
+                last_full_sync=datetime.fromisoformat(payload["last_full_sync"]),
+                records=payload.get("records", {}),
+                fields=payload.get("fields"),
+            )
+        except Exception as exc:
+            logger.warning(
+                "Ignoring unreadable Airtable snapshot",
+                extra={"base": base_id, "table": table_id, "path": str(path), "error": str(exc)},
+            )
+            return None
+
+    def save(self, snapshot: TableSnapshot) -> None:
+        path = self._path(snapshot.base_id, snapshot.table_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "base_id": snapshot.base_id,
+            "table_id": snapshot.table_id,
+            "watermark": snapshot.watermark.isoformat(),
+            "last_full_sync": snapshot.last_full_sync.isoformat(),
+            "fields": snapshot.fields,
+            "records": snapshot.records,
+        }
+        # Write to a temp file in the same directory, then rename, so a crash
+        # mid-write never leaves a truncated snapshot behind
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{snapshot.table_id}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
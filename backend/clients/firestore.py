@@ -4,13 +4,13 @@ from __future__ import annotations
 
 import hashlib
 import logging
-import math
-import random
+import os
 import re
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, Optional, Set
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 try:
     from google.cloud import firestore
@@ -19,17 +19,56 @@ except ImportError:
     firestore = None
     retry = None
 
+try:
+    from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriterOptions
+except ImportError:
+    BulkRetry = None
+    BulkWriterOptions = None
+
 from ..config.settings import FirestoreConfig
+from ..utils.issues import IssueScope
+from .issue_manifest import FINGERPRINT_FIELDS, IssueManifest, KnownIssue, get_issue_manifest, issue_fingerprint
 
 logger = logging.getLogger(__name__)
 
+# Issue writes: "bulk" uses Firestore's BulkWriter (parallel, rate-controlled,
+# per-document retries); "batch" commits one batch at a time
+FIRESTORE_WRITE_MODE = os.getenv("FIRESTORE_WRITE_MODE", "bulk")
+# Firestore's limit on operations per batch commit
+FIRESTORE_BATCH_SIZE = 500
+# BulkWriter ramp-up (500/50/5): starting writes per second and the ceiling
+FIRESTORE_BULK_INITIAL_OPS = int(os.getenv("FIRESTORE_BULK_INITIAL_OPS", "500"))
+FIRESTORE_BULK_MAX_OPS = int(os.getenv("FIRESTORE_BULK_MAX_OPS", "10000"))
+# Attempts per document before a transient write error fails the run
+FIRESTORE_BULK_MAX_ATTEMPTS = int(os.getenv("FIRESTORE_BULK_MAX_ATTEMPTS", "5"))
+# Skip rewriting issues whose content fingerprint is unchanged since the last write.
+# Skipped issues keep their old run_id and are listed only in the run's
+# seen_issues documents, which the frontend's run_id filters don't read yet
+ISSUE_SKIP_UNCHANGED = os.getenv("ISSUE_SKIP_UNCHANGED", "false").lower() == "true"
+# Issue ids per seen_issues marker document (documents are limited to 1 MiB)
+ISSUE_SEEN_CHUNK_SIZE = int(os.getenv("ISSUE_SEEN_CHUNK_SIZE", "5000"))
+# Firestore "in" filters take at most 30 values
+FIRESTORE_IN_LIMIT = 30
+# Collection of per-issues-collection generation counters, incremented after
+# every write to the issues collection so instances can tell whether their
+# issue manifest is still current
+ISSUE_GENERATION_COLLECTION = os.getenv("ISSUE_GENERATION_COLLECTION", "integrity_meta")
+# resolved_by value of automatically resolved issues
+AUTO_RESOLVED_BY = "integrity-runner"
+# Delete batches committed in parallel by delete_bulk_issues
+FIRESTORE_DELETE_WORKERS = int(os.getenv("FIRESTORE_DELETE_WORKERS", "8"))
+# gRPC codes worth retrying: DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, ABORTED,
+# INTERNAL, UNAVAILABLE
+_TRANSIENT_STATUS_CODES = {4, 8, 10, 13, 14}
+
 
 class FirestoreClient:
     """Firestore client for writing run metadata and metrics."""
 
-    def __init__(self, config: FirestoreConfig):
+    def __init__(self, config: FirestoreConfig, manifest: Optional[IssueManifest] = None):
         self._config = config
         self._client: firestore.Client | None = None
+        self._manifest = manifest if manifest is not None else get_issue_manifest()
 
     def _get_client(self) -> firestore.Client:
         """Lazy initialization of Firestore client."""
@@ -183,6 +222,19 @@ class FirestoreClient:
             )
             raise
 
+    def record_queue_position(self, run_id: str, position: int) -> None:
+        """Show a run's queue position on its run document.
+
+        Position 0 means the run has started (the runner sets its status);
+        a waiting run also gets status "queued". Unlike record_run, no
+        started_at/ended_at timestamps are filled in.
+        """
+        client = self._get_client()
+        data: Dict[str, Any] = {"queue_position": position}
+        if position > 0:
+            data["status"] = "queued"
+        client.collection(self._config.runs_collection).document(run_id).set(data, merge=True)
+
     def record_metrics(self, payload: Dict[str, Any]) -> None:
         """Write daily metrics to Firestore integrity_metrics_daily collection."""
         try:
@@ -208,7 +260,7 @@ class FirestoreClient:
             )
             raise
 
-    def _generate_doc_id(self, issue: Dict[str, Any]) -> str:
+    def issue_doc_id(self, issue: Dict[str, Any]) -> str:
         """Generate a Firestore document ID from an issue.
         
         Uses rule_id + record_id as the base, with sanitization for Firestore
@@ -241,82 +293,116 @@ class FirestoreClient:
         
         return doc_id
 
-    def _check_existing_documents(
-        self,
-        collection_ref: Any,
-        doc_ids: list[str],
-        progress_callback: Optional[Callable[[int, int, float], None]] = None,
-        total_issues: Optional[int] = None,
-    ) -> Set[str]:
-        """Check which documents already exist in Firestore.
-        
-        Uses get_all() for small batches, or skips check for very large batches.
-        
+    def _issue_generation_ref(self, client: Any) -> Any:
+        return client.collection(ISSUE_GENERATION_COLLECTION).document(self._config.issues_collection)
+
+    def _issue_generation(self, client: Any) -> Optional[int]:
+        """Current generation of the issues collection (0 if never written), None if unreadable."""
+        try:
+            snapshot = self._issue_generation_ref(client).get()
+        except Exception as exc:
+            logger.warning(
+                "Failed to read issue generation",
+                extra={"collection": self._config.issues_collection, "error": str(exc)},
+            )
+            return None
+        return int((snapshot.to_dict() or {}).get("generation", 0)) if snapshot.exists else 0
+
+    def mark_issues_changed(self, seen_generation: Optional[int] = None) -> Optional[int]:
+        """Increment the issues collection's generation after writing to it.
+
         Args:
-            collection_ref: Firestore collection reference
-            doc_ids: List of document IDs to check
-            progress_callback: Optional callback function(current, total, percentage) called during check
-            total_issues: Total number of issues (for progress calculation)
-            
+            seen_generation: Generation read before the writes (see _known_issues)
+
         Returns:
-            Set of document IDs that already exist
+            The new generation if this was the only increment since
+            ``seen_generation`` (so a manifest current for it plus this
+            writer's changes is current now), else None
         """
-        if not doc_ids:
-            return set()
-        
-        total_to_check = total_issues or len(doc_ids)
-        
-        # For very large batches (>5000), skip the existence check
-        # We'll use merge=True and determine new vs existing by checking first_seen_in_run field
-        LARGE_BATCH_THRESHOLD = 5000
-        if len(doc_ids) > LARGE_BATCH_THRESHOLD:
+        client = self._get_client()
+        ref = self._issue_generation_ref(client)
+        try:
+            ref.set(
+                {"generation": firestore.Increment(1), "updated_at": datetime.now(timezone.utc)},
+                merge=True,
+            )
+        except Exception as exc:
+            # Nobody can trust a manifest now; the count check still catches deletions
+            logger.error(
+                "Failed to increment issue generation",
+                extra={"collection": self._config.issues_collection, "error": str(exc)},
+                exc_info=True,
+            )
+            return None
+        generation = self._issue_generation(client)
+        if seen_generation is None or generation != seen_generation + 1:
+            return None
+        return generation
+
+    def _lookup_issues(self, collection_ref: Any, doc_ids: Iterable[str], field_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """``field_paths`` of the issue documents among ``doc_ids`` that exist."""
+        client = self._get_client()
+        doc_ids = list(doc_ids)
+        found: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(doc_ids), FIRESTORE_BATCH_SIZE):
+            refs = [collection_ref.document(doc_id) for doc_id in doc_ids[start:start + FIRESTORE_BATCH_SIZE]]
+            for snapshot in client.get_all(refs, field_paths=field_paths):
+                if snapshot.exists:
+                    found[snapshot.id] = snapshot.to_dict() or {}
+        return found
+
+    def _known_issues(
+        self, collection_ref: Any, doc_ids: Iterable[str]
+    ) -> Tuple[Dict[str, KnownIssue], Optional[int]]:
+        """Doc id -> KnownIssue of the ``doc_ids`` that exist.
+
+        Served from the local issue manifest while it is current for the
+        collection's generation; ids it doesn't hold, or all of them when it
+        is stale, are read from Firestore as fingerprint and status fields
+        (and saved). Issues the manifest holds as auto-resolved are read again
+        too, since a user may have changed their status since. Reads are
+        bounded by the run's issues, never the collection.
+
+        Returns:
+            (known, generation): generation read before the lookups, to pass
+            to mark_issues_changed() after writing
+        """
+        collection = self._config.issues_collection
+        doc_ids = list(doc_ids)
+        generation = self._issue_generation(self._get_client())
+        known = self._manifest.load(collection, generation, doc_ids) if self._manifest else None
+        stale = known is None
+        if stale:
+            known = {}
+            lookup = doc_ids
+        else:
+            lookup = [doc_id for doc_id in doc_ids if doc_id not in known or known[doc_id].auto_resolved]
+        found = {
+            doc_id: KnownIssue(
+                data.get("fingerprint") or "",
+                data.get("status") == "resolved" and data.get("resolved_by") == AUTO_RESOLVED_BY,
+            )
+            for doc_id, data in self._lookup_issues(
+                collection_ref, lookup, ["fingerprint", "status", "resolved_by"]
+            ).items()
+        }
+        if self._manifest:
+            if stale:
+                self._manifest.replace(collection, found, generation)
+            elif found:
+                self._manifest.update(collection, found, generation=generation)
+        if lookup:
             logger.info(
-                f"Skipping existence check for {len(doc_ids)} issues (using merge=True instead)",
-                extra={"total": len(doc_ids), "threshold": LARGE_BATCH_THRESHOLD}
+                "Looked up issue fingerprints in Firestore",
+                extra={
+                    "collection": collection,
+                    "looked_up": len(lookup),
+                    "found": len(found),
+                    "manifest_stale": stale,
+                    "generation": generation,
+                },
             )
-            if progress_callback:
-                try:
-                    # Mark check as complete immediately
-                    progress_callback(0, total_to_check, 10.0)
-                except Exception:
-                    pass
-            # Return empty set - all will be treated as potentially new
-            # We'll determine new vs existing after writing by checking first_seen_in_run
-            return set()
-        
-        existing_ids: Set[str] = set()
-        
-        # For smaller batches, use get_all() in chunks of 100
-        chunk_size = 100
-        for i in range(0, len(doc_ids), chunk_size):
-            chunk = doc_ids[i:i + chunk_size]
-            doc_refs = [collection_ref.document(doc_id) for doc_id in chunk]
-            
-            try:
-                # Batch read documents
-                docs = self._get_client().get_all(doc_refs)
-                for doc in docs:
-                    if doc.exists:
-                        existing_ids.add(doc.id)
-                
-                # Call progress callback after each chunk
-                if progress_callback:
-                    checked_count = min(i + chunk_size, len(doc_ids))
-                    try:
-                        # Estimate progress: checking is ~10% of total work, writing is ~90%
-                        check_progress = (checked_count / len(doc_ids)) * 10.0 if len(doc_ids) > 0 else 0.0
-                        progress_callback(0, total_to_check, check_progress)
-                    except Exception:
-                        pass
-            except Exception as exc:
-                logger.warning(
-                    "Error checking existing documents",
-                    extra={"error": str(exc), "chunk_size": len(chunk)},
-                    exc_info=True,
-                )
-                # Continue with other chunks even if one fails
-        
-        return existing_ids
+        return {**known, **found}, generation
 
     def _commit_batch_with_retry(
         self,
@@ -391,394 +477,262 @@ class FirestoreClient:
         if last_exception:
             raise last_exception
 
+    def _write_documents(
+        self,
+        client: Any,
+        writes: list[tuple[Any, Dict[str, Any], Any]],
+        report_progress: Callable[[int], None],
+    ) -> None:
+        """Set documents using FIRESTORE_WRITE_MODE.
+
+        Args:
+            client: Firestore client
+            writes: (document reference, data, merge) triples; merge is passed
+                to set() (True, False or a list of field paths)
+            report_progress: Called with the number of documents written so far,
+                after every FIRESTORE_BATCH_SIZE documents and at the end
+
+        Raises:
+            Exception: If any document can't be written
+        """
+        if FIRESTORE_WRITE_MODE == "bulk" and BulkWriterOptions is not None:
+            self._bulk_write(client, writes, report_progress)
+        else:
+            self._batch_write(client, writes, report_progress)
+
+    def _batch_write(
+        self,
+        client: Any,
+        writes: list[tuple[Any, Dict[str, Any], Any]],
+        report_progress: Callable[[int], None],
+    ) -> None:
+        """Commit writes in batches of FIRESTORE_BATCH_SIZE, one after another."""
+        for start in range(0, len(writes), FIRESTORE_BATCH_SIZE):
+            chunk = writes[start:start + FIRESTORE_BATCH_SIZE]
+            batch = client.batch()
+            for doc_ref, data, merge in chunk:
+                batch.set(doc_ref, data, merge=merge)
+            try:
+                self._commit_batch_with_retry(batch, len(chunk))
+            except Exception as exc:
+                logger.error(
+                    "Failed to commit batch of issues to Firestore",
+                    extra={"error": str(exc), "batch_size": len(chunk), "total_written": start},
+                    exc_info=True,
+                )
+                raise
+            report_progress(start + len(chunk))
+
+    def _bulk_write(
+        self,
+        client: Any,
+        writes: list[tuple[Any, Dict[str, Any], Any]],
+        report_progress: Callable[[int], None],
+    ) -> None:
+        """Write through a BulkWriter: parallel batches, ramped-up rate, per-document retries.
+
+        The BulkWriter starts at FIRESTORE_BULK_INITIAL_OPS writes per second
+        and raises its budget by 50% every 5 minutes up to FIRESTORE_BULK_MAX_OPS.
+        A document failing with a transient error is retried on its own (with
+        exponential backoff) up to FIRESTORE_BULK_MAX_ATTEMPTS times.
+        """
+        writer = client.bulk_writer(
+            options=BulkWriterOptions(
+                initial_ops_per_second=FIRESTORE_BULK_INITIAL_OPS,
+                max_ops_per_second=max(FIRESTORE_BULK_MAX_OPS, FIRESTORE_BULK_INITIAL_OPS),
+                retry=BulkRetry.exponential,
+            )
+        )
+        lock = threading.Lock()
+        written = 0
+        failures: list[Any] = []
+
+        def on_result(reference: Any, result: Any, bulk_writer: Any) -> None:
+            nonlocal written
+            with lock:
+                written += 1
+                done = written
+            if done % FIRESTORE_BATCH_SIZE == 0 or done == len(writes):
+                report_progress(done)
+
+        def on_error(failure: Any, bulk_writer: Any) -> bool:
+            if failure.code in _TRANSIENT_STATUS_CODES and failure.attempts + 1 < FIRESTORE_BULK_MAX_ATTEMPTS:
+                return True
+            with lock:
+                failures.append(failure)
+            return False
+
+        writer.on_write_result(on_result)
+        writer.on_write_error(on_error)
+        for doc_ref, data, merge in writes:
+            writer.set(doc_ref, data, merge=merge)
+        writer.close()
+
+        # A batch whose commit RPC raises is dropped by the BulkWriter without
+        # calling either callback for its documents
+        missing = len(writes) - written - len(failures)
+        if missing:
+            logger.error(
+                "Issue writes lost by BulkWriter",
+                extra={"missing": missing, "written": written, "failed": len(failures), "total": len(writes)},
+            )
+            raise RuntimeError(f"{missing} of {len(writes)} issue writes were never acknowledged")
+
+        if failures:
+            logger.error(
+                "Failed to write issues to Firestore",
+                extra={
+                    "failed": len(failures),
+                    "total": len(writes),
+                    "code": failures[0].code,
+                    "error": failures[0].message,
+                },
+            )
+            raise RuntimeError(
+                f"{len(failures)} of {len(writes)} issue writes failed: {failures[0].message}"
+            )
+
     def record_issues(self, issues: list[Dict[str, Any]], progress_callback: Optional[Callable[[int, int, float], None]] = None) -> tuple[int, int]:
         """Write individual issues to Firestore integrity_issues collection.
-        
+
+        Whether an issue is new, changed or unchanged comes from the issue
+        manifest (see _known_issues), so only issues it doesn't know are read
+        back. Issues resolve_missing_issues closed are reopened.
+        New issues are written in full and changed ones get their content
+        fields replaced. With
+        ISSUE_SKIP_UNCHANGED, unchanged issues aren't rewritten; their ids are
+        listed in the run's seen_issues marker documents instead.
+
         Args:
             issues: List of issue dictionaries with rule_id, record_id, etc.
             progress_callback: Optional callback function(current, total, percentage) called after each batch
-            
+
         Returns:
             Tuple of (new_issues_count, total_issues_count)
         """
         if not issues:
             logger.info("No issues to write to Firestore")
             return (0, 0)
-        
+
         try:
             client = self._get_client()
             collection_ref = client.collection(self._config.issues_collection)
-            
-            # Generate all document IDs first
-            issue_doc_pairs = []
+            total_issues = len(issues)
+
+            # Later issues with the same document id win, as sequential merge writes did
+            issues_by_doc_id: Dict[str, Dict[str, Any]] = {}
             for issue in issues:
-                doc_id = self._generate_doc_id(issue)
-                issue_doc_pairs.append((doc_id, issue))
-            
-            # Check which documents already exist
-            all_doc_ids = [doc_id for doc_id, _ in issue_doc_pairs]
-            total_issues = len(all_doc_ids)
-            
-            # Notify progress callback before existence check
+                issues_by_doc_id[self.issue_doc_id(issue)] = issue
+
             if progress_callback:
                 try:
                     progress_callback(0, total_issues, 0.0)
                 except Exception:
                     pass
-            
-            # Check which documents already exist (with progress logging)
-            existing_ids = self._check_existing_documents(collection_ref, all_doc_ids, progress_callback, total_issues)
-            
-            # If we skipped the check (large batch), treat all as potentially new
-            # We'll determine new vs existing after writing by checking first_seen_in_run
-            skipped_check = len(existing_ids) == 0 and len(all_doc_ids) > 5000
-            
-            if skipped_check:
-                # For large batches, write all issues and determine new vs existing after
-                new_issues = issue_doc_pairs  # Treat all as potentially new
-                existing_issues = []
-                logger.info(
-                    f"Skipped existence check for {len(all_doc_ids)} issues - will determine new vs existing after writing",
-                    extra={"total": len(issue_doc_pairs)},
-                )
-            else:
-                # Separate new issues from existing issues
-                new_issues = [(doc_id, issue) for doc_id, issue in issue_doc_pairs if doc_id not in existing_ids]
-                existing_issues = [(doc_id, issue) for doc_id, issue in issue_doc_pairs if doc_id in existing_ids]
-                existing_count = len(existing_issues)
-                
-                if existing_count > 0:
-                    logger.info(
-                        "Found existing issues that will be updated with run_id",
-                        extra={"existing": existing_count, "new": len(new_issues), "total": len(issue_doc_pairs)},
-                    )
-                else:
-                    logger.info(
-                        "All issues are new",
-                        extra={"new": len(new_issues), "total": len(issue_doc_pairs)},
-                    )
-            
-            if not new_issues and not existing_issues:
-                logger.info("No issues to process")
-                return (0, 0)
-            
-            batch = client.batch()
-            batch_count = 0
-            total_written = 0
-            total_updated = 0
-            total_new_issues = len(new_issues) if not skipped_check else 0  # Will calculate after writing
-            
-            # Process new issues first (or all issues if we skipped check)
-            for doc_id, issue in new_issues:
-                doc_ref = collection_ref.document(doc_id)
-                
-                # Prepare issue data with timestamps
-                issue_data = issue.copy()
-                if "created_at" not in issue_data:
-                    issue_data["created_at"] = datetime.now(timezone.utc)
-                issue_data["updated_at"] = datetime.now(timezone.utc)
-                if "status" not in issue_data:
-                    issue_data["status"] = "open"
-                
-                # Set first_seen_in_run for new issues (only if run_id is provided)
-                if "run_id" in issue_data and "first_seen_in_run" not in issue_data:
-                    issue_data["first_seen_in_run"] = issue_data["run_id"]
-                
-                batch.set(doc_ref, issue_data, merge=True)
-                batch_count += 1
-                total_written += 1
-                
-                # Firestore batch limit is 500 operations
-                if batch_count >= 500:
-                    try:
-                        self._commit_batch_with_retry(batch, batch_count)
-                    except Exception as exc:
-                        logger.error(
-                            "Failed to commit batch of new issues to Firestore",
-                            extra={
-                                "error": str(exc),
-                                "batch_size": batch_count,
-                                "total_written": total_written,
-                                "total_updated": total_updated,
-                            },
-                            exc_info=True,
-                        )
-                        raise
-                    if progress_callback:
-                        try:
-                            original_total = len(issue_doc_pairs)
-                            # Writing is 90% of work (checking was 10%), so progress = 10% + (written/total * 90%)
-                            written_progress = (total_written / original_total * 90.0) if original_total > 0 else 0.0
-                            progress_callback(total_written + total_updated, original_total, 10.0 + written_progress)
-                        except Exception:
-                            pass
-                    batch = client.batch()
-                    batch_count = 0
-            
-            # Commit remaining new issues
-            if batch_count > 0:
+            known, generation = self._known_issues(collection_ref, issues_by_doc_id)
+            reopen = {doc_id for doc_id, stored in known.items() if stored.auto_resolved}
+            if progress_callback:
                 try:
-                    self._commit_batch_with_retry(batch, batch_count)
-                except Exception as exc:
-                    logger.error(
-                        "Failed to commit final batch of new issues to Firestore",
-                        extra={
-                            "error": str(exc),
-                            "batch_size": batch_count,
-                            "total_written": total_written,
-                            "total_updated": total_updated,
-                        },
-                        exc_info=True,
-                    )
-                    raise
-                if progress_callback:
-                    try:
-                        original_total = len(issue_doc_pairs)
-                        # Writing is 90% of work (checking was 10%), so progress = 10% + (written/total * 90%)
-                        written_progress = (total_written / original_total * 90.0) if original_total > 0 else 0.0
-                        progress_callback(total_written + total_updated, original_total, 10.0 + written_progress)
-                    except Exception:
-                        pass
-                batch = client.batch()
-                batch_count = 0
-            
-            # Now update existing issues with run_id (so they can be filtered by run_id)
-            for doc_id, issue in existing_issues:
+                    progress_callback(0, total_issues, 10.0)
+                except Exception:
+                    pass
+
+            writes: list[tuple[Any, Dict[str, Any], Any]] = []
+            written: Dict[str, KnownIssue] = {}
+            unchanged: list[str] = []
+            new_count = 0
+            changed_count = 0
+            reopened_count = 0
+            for doc_id, issue in issues_by_doc_id.items():
                 doc_ref = collection_ref.document(doc_id)
+                fingerprint = issue_fingerprint(issue)
+                stored = known[doc_id].fingerprint if doc_id in known else None
+                if stored is None:
+                    # Prepare issue data with timestamps
+                    issue_data = issue.copy()
+                    if "created_at" not in issue_data:
+                        issue_data["created_at"] = datetime.now(timezone.utc)
+                    issue_data["updated_at"] = datetime.now(timezone.utc)
+                    if "status" not in issue_data:
+                        issue_data["status"] = "open"
+                    # Set first_seen_in_run for new issues (only if run_id is provided)
+                    if "run_id" in issue_data and "first_seen_in_run" not in issue_data:
+                        issue_data["first_seen_in_run"] = issue_data["run_id"]
+                    issue_data["fingerprint"] = fingerprint
+                    writes.append((doc_ref, issue_data, True))
+                    new_count += 1
+                elif stored == fingerprint and doc_id not in reopen and ISSUE_SKIP_UNCHANGED:
+                    unchanged.append(doc_id)
+                    continue
+                elif stored == fingerprint and doc_id not in reopen:
+                    # Only refresh run_id and updated_at (so it can be filtered by run_id)
+                    update_data: Dict[str, Any] = {"updated_at": datetime.now(timezone.utc)}
+                    if "run_id" in issue:
+                        update_data["run_id"] = issue["run_id"]
+                    writes.append((doc_ref, update_data, True))
+                else:
+                    # Replace the content fields whole (stale metadata keys must not
+                    # survive a merge); status, created_at and first_seen_in_run stay
+                    update_data = {name: issue[name] for name in FINGERPRINT_FIELDS if name in issue}
+                    update_data["fingerprint"] = fingerprint
+                    update_data["updated_at"] = datetime.now(timezone.utc)
+                    if "run_id" in issue:
+                        update_data["run_id"] = issue["run_id"]
+                    if doc_id in reopen:
+                        # Detected again after resolve_missing_issues closed it
+                        update_data["status"] = "open"
+                        for name in ("resolved_at", "resolved_by", "resolved_in_run", "resolution"):
+                            update_data[name] = firestore.DELETE_FIELD
+                        reopened_count += 1
+                    writes.append((doc_ref, update_data, list(update_data)))
+                    changed_count += 1
+                written[doc_id] = KnownIssue(fingerprint)
 
-                # Update run_id and updated_at for existing issues
-                # Use set with merge=True instead of update to be more robust
-                update_data = {
-                    "updated_at": datetime.now(timezone.utc),
-                }
-                if "run_id" in issue:
-                    update_data["run_id"] = issue["run_id"]
+            run_id = next((issue["run_id"] for issue in issues if "run_id" in issue), None)
+            if unchanged and run_id:
+                seen_ref = client.collection(self._config.runs_collection).document(run_id).collection("seen_issues")
+                for index, start in enumerate(range(0, len(unchanged), ISSUE_SEEN_CHUNK_SIZE)):
+                    chunk = unchanged[start:start + ISSUE_SEEN_CHUNK_SIZE]
+                    writes.append((seen_ref.document(f"{index:05d}"), {"run_id": run_id, "doc_ids": chunk}, False))
 
-                batch.set(doc_ref, update_data, merge=True)
-                batch_count += 1
-                total_updated += 1
-                
-                # Firestore batch limit is 500 operations
-                if batch_count >= 500:
-                    try:
-                        self._commit_batch_with_retry(batch, batch_count)
-                    except Exception as exc:
-                        logger.error(
-                            "Failed to commit batch of existing issues to Firestore",
-                            extra={
-                                "error": str(exc),
-                                "batch_size": batch_count,
-                                "total_written": total_written,
-                                "total_updated": total_updated,
-                            },
-                            exc_info=True,
-                        )
-                        raise
-                    if progress_callback:
-                        try:
-                            original_total = len(issue_doc_pairs)
-                            # Writing is 90% of work (checking was 10%), so progress = 10% + (written/total * 90%)
-                            written_progress = ((total_written + total_updated) / original_total * 90.0) if original_total > 0 else 0.0
-                            progress_callback(total_written + total_updated, original_total, 10.0 + written_progress)
-                        except Exception:
-                            pass
-                    batch = client.batch()
-                    batch_count = 0
-            
-            # Commit remaining updates
-            if batch_count > 0:
-                try:
-                    self._commit_batch_with_retry(batch, batch_count)
-                except Exception as exc:
-                    logger.error(
-                        "Failed to commit final batch of existing issues to Firestore",
-                        extra={
-                            "error": str(exc),
-                            "batch_size": batch_count,
-                            "total_written": total_written,
-                            "total_updated": total_updated,
-                        },
-                        exc_info=True,
-                    )
-                    raise
+            def report_progress(done: int) -> None:
                 if progress_callback:
                     try:
-                        original_total = len(issue_doc_pairs)
+                        # Skipped issues count as processed from the start
+                        current = min(total_issues, len(unchanged) + done)
                         # Writing is 90% of work (checking was 10%), so progress = 10% + (written/total * 90%)
-                        written_progress = ((total_written + total_updated) / original_total * 90.0) if original_total > 0 else 0.0
-                        progress_callback(total_written + total_updated, original_total, 10.0 + written_progress)
+                        written_progress = current / total_issues * 90.0
+                        progress_callback(current, total_issues, 10.0 + written_progress)
                     except Exception:
                         pass
-                batch = None
-            
-            # If we skipped the existence check, determine new vs existing by checking first_seen_in_run
-            if skipped_check:
-                # Get run_id from issues (all should have the same run_id)
-                run_id = None
-                for _, issue in issue_doc_pairs:
-                    if "run_id" in issue:
-                        run_id = issue["run_id"]
-                        break
-                
-                if run_id:
-                    # For large batches, use sampling instead of reading all documents
-                    LARGE_BATCH_THRESHOLD = 10000
-                    USE_SAMPLING = len(all_doc_ids) > LARGE_BATCH_THRESHOLD
-                    
-                    if USE_SAMPLING:
-                        # Use statistical sampling for large batches
-                        sample_size = min(2000, len(all_doc_ids))
-                        sample_doc_ids = random.sample(all_doc_ids, sample_size)
-                        
-                        def check_sample_documents() -> int:
-                            """Check sample documents and return count of new issues."""
-                            sample_new = 0
-                            check_chunk_size = 500
-                            
-                            for i in range(0, len(sample_doc_ids), check_chunk_size):
-                                chunk_doc_ids = sample_doc_ids[i:i + check_chunk_size]
-                                chunk_doc_refs = [collection_ref.document(doc_id) for doc_id in chunk_doc_ids]
-                                chunk_docs = client.get_all(chunk_doc_refs)
-                                
-                                for doc in chunk_docs:
-                                    if doc.exists:
-                                        doc_data = doc.to_dict()
-                                        if doc_data.get("first_seen_in_run") == run_id:
-                                            sample_new += 1
-                                
-                                # Log progress during sampling
-                                if progress_callback:
-                                    try:
-                                        checked = min(i + check_chunk_size, len(sample_doc_ids))
-                                        sample_progress = (checked / len(sample_doc_ids)) * 100.0
-                                        progress_callback(
-                                            len(all_doc_ids),
-                                            len(all_doc_ids),
-                                            95.0 + (sample_progress * 0.05)  # Last 5% of progress
-                                        )
-                                    except Exception:
-                                        pass
-                            
-                            return sample_new
-                        
-                        try:
-                            # Use timeout protection for post-write check (60 seconds)
-                            with ThreadPoolExecutor(max_workers=1) as executor:
-                                future = executor.submit(check_sample_documents)
-                                sample_new_count = future.result(timeout=60)
-                            
-                            # Extrapolate from sample
-                            new_ratio = sample_new_count / sample_size if sample_size > 0 else 0.0
-                            total_new_issues = int(new_ratio * len(all_doc_ids))
-                            
-                            # Calculate confidence interval (95% confidence)
-                            # Using normal approximation for binomial distribution
-                            p = new_ratio
-                            n = sample_size
-                            z = 1.96  # 95% confidence
-                            margin = z * math.sqrt((p * (1 - p)) / n) if n > 0 else 0
-                            lower_bound = max(0, int((p - margin) * len(all_doc_ids)))
-                            upper_bound = min(len(all_doc_ids), int((p + margin) * len(all_doc_ids)))
-                            
-                            logger.info(
-                                f"Estimated new issues from sample: {total_new_issues}/{len(all_doc_ids)} "
-                                f"(95% CI: {lower_bound}-{upper_bound}, sample: {sample_new_count}/{sample_size})",
-                                extra={
-                                    "run_id": run_id,
-                                    "method": "sampling",
-                                    "sample_size": sample_size,
-                                    "sample_new": sample_new_count,
-                                    "estimated_new": total_new_issues,
-                                    "total": len(all_doc_ids),
-                                    "confidence_interval": [lower_bound, upper_bound],
-                                }
-                            )
-                        except FuturesTimeoutError:
-                            logger.warning(
-                                "Post-write check timed out after 60 seconds, using estimate",
-                                extra={"run_id": run_id, "total_issues": len(all_doc_ids)},
-                            )
-                            total_new_issues = int(len(all_doc_ids) * 0.8)  # Conservative estimate: 80% new
-                        except Exception as exc:
-                            logger.warning(
-                                "Failed to count new issues after writing, using estimate",
-                                extra={"error": str(exc), "run_id": run_id, "total_issues": len(all_doc_ids)},
-                            )
-                            total_new_issues = int(len(all_doc_ids) * 0.8)  # Conservative estimate: 80% new
-                    else:
-                        # For smaller batches, read all documents
-                        def check_all_documents() -> int:
-                            """Check all documents and return count of new issues."""
-                            total_new = 0
-                            check_chunk_size = 500
-                            
-                            for i in range(0, len(all_doc_ids), check_chunk_size):
-                                chunk_doc_ids = all_doc_ids[i:i + check_chunk_size]
-                                chunk_doc_refs = [collection_ref.document(doc_id) for doc_id in chunk_doc_ids]
-                                chunk_docs = client.get_all(chunk_doc_refs)
-                                
-                                for doc in chunk_docs:
-                                    if doc.exists:
-                                        doc_data = doc.to_dict()
-                                        if doc_data.get("first_seen_in_run") == run_id:
-                                            total_new += 1
-                                
-                                # Log progress during check
-                                if progress_callback:
-                                    try:
-                                        checked = min(i + check_chunk_size, len(all_doc_ids))
-                                        check_progress = (checked / len(all_doc_ids)) * 100.0
-                                        progress_callback(
-                                            len(all_doc_ids),
-                                            len(all_doc_ids),
-                                            95.0 + (check_progress * 0.05)  # Last 5% of progress
-                                        )
-                                    except Exception:
-                                        pass
-                            
-                            return total_new
-                        
-                        try:
-                            # Use timeout protection (60 seconds)
-                            with ThreadPoolExecutor(max_workers=1) as executor:
-                                future = executor.submit(check_all_documents)
-                                total_new_issues = future.result(timeout=60)
-                            
-                            logger.info(
-                                f"Counted new issues after writing: {total_new_issues}/{len(all_doc_ids)}",
-                                extra={"run_id": run_id, "method": "full_check"}
-                            )
-                        except FuturesTimeoutError:
-                            logger.warning(
-                                "Post-write check timed out after 60 seconds, using estimate",
-                                extra={"run_id": run_id, "total_issues": len(all_doc_ids)},
-                            )
-                            total_new_issues = int(len(all_doc_ids) * 0.8)  # Conservative estimate: 80% new
-                        except Exception as exc:
-                            logger.warning(
-                                "Failed to count new issues after writing, using estimate",
-                                extra={"error": str(exc), "run_id": run_id, "total_issues": len(all_doc_ids)},
-                            )
-                            total_new_issues = int(len(all_doc_ids) * 0.8)  # Conservative estimate: 80% new
-                else:
-                    # No run_id, can't determine - estimate
-                    total_new_issues = int(len(all_doc_ids) * 0.8)
-                    logger.warning("No run_id in issues, cannot accurately count new vs existing")
-            
+
+            if writes:
+                try:
+                    self._write_documents(client, writes, report_progress)
+                finally:
+                    # Some documents may have been written even if others failed
+                    generation = self.mark_issues_changed(generation)
+            else:
+                report_progress(0)
+            if self._manifest:
+                self._manifest.update(self._config.issues_collection, written, generation=generation)
+
             logger.info(
                 "Recorded issues to Firestore",
                 extra={
                     "collection": self._config.issues_collection,
-                    "new_issues": total_new_issues,
-                    "updated_existing": total_updated if not skipped_check else (len(issue_doc_pairs) - total_new_issues),
-                    "total_processed": len(issue_doc_pairs),
-                    "new_written": total_written,
-                    "skipped_check": skipped_check,
+                    "new_issues": new_count,
+                    "updated_existing": len(issues_by_doc_id) - new_count,
+                    "changed": changed_count,
+                    "reopened": reopened_count,
+                    "unchanged_skipped": len(unchanged) if ISSUE_SKIP_UNCHANGED else 0,
+                    "total_processed": total_issues,
+                    "documents_written": len(writes),
                 },
             )
-            
+
             # Return counts: (new_issues_count, total_issues_count)
-            return (total_new_issues, len(issue_doc_pairs))
+            return (new_count, total_issues)
         except Exception as exc:
             logger.error(
                 "Failed to record issues",
@@ -787,6 +741,213 @@ class FirestoreClient:
             )
             raise
 
+    def resolve_missing_issues(
+        self,
+        detected_doc_ids: Set[str],
+        scopes: Iterable[IssueScope],
+        run_id: str,
+    ) -> int:
+        """Mark open issues in ``scopes`` that this run didn't detect as resolved.
+
+        Open issues of the scoped entities are read with one status + entity
+        query per FIRESTORE_IN_LIMIT entities, projected to entity and rule_id.
+        Issues the run didn't produce are closed in bulk with resolved_by
+        AUTO_RESOLVED_BY; record_issues reopens them if they come back.
+
+        Args:
+            detected_doc_ids: Document ids of every issue this run wrote (see issue_doc_id)
+            scopes: Entities and rules the run's checks re-evaluated
+            run_id: Run that stopped detecting the issues
+
+        Returns:
+            Number of issues resolved
+        """
+        scopes = list(scopes)
+        entities = sorted({scope.entity for scope in scopes})
+        if not entities:
+            return 0
+
+        client = self._get_client()
+        collection = self._config.issues_collection
+        collection_ref = client.collection(collection)
+        generation = self._issue_generation(client)
+        missing: Dict[str, KnownIssue] = {}
+        for start in range(0, len(entities), FIRESTORE_IN_LIMIT):
+            query = (
+                collection_ref.where("status", "==", "open")
+                .where("entity", "in", entities[start:start + FIRESTORE_IN_LIMIT])
+                .select(["entity", "rule_id", "fingerprint"])
+            )
+            for doc in query.stream():
+                if doc.id in detected_doc_ids:
+                    continue
+                data = doc.to_dict() or {}
+                if any(scope.covers(data.get("entity"), data.get("rule_id")) for scope in scopes):
+                    missing[doc.id] = KnownIssue(data.get("fingerprint") or "", auto_resolved=True)
+
+        if missing:
+            now = datetime.now(timezone.utc)
+            resolution = {
+                "status": "resolved",
+                "resolution": "not_redetected",
+                "resolved_at": now,
+                "resolved_by": AUTO_RESOLVED_BY,
+                "resolved_in_run": run_id,
+                "updated_at": now,
+            }
+            manifest_current = (
+                self._manifest is not None
+                and generation is not None
+                and self._manifest.generation(collection) == generation
+            )
+            try:
+                self._write_documents(
+                    client,
+                    [(collection_ref.document(doc_id), resolution, True) for doc_id in missing],
+                    lambda done: None,
+                )
+            finally:
+                # Other instances must learn which issues to reopen
+                generation = self.mark_issues_changed(generation)
+            if self._manifest:
+                self._manifest.update(collection, missing, generation=generation if manifest_current else None)
+
+        logger.info(
+            "Resolved issues no longer detected",
+            extra={"run_id": run_id, "entities": entities, "resolved": len(missing)},
+        )
+        return len(missing)
+
+    def _bulk_issue_queries(
+        self,
+        collection_ref: Any,
+        issue_types: Optional[Iterable[str]],
+        entities: Optional[Iterable[str]],
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> Tuple[List[Any], List[Any]]:
+        """Queries for issues created in [start, end] of any of the types OR entities.
+
+        Returns:
+            (queries, overlap): every matching issue is returned by one of the
+            type queries, one of the entity queries, or both; overlap queries
+            return exactly the issues matching both, once each
+        """
+        base = collection_ref
+        if start is not None:
+            base = base.where("created_at", ">=", start)
+        if end is not None:
+            base = base.where("created_at", "<=", end)
+        types = sorted(set(issue_types or ()))
+        entities = sorted(set(entities or ()))
+
+        def ordered(query: Any) -> Any:
+            # A created_at range is ordered by created_at ascending unless told
+            # otherwise; the composite indexes are all created_at DESCENDING
+            if start is None and end is None:
+                return query
+            return query.order_by("created_at", direction="DESCENDING")
+
+        if not types and not entities:
+            return [ordered(base)], []
+
+        def chunks(values: List[str]) -> List[List[str]]:
+            return [values[i:i + FIRESTORE_IN_LIMIT] for i in range(0, len(values), FIRESTORE_IN_LIMIT)]
+
+        queries = [ordered(base.where("issue_type", "in", chunk)) for chunk in chunks(types)]
+        queries += [ordered(base.where("entity", "in", chunk)) for chunk in chunks(entities)]
+        overlap = [
+            ordered(base.where("issue_type", "==", issue_type).where("entity", "in", chunk))
+            for issue_type in types
+            for chunk in chunks(entities)
+        ]
+        return queries, overlap
+
+    def count_bulk_issues(
+        self,
+        issue_types: Optional[Iterable[str]] = None,
+        entities: Optional[Iterable[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> int:
+        """Count issues delete_bulk_issues would delete, with count() aggregations.
+
+        Args:
+            issue_types: Issue types to match (OR'd with entities)
+            entities: Entities to match; with neither filter every issue matches
+            start: Earliest created_at, inclusive
+            end: Latest created_at, inclusive
+        """
+        collection_ref = self._get_client().collection(self._config.issues_collection)
+        queries, overlap = self._bulk_issue_queries(collection_ref, issue_types, entities, start, end)
+
+        def count(query: Any) -> int:
+            return query.count().get()[0][0].value
+
+        return sum(count(query) for query in queries) - sum(count(query) for query in overlap)
+
+    def delete_bulk_issues(
+        self,
+        issue_types: Optional[Iterable[str]] = None,
+        entities: Optional[Iterable[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> int:
+        """Delete issues matching the filters (see count_bulk_issues).
+
+        Matching issues are read as a keys-only projection and deleted in
+        batches of FIRESTORE_BATCH_SIZE, up to FIRESTORE_DELETE_WORKERS
+        batches committing at once while the queries are still streaming.
+
+        Returns:
+            Number of issues deleted
+
+        Raises:
+            Exception: If any batch fails to commit (earlier batches stay deleted)
+        """
+        client = self._get_client()
+        collection = self._config.issues_collection
+        queries, _ = self._bulk_issue_queries(client.collection(collection), issue_types, entities, start, end)
+
+        def commit(refs: List[Any]) -> None:
+            batch = client.batch()
+            for ref in refs:
+                batch.delete(ref)
+            self._commit_batch_with_retry(batch, len(refs))
+
+        deleted: Set[str] = set()
+        pending: List[Any] = []
+        with ThreadPoolExecutor(max_workers=max(1, FIRESTORE_DELETE_WORKERS)) as pool:
+            futures = []
+            for query in queries:
+                for doc in query.select([]).stream():
+                    # An issue can match both a type and an entity query
+                    if doc.id in deleted:
+                        continue
+                    deleted.add(doc.id)
+                    pending.append(doc.reference)
+                    if len(pending) >= FIRESTORE_BATCH_SIZE:
+                        futures.append(pool.submit(commit, pending))
+                        pending = []
+            if pending:
+                futures.append(pool.submit(commit, pending))
+            try:
+                for future in futures:
+                    future.result()
+            finally:
+                if deleted:
+                    self.mark_issues_changed()
+                if deleted and self._manifest:
+                    # The manifest wasn't checked before deleting, so it isn't
+                    # trusted afterwards either; the next run rebuilds it
+                    self._manifest.update(collection, {}, removed=deleted)
+
+        logger.info(
+            "Deleted issues in bulk",
+            extra={"collection": collection, "deleted": len(deleted), "batches": len(futures)},
+        )
+        return len(deleted)
+
     def record_flagged_rule(self, rule_id: str, data: Dict[str, Any]) -> None:
         """Write a flagged rule to Firestore integrity_flagged_rules collection.
         
@@ -881,6 +1042,27 @@ class FirestoreClient:
                 extra={"run_id": run_id, "error": str(exc)},
             )
     
+    def record_run_logs(self, run_id: str, entries: List[Dict[str, Any]]) -> None:
+        """Write several log entries to integrity_runs/{run_id}/logs in batch commits.
+
+        Args:
+            run_id: Run identifier
+            entries: Log documents (level, message, timestamp and metadata), in order
+
+        Raises:
+            Exception: If a batch can't be committed
+        """
+        client = self._get_client()
+        logs_ref = client.collection(self._config.runs_collection).document(run_id).collection("logs")
+        for start in range(0, len(entries), FIRESTORE_BATCH_SIZE):
+            chunk = entries[start:start + FIRESTORE_BATCH_SIZE]
+            batch = client.batch()
+            for entry in chunk:
+                # Auto-generated document ID, as logs_ref.add() would use
+                batch.set(logs_ref.document(), entry)
+            self._commit_batch_with_retry(batch, len(chunk))
+        logger.debug("Recorded run logs", extra={"run_id": run_id, "entries": len(entries)})
+
     def delete_run(self, run_id: str) -> None:
         """Delete a run and all its associated logs from Firestore.
         
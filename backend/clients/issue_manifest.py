@@ -0,0 +1,199 @@
+"""Local manifest of the issue documents in Firestore.
+
+record_issues needs to know which of a run's issues already exist (new vs
+existing accounting) and whether an existing issue changed (so unchanged ones
+aren't rewritten). Instead of reading those documents back from Firestore
+every run, the manifest keeps the issue document ids this instance has
+written or looked up, with the fingerprint of their stored content and
+whether resolve_missing_issues closed them (so record_issues knows which
+re-detected issues to reopen). It is updated after each run's writes succeed.
+
+Other instances write the same collection, so every write to it is followed
+by an increment of a generation counter stored in Firestore (see
+FirestoreClient._known_issues). The manifest remembers the generation it is
+current for and is only trusted while Firestore still holds that generation;
+otherwise the run's issues are looked up again and replace it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from ..utils.local_state import ProcessDefault, SQLiteState, state_enabled, state_path
+
+ISSUE_MANIFEST_PATH = state_path("ISSUE_MANIFEST_PATH", "issue-manifest.sqlite3")
+ISSUE_MANIFEST_ENABLED = state_enabled("ISSUE_MANIFEST_ENABLED")
+
+# Issue fields the fingerprint covers: everything written from the issue
+# except the run bookkeeping (run_id, timestamps, status)
+FINGERPRINT_FIELDS = (
+    "rule_id",
+    "issue_type",
+    "entity",
+    "record_id",
+    "severity",
+    "description",
+    "metadata",
+    "related_records",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    collection TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    auto_resolved INTEGER NOT NULL,
+    PRIMARY KEY (collection, doc_id)
+);
+CREATE TABLE IF NOT EXISTS collections (
+    collection TEXT PRIMARY KEY,
+    generation INTEGER
+);
+"""
+
+# SQLite's default limit on host parameters per statement is 999
+_IN_CHUNK = 500
+
+
+class KnownIssue(NamedTuple):
+    """What the manifest knows about one stored issue document."""
+
+    fingerprint: str
+    # Resolved by resolve_missing_issues and not reopened since
+    auto_resolved: bool = False
+
+
+def issue_fingerprint(issue: Dict[str, Any]) -> str:
+    """Stable hash of an issue's content (metadata keys in any order)."""
+    payload = json.dumps(
+        [issue.get(name) for name in FINGERPRINT_FIELDS],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class IssueManifest(SQLiteState):
+    """Reads and updates the on-disk issue manifest (rebuilt from Firestore after any error)."""
+
+    SCHEMA = _SCHEMA
+    LABEL = "issue manifest"
+
+    def __init__(self, path: str | os.PathLike = ISSUE_MANIFEST_PATH):
+        super().__init__(path)
+        self._lock = threading.Lock()
+
+    def generation(self, collection: str) -> Optional[int]:
+        """Generation the manifest is current for, or None if never saved."""
+        with self._lock:
+            try:
+                conn = self._connect()
+                try:
+                    row = conn.execute(
+                        "SELECT generation FROM collections WHERE collection = ?", (collection,)
+                    ).fetchone()
+                finally:
+                    conn.close()
+            except Exception as exc:
+                self._discard(exc)
+                return None
+        return row[0] if row else None
+
+    def load(
+        self, collection: str, generation: Optional[int], doc_ids: Iterable[str]
+    ) -> Optional[Dict[str, KnownIssue]]:
+        """Doc id -> KnownIssue of the ``doc_ids`` the manifest holds.
+
+        Returns None unless the manifest is current for ``generation``; ids
+        it doesn't hold may or may not exist in Firestore.
+        """
+        if generation is None:
+            return None
+        doc_ids: List[str] = list(doc_ids)
+        with self._lock:
+            try:
+                conn = self._connect()
+                try:
+                    row = conn.execute(
+                        "SELECT generation FROM collections WHERE collection = ?", (collection,)
+                    ).fetchone()
+                    if row is None or row[0] != generation:
+                        return None
+                    known: Dict[str, KnownIssue] = {}
+                    for start in range(0, len(doc_ids), _IN_CHUNK):
+                        chunk = doc_ids[start:start + _IN_CHUNK]
+                        for doc_id, fingerprint, auto_resolved in conn.execute(
+                            "SELECT doc_id, fingerprint, auto_resolved FROM issues "
+                            "WHERE collection = ? AND doc_id IN ({})".format(",".join("?" * len(chunk))),
+                            [collection, *chunk],
+                        ):
+                            known[doc_id] = KnownIssue(fingerprint, bool(auto_resolved))
+                    return known
+                finally:
+                    conn.close()
+            except Exception as exc:
+                self._discard(exc)
+                return None
+
+    def update(
+        self,
+        collection: str,
+        issues: Dict[str, KnownIssue],
+        removed: Iterable[str] = (),
+        generation: Optional[int] = None,
+    ) -> None:
+        """Record written documents and forget removed ones.
+
+        ``generation`` is the one the manifest is now current for, or None if
+        another writer may have changed the collection meanwhile.
+        """
+        self._write(collection, issues, removed, generation, replace=False)
+
+    def replace(self, collection: str, issues: Dict[str, KnownIssue], generation: Optional[int]) -> None:
+        """Replace a collection's manifest (after a lookup at ``generation``)."""
+        self._write(collection, issues, (), generation, replace=True)
+
+    def _write(
+        self,
+        collection: str,
+        issues: Dict[str, KnownIssue],
+        removed: Iterable[str],
+        generation: Optional[int],
+        replace: bool,
+    ) -> None:
+        with self._lock:
+            try:
+                conn = self._connect()
+                try:
+                    with conn:
+                        if replace:
+                            conn.execute("DELETE FROM issues WHERE collection = ?", (collection,))
+                        conn.execute("INSERT OR REPLACE INTO collections VALUES (?, ?)", (collection, generation))
+                        conn.executemany(
+                            "DELETE FROM issues WHERE collection = ? AND doc_id = ?",
+                            [(collection, doc_id) for doc_id in removed],
+                        )
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?)",
+                            [
+                                (collection, doc_id, known.fingerprint, int(known.auto_resolved))
+                                for doc_id, known in issues.items()
+                            ],
+                        )
+                finally:
+                    conn.close()
+            except Exception as exc:
+                self._discard(exc)
+
+
+_default_manifest = ProcessDefault(IssueManifest, ISSUE_MANIFEST_ENABLED)
+
+
+def get_issue_manifest() -> Optional[IssueManifest]:
+    """Process-wide manifest at ISSUE_MANIFEST_PATH, or None when disabled."""
+    return _default_manifest.get()
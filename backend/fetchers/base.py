@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List, Optional
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from ..clients.airtable import AirtableClient
 
@@ -15,13 +16,25 @@ class BaseFetcher:
     def fetch(
         self,
         progress_callback: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        incremental: bool = False,
+        fields: Optional[Iterable[str]] = None,
     ) -> List[Dict[str, Any]]:
         """Fetch all records for the entity.
         
         Args:
             progress_callback: Optional callback function(message, metadata) called during pagination
+            cancel_event: Optional event that stops pagination when set
+            incremental: Fetch only changes since the last snapshot and merge them in
+            fields: Column names the checks read; None fetches every column
         
         Returns:
             List of record dictionaries.
         """
-        return self._client.fetch_records(self._entity_key, progress_callback)
+        return self._client.fetch_records(
+            self._entity_key,
+            progress_callback,
+            cancel_event=cancel_event,
+            incremental=incremental,
+            fields=fields,
+        )
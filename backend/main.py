@@ -3,9 +3,9 @@ import os
 import json
 import time
 import threading
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from fastapi import FastAPI, HTTPException, Request, status, Depends, Query, Body
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
@@ -21,6 +21,8 @@ load_dotenv(backend_dir / ".env")
 from .config.schema_loader import load_schema_config
 from .middleware.auth import verify_bearer_token, verify_cloud_scheduler_auth, verify_firebase_token
 from .services.integrity_runner import IntegrityRunner
+from .services.run_scheduler import RunJob, RunQueueFullError, RunScheduler
+from .services.runner_context import get_runner_context
 
 from .services.airtable_schema_service import schema_service
 from .services.integrity_metrics_service import get_metrics_service
@@ -95,7 +97,8 @@ except: pass
 
 # Initialize IntegrityRunner with error handling
 try:
-    runner = IntegrityRunner()
+    # Warms the shared runner context (clients, config and rules) at startup
+    runner = IntegrityRunner(context=get_runner_context())
     logger.info("IntegrityRunner initialized successfully")
 except Exception as e:
     logger.error(f"Failed to initialize IntegrityRunner: {e}", exc_info=True)
@@ -342,26 +345,22 @@ def schema():
     return schema_config.model_dump()
 
 
-def _run_integrity_background(
-    run_id: str,
-    trigger: str,
-    cancel_event: threading.Event,
-    entities: Optional[List[str]] = None,
-    run_config: Optional[Dict[str, Any]] = None
-):
-    """Run integrity scan in background thread."""
+def _run_integrity_background(job: RunJob):
+    """Run integrity scan on a run scheduler worker thread."""
+    run_id = job.run_id
     try:
-        # Create a new runner instance for this thread
+        # Create a new runner instance for this run (cheap: it shares the warm context)
         if runner is None:
             logger.error("IntegrityRunner not available - cannot start scan", extra={"run_id": run_id})
             return
-        thread_runner = IntegrityRunner()
+        thread_runner = IntegrityRunner(context=get_runner_context())
         result = thread_runner.run(
             run_id=run_id,
-            trigger=trigger,
-            cancel_event=cancel_event,
-            entities=entities,
-            run_config=run_config
+            trigger=job.trigger,
+            cancel_event=job.cancel_event,
+            entities=job.entities,
+            run_config=job.run_config,
+            mode=job.mode,
         )
         logger.info(
             "Integrity run completed",
@@ -379,10 +378,21 @@ def _run_integrity_background(
             running_scans.pop(run_id, None)
 
 
+def _report_queue_position(run_id: str, position: int) -> None:
+    """Write a run's queue position to its run status document."""
+    # The runner context is warmed at startup, so reporting never sets up a client
+    get_runner_context().firestore_client.record_queue_position(run_id, position)
+
+
+# Bounded worker pool for triggered runs (RUN_MAX_CONCURRENT, RUN_QUEUE_MAX)
+run_scheduler = RunScheduler(_run_integrity_background, _report_queue_position)
+
+
 @app.post("/integrity/run", dependencies=[Depends(verify_cloud_scheduler_auth)])
 def run_integrity(
     request: Request,
     trigger: str = "manual",
+    mode: str = "full",
     entities: Optional[List[str]] = Query(default=None),
     run_config: Optional[Dict[str, Any]] = Body(default=None)
 ):
@@ -391,6 +401,8 @@ def run_integrity(
     Args:
         request: FastAPI request object (injected)
         trigger: Trigger source ("nightly", "weekly", "schedule", or "manual")
+        mode: "full" re-downloads every record; "incremental" fetches only records
+            modified since the last local snapshot
         entities: Optional list of entity names to scan (deprecated, use run_config.entities)
         run_config: Optional run configuration with entities and rules
 
@@ -408,10 +420,17 @@ def run_integrity(
     elif entities:
         final_entities = entities
     
+    if mode not in ("full", "incremental"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid mode '{mode}'. Must be 'full' or 'incremental'",
+        )
+
     logger.info(
         "Integrity run requested",
         extra={
             "trigger": trigger,
+            "mode": mode,
             "entities": final_entities,
             "has_run_config": run_config is not None,
             "has_rules": run_config is not None and "rules" in run_config if run_config else False,
@@ -431,23 +450,47 @@ def run_integrity(
         with running_scans_lock:
             running_scans[run_id] = cancel_event
         
-        # Start background thread
-        thread = threading.Thread(
-            target=_run_integrity_background,
-            args=(run_id, trigger, cancel_event, final_entities, run_config),
-            daemon=True,
-        )
-        thread.start()
+        # Queue for the run scheduler's worker pool
+        try:
+            submission = run_scheduler.submit(run_id, trigger, cancel_event, final_entities, run_config, mode)
+        except RunQueueFullError as exc:
+            with running_scans_lock:
+                running_scans.pop(run_id, None)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail={"error": "Integrity run queue is full", "message": str(exc)},
+            )
+        if submission.coalesced:
+            with running_scans_lock:
+                running_scans.pop(run_id, None)
         
-        logger.info("Integrity run started in background", extra={"run_id": run_id, "request_id": request_id})
+        logger.info(
+            "Integrity run accepted",
+            extra={
+                "run_id": submission.run_id,
+                "coalesced": submission.coalesced,
+                "queue_position": submission.position,
+                "request_id": request_id,
+            },
+        )
         
-        # Return immediately with run_id
+        # Return immediately with run_id (of the identical run when coalesced)
+        if submission.coalesced:
+            message = "Identical scan already queued or running"
+        elif submission.position:
+            message = f"Scan queued (position {submission.position})"
+        else:
+            message = "Scan started in background"
         return {
-            "run_id": run_id,
-            "status": "running",
-            "message": "Scan started in background",
+            "run_id": submission.run_id,
+            "status": "running" if submission.position == 0 else "queued",
+            "queue_position": submission.position,
+            "coalesced": submission.coalesced,
+            "message": message,
         }
         
+    except HTTPException:
+        raise
     except Exception as exc:
         logger.error(
             "Failed to start integrity run",
@@ -482,6 +525,10 @@ def cancel_integrity_run(run_id: str, request: Request):
             # Set cancellation event
             cancel_event.set()
             logger.info("Integrity run cancellation signal sent", extra={"run_id": run_id, "request_id": request_id})
+    # A run still waiting in the queue is dropped before it starts
+    if run_scheduler.cancel(run_id):
+        with running_scans_lock:
+            running_scans.pop(run_id, None)
     
     # Always update Firestore status (works even if run is in different process/server)
     try:
@@ -605,6 +652,7 @@ def cancel_integrity_run(run_id: str, request: Request):
         # Log cancellation
         writer = FirestoreWriter(firestore_client)
         writer.write_log(run_id, "info", "Scan cancelled by user")
+        writer.flush_logs()
         
         logger.info("Run cancelled successfully", extra={"run_id": run_id, "request_id": request_id})
         return {"status": "success", "message": "Run cancellation requested", "run_id": run_id}
@@ -680,8 +728,8 @@ def cancel_all_running_runs(request: Request):
         client = firestore_client._get_client()
         collection_ref = client.collection(config.firestore.runs_collection)
         
-        # Query for all runs with status "running" or missing status (treat as running)
-        running_runs_query = collection_ref.where("status", "==", "running")
+        # Query for all runs with status "running"/"queued" or missing status (treat as running)
+        running_runs_query = collection_ref.where("status", "in", ["running", "queued"])
         running_runs = list(running_runs_query.stream())
         
         # Also check for runs without status field (might be running)
@@ -710,6 +758,9 @@ def cancel_all_running_runs(request: Request):
                     if cancel_event:
                         cancel_event.set()
                         logger.info("Cancellation signal sent to running scan", extra={"run_id": run_id})
+                if run_scheduler.cancel(run_id):
+                    with running_scans_lock:
+                        running_scans.pop(run_id, None)
                 
                 # Update Firestore status
                 doc_ref = collection_ref.document(run_id)
@@ -748,6 +799,7 @@ def cancel_all_running_runs(request: Request):
                 # Log cancellation
                 writer = FirestoreWriter(firestore_client)
                 writer.write_log(run_id, "info", "Scan cancelled by user (cancel all)")
+                writer.flush_logs()
                 
                 cancelled_count += 1
             except Exception as exc:
@@ -968,8 +1020,8 @@ def airtable_records(table_id: str):
         
         import os
         import time
-        from pyairtable import Api
         from requests.exceptions import HTTPError, RequestException
+        from .clients.airtable import build_airtable_api
         
         # Use Personal Access Token (PAT) for Airtable authentication
         pat = os.getenv("AIRTABLE_PAT")
@@ -981,7 +1033,7 @@ def airtable_records(table_id: str):
             )
         
         token = pat
-        api = Api(token)
+        api = build_airtable_api(token)
         table = api.table(base_id, table_id)
         
         logger.info(
@@ -1116,6 +1168,7 @@ def delete_integrity_issue(issue_id: str, request: Request):
             )
         
         issue_ref.delete()
+        firestore_client.mark_issues_changed()
         
         logger.info("Integrity issue deleted", extra={"issue_id": issue_id, "request_id": request_id})
         return {"status": "success", "message": "Issue deleted successfully", "issue_id": issue_id}
@@ -1133,6 +1186,46 @@ def delete_integrity_issue(issue_id: str, request: Request):
         )
 
 
+def _bulk_issue_date_bounds(
+    date_range: str,
+    custom_start_date: Optional[str],
+    custom_end_date: Optional[str],
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """created_at bounds (inclusive, None = open) for the bulk issue endpoints.
+
+    Raises:
+        HTTPException: 400 for an unknown date_range or bad custom dates
+    """
+    if date_range == "all":
+        return None, None
+    if date_range in ("past_hour", "past_day", "past_week"):
+        window = {
+            "past_hour": timedelta(hours=1),
+            "past_day": timedelta(days=1),
+            "past_week": timedelta(days=7),
+        }[date_range]
+        return datetime.now(timezone.utc) - window, None
+    if date_range == "custom":
+        if not custom_start_date or not custom_end_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"error": "custom_start_date and custom_end_date required for custom date range"},
+            )
+        try:
+            start_date = datetime.fromisoformat(custom_start_date.replace("Z", "+00:00"))
+            end_date = datetime.fromisoformat(custom_end_date.replace("Z", "+00:00"))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"error": f"Invalid date format: {str(e)}"},
+            )
+        return start_date, end_date
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={"error": f"Invalid date_range: {date_range}"},
+    )
+
+
 @app.get("/integrity/issues/bulk/count", dependencies=[Depends(verify_firebase_token)])
 def count_bulk_delete_issues(
     request: Request,
@@ -1151,68 +1244,11 @@ def count_bulk_delete_issues(
     try:
         from .clients.firestore import FirestoreClient
         from .config.config_loader import load_runtime_config
-        from datetime import datetime, timedelta, timezone
         
         config = load_runtime_config()
         firestore_client = FirestoreClient(config.firestore)
-        client = firestore_client._get_client()
-        issues_ref = client.collection(config.firestore.issues_collection)
-        
-        # Build base query with date filter (same logic as bulk_delete)
-        query = issues_ref
-        
-        if date_range == "all":
-            pass
-        elif date_range == "past_hour":
-            cutoff = datetime.now(timezone.utc) - timedelta(hours=1)
-            query = query.where("created_at", ">=", cutoff)
-        elif date_range == "past_day":
-            cutoff = datetime.now(timezone.utc) - timedelta(days=1)
-            query = query.where("created_at", ">=", cutoff)
-        elif date_range == "past_week":
-            cutoff = datetime.now(timezone.utc) - timedelta(days=7)
-            query = query.where("created_at", ">=", cutoff)
-        elif date_range == "custom":
-            if not custom_start_date or not custom_end_date:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail={"error": "custom_start_date and custom_end_date required for custom date range"},
-                )
-            try:
-                start_date = datetime.fromisoformat(custom_start_date.replace("Z", "+00:00"))
-                end_date = datetime.fromisoformat(custom_end_date.replace("Z", "+00:00"))
-                query = query.where("created_at", ">=", start_date).where("created_at", "<=", end_date)
-            except ValueError as e:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail={"error": f"Invalid date format: {str(e)}"},
-                )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={"error": f"Invalid date_range: {date_range}"},
-            )
-        
-        # Count matching documents (client-side filtering for types/entities)
-        all_docs = query.stream()
-        count = 0
-        has_type_filter = issue_types and len(issue_types) > 0
-        has_entity_filter = entities and len(entities) > 0
-        
-        for doc in all_docs:
-            data = doc.to_dict()
-            matches = False
-            
-            if not has_type_filter and not has_entity_filter:
-                matches = True
-            else:
-                if has_type_filter and data.get("issue_type") in issue_types:
-                    matches = True
-                if has_entity_filter and data.get("entity") in entities:
-                    matches = True
-            
-            if matches:
-                count += 1
+        start, end = _bulk_issue_date_bounds(date_range, custom_start_date, custom_end_date)
+        count = firestore_client.count_bulk_issues(issue_types, entities, start, end)
         
         return {
             "status": "success",
@@ -1270,91 +1306,13 @@ def bulk_delete_issues(
     try:
         from .clients.firestore import FirestoreClient
         from .config.config_loader import load_runtime_config
-        from datetime import datetime, timedelta, timezone
         
         config = load_runtime_config()
         firestore_client = FirestoreClient(config.firestore)
-        client = firestore_client._get_client()
-        issues_ref = client.collection(config.firestore.issues_collection)
-        
-        # Build base query with date filter
-        query = issues_ref
-        
-        # Date range filter
-        if date_range == "all":
-            # No date filter - query all issues
-            pass
-        elif date_range == "past_hour":
-            cutoff = datetime.now(timezone.utc) - timedelta(hours=1)
-            query = query.where("created_at", ">=", cutoff)
-        elif date_range == "past_day":
-            cutoff = datetime.now(timezone.utc) - timedelta(days=1)
-            query = query.where("created_at", ">=", cutoff)
-        elif date_range == "past_week":
-            cutoff = datetime.now(timezone.utc) - timedelta(days=7)
-            query = query.where("created_at", ">=", cutoff)
-        elif date_range == "custom":
-            if not custom_start_date or not custom_end_date:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail={"error": "custom_start_date and custom_end_date required for custom date range"},
-                )
-            try:
-                start_date = datetime.fromisoformat(custom_start_date.replace("Z", "+00:00"))
-                end_date = datetime.fromisoformat(custom_end_date.replace("Z", "+00:00"))
-                query = query.where("created_at", ">=", start_date).where("created_at", "<=", end_date)
-            except ValueError as e:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail={"error": f"Invalid date format: {str(e)}"},
-                )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={"error": f"Invalid date_range: {date_range}"},
-            )
-        
-        # Fetch all documents matching date filter, then filter client-side for types/entities (OR logic)
-        # Firestore doesn't support OR queries natively across different fields
-        all_docs = query.stream()
-        
-        deleted_count = 0
-        batch = client.batch()
-        batch_count = 0
-        
-        # Filter client-side for issue_types and entities (OR logic)
-        # If no type/entity filters and date_range is "all", delete all documents
-        has_type_filter = issue_types and len(issue_types) > 0
-        has_entity_filter = entities and len(entities) > 0
-        
-        for doc in all_docs:
-            data = doc.to_dict()
-            matches = False
-            
-            # If no type/entity filters, match all (delete everything matching date filter)
-            if not has_type_filter and not has_entity_filter:
-                matches = True
-            else:
-                # OR logic: match if issue_type in selected types OR entity in selected entities
-                if has_type_filter and data.get("issue_type") in issue_types:
-                    matches = True
-                if has_entity_filter and data.get("entity") in entities:
-                    matches = True
-            
-            if matches:
-                batch.delete(doc.reference)
-                batch_count += 1
-                deleted_count += 1
-                
-                # Firestore batch limit is 500 operations
-                if batch_count >= 500:
-                    batch.commit()
-                    batch = client.batch()
-                    batch_count = 0
-        
-        # Commit remaining deletions
-        if batch_count > 0:
-            batch.commit()
+        start, end = _bulk_issue_date_bounds(date_range, custom_start_date, custom_end_date)
+        # OR logic: issues of any selected type or any selected entity;
+        # no type/entity filters deletes everything in the date range
+        deleted_count = firestore_client.delete_bulk_issues(issue_types, entities, start, end)
         
         logger.info(
             "Bulk delete completed",
@@ -1453,7 +1411,7 @@ def integrity_kpi_sample():
     try:
         # Fetch current records for sampling
         runner = IntegrityRunner()
-        records, _ = runner._fetch_records("full")
+        records, _ = runner._fetch_records()
         
         # Generate sample
         sampler = get_kpi_sampler()
@@ -1517,8 +1475,8 @@ def get_airtable_records_by_ids(request: Request, body: RecordsByIdsRequest):
 
     try:
         import os
-        from pyairtable import Api
         from pyairtable.formulas import RECORD_ID, OR
+        from .clients.airtable import build_airtable_api
 
         # Load schema to get table ID from entity name
         schema_data = schema_service.load()
@@ -1572,7 +1530,7 @@ def get_airtable_records_by_ids(request: Request, body: RecordsByIdsRequest):
             )
 
         token = pat
-        api = Api(token)
+        api = build_airtable_api(token)
         table = api.table(base_id, table_id)
 
         # Build formula to fetch records by IDs
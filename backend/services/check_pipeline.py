@@ -0,0 +1,230 @@
+"""Dependency-aware check scheduling that overlaps checks with fetching.
+
+Each check is split into tasks that declare which entities they read. A task
+is submitted to a small worker pool as soon as all of its entities have been
+fetched, so checks run while slower tables are still paginating.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from ..checks import attendance, duplicates, links, required_fields
+from ..checks.attendance_state import get_attendance_state
+from ..checks.duplicate_index import get_duplicate_index
+from ..config.models import SchemaConfig
+from ..config.settings import AttendanceRules
+from ..utils.issues import IssuePayload, IssueScope
+from ..utils.record_store import RecordStore
+
+# Number of check tasks run in parallel while fetching continues
+CHECK_MAX_WORKERS = int(os.getenv("CHECK_MAX_WORKERS", "2"))
+# How often results() wakes up to check for cancellation/timeout (seconds)
+CHECK_POLL_INTERVAL_SECONDS = float(os.getenv("CHECK_POLL_INTERVAL_SECONDS", "0.5"))
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CheckTask:
+    check: str
+    entities: FrozenSet[str]
+    run: Callable[[Dict[str, List[dict]]], List[IssuePayload]]
+    # Issues the task re-evaluates; used to resolve the ones it stops producing
+    scopes: Tuple[IssueScope, ...] = ()
+
+
+@dataclass
+class CheckResult:
+    issues: List[IssuePayload] = field(default_factory=list)
+    duration_ms: int = 0
+
+
+def plan_checks(
+    schema_config: Optional[SchemaConfig],
+    attendance_rules: Optional[AttendanceRules],
+    entities: Iterable[str],
+) -> List[CheckTask]:
+    """Split the enabled checks into tasks keyed by the entities they read.
+
+    Links and required-field checks get one task per source entity so each
+    can start as soon as its own tables land. Dependencies are limited to the
+    entities being fetched; a check reading an unfetched entity sees it as
+    empty, exactly as when everything ran after the fetch.
+
+    Args:
+        schema_config: SchemaConfig the run will use (already filtered by rule selection)
+        attendance_rules: AttendanceRules the run will use, or None if attendance is skipped
+        entities: Entities this run fetches
+
+    Returns:
+        Tasks in reporting order.
+    """
+    available = frozenset(entities)
+    tasks: List[CheckTask] = [
+        CheckTask(
+            "duplicates",
+            frozenset(duplicates.SOURCE_FIELDS) & available,
+            partial(duplicates.run, schema_config=schema_config, index=get_duplicate_index()),
+            _duplicate_scopes(schema_config, available),
+        )
+    ]
+
+    if schema_config:
+        for entity_name, entity_schema in schema_config.entities.items():
+            if entity_name not in available or not entity_schema.relationships:
+                continue
+            targets = {rule.target for rule in entity_schema.relationships.values()}
+            scoped = schema_config.model_copy(update={"entities": {entity_name: entity_schema}})
+            # A relationship whose target wasn't fetched can't reproduce its issues
+            prefixes = tuple(
+                f"link.{entity_name}.{rel_key}."
+                for rel_key, rel_rule in entity_schema.relationships.items()
+                if rel_rule.target in available
+            )
+            tasks.append(
+                CheckTask(
+                    "links",
+                    frozenset({entity_name} | targets) & available,
+                    partial(links.run, schema_config=scoped),
+                    (IssueScope(entity_name, rule_prefixes=prefixes),) if prefixes else (),
+                )
+            )
+
+        for entity_name, entity_schema in schema_config.entities.items():
+            if entity_name not in available or not entity_schema.missing_key_data:
+                continue
+            scoped = schema_config.model_copy(update={"entities": {entity_name: entity_schema}})
+            tasks.append(
+                CheckTask(
+                    "required_fields",
+                    frozenset({entity_name}),
+                    partial(required_fields.run, schema_config=scoped),
+                    (
+                        IssueScope(
+                            entity_name,
+                            rule_ids=frozenset(f"required.{entity_name}.{req.field}" for req in entity_schema.missing_key_data),
+                        ),
+                    ),
+                )
+            )
+
+    if attendance_rules:
+        tasks.append(
+            CheckTask(
+                "attendance",
+                frozenset({"attendance", "students"}) & available,
+                partial(attendance.run, attendance_rules=attendance_rules, state=get_attendance_state()),
+                (IssueScope("student", rule_prefixes=("attendance.",)),)
+                if {"attendance", "students"} <= available
+                else (),
+            )
+        )
+    return tasks
+
+
+def _duplicate_scopes(schema_config: Optional[SchemaConfig], available: FrozenSet[str]) -> Tuple[IssueScope, ...]:
+    """Scopes of the duplicates check: the configured rules of each fetched
+    entity, or every ``dup.`` rule where the hardcoded classifiers run."""
+    dup_config = schema_config.duplicates if schema_config else {}
+    scopes = []
+    for key, entity in duplicates.ISSUE_ENTITIES.items():
+        if key not in available:
+            continue
+        dup_def = dup_config.get(key)
+        if dup_def is None:
+            scopes.append(IssueScope(entity, rule_prefixes=("dup.",)))
+        else:
+            rule_ids = {rule.rule_id for rule in (dup_def.likely or []) + (dup_def.possible or [])}
+            scopes.append(IssueScope(entity, rule_ids=frozenset(rule_ids)))
+    return tuple(scopes)
+
+
+class CheckPipeline:
+    """Runs check tasks on a worker pool as their entities are fetched.
+
+    entity_ready() is called by the fetch stage for every entity it finishes;
+    results() waits for the remaining tasks and returns issues per check.
+    """
+
+    def __init__(self, tasks: List[CheckTask], max_workers: int = CHECK_MAX_WORKERS):
+        self._tasks = tasks
+        # Shared by every task so columns extracted by one check are reused by the next
+        self._records = RecordStore()
+        self._futures: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="integrity-check"
+        )
+        with self._lock:
+            self._submit_ready(force=False)
+
+    def entity_ready(self, entity: str, records: List[dict]) -> None:
+        """Record a fetched entity and start every task it unblocks."""
+        with self._lock:
+            self._records[entity] = records
+            self._submit_ready(force=False)
+
+    def _submit_ready(self, force: bool) -> None:
+        for index, task in enumerate(self._tasks):
+            if index in self._futures:
+                continue
+            if not force and not task.entities <= self._records.keys():
+                continue
+            inputs = self._records.subset(task.entities)
+            self._futures[index] = self._executor.submit(self._run_task, task, inputs)
+
+    @staticmethod
+    def _run_task(task: CheckTask, inputs: Dict[str, List[dict]]) -> CheckResult:
+        start = time.time()
+        issues = task.run(inputs)
+        duration_ms = int((time.time() - start) * 1000)
+        logger.info(
+            "Check task finished",
+            extra={"check": task.check, "entities": sorted(task.entities), "issues": len(issues), "duration_ms": duration_ms},
+        )
+        return CheckResult(issues=issues, duration_ms=duration_ms)
+
+    def results(self, check_cancelled: Callable[[], None] | None = None) -> Dict[str, CheckResult]:
+        """Wait for every task and return results per check name.
+
+        Tasks whose entities never arrived run with what was fetched. Issues
+        are concatenated in task order, so the output doesn't depend on which
+        task finished first. The first task error is re-raised.
+        """
+        with self._lock:
+            self._submit_ready(force=True)
+            futures = [self._futures[index] for index in range(len(self._tasks))]
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=CHECK_POLL_INTERVAL_SECONDS, return_when=FIRST_EXCEPTION)
+            for future in done:
+                if future.exception() is not None:
+                    raise future.exception()
+            if check_cancelled:
+                check_cancelled()
+
+        results: Dict[str, CheckResult] = {}
+        for task, future in zip(self._tasks, futures):
+            outcome = future.result()
+            combined = results.setdefault(task.check, CheckResult())
+            combined.issues.extend(outcome.issues)
+            combined.duration_ms += outcome.duration_ms
+        self._executor.shutdown(wait=True)
+        return results
+
+    def issue_scopes(self) -> List[IssueScope]:
+        """Scopes of every planned task (see CheckTask.scopes)."""
+        return [scope for task in self._tasks for scope in task.scopes]
+
+    def shutdown(self) -> None:
+        """Drop queued tasks without waiting for running ones."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
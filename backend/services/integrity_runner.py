@@ -7,24 +7,30 @@ import os
 import threading
 import time
 import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from ..analyzers import scorer
 from ..checks import attendance, duplicates, links, required_fields
-from ..clients.airtable import AirtableClient
+from ..checks.field_usage import fields_read_by_checks
+from ..clients.airtable import AirtableClient, FetchCancelledError
 from ..clients.firestore import FirestoreClient
 from ..clients.logging import get_logger, log_check, log_config_load, log_fetch, log_write
 from ..config.config_loader import load_runtime_config
 from ..config.schema_loader import load_schema_config
-from ..config.settings import RuntimeConfig
+from ..config.settings import AttendanceRules, RuntimeConfig
 from ..config.models import SchemaConfig
 from ..utils.errors import CheckFailureError, FetchError, IntegrityRunError, WriteError
 from ..utils.issues import IssuePayload
+from ..utils.record_store import RecordStore
+from ..fetchers.base import BaseFetcher
 from ..fetchers.registry import build_fetchers
 from ..utils.timing import timed
 from ..writers.firestore_writer import FirestoreWriter
+from ..services.check_pipeline import CheckPipeline, CheckResult, plan_checks
 from ..services.feedback_analyzer import get_feedback_analyzer
+from ..services.runner_context import ConfigSnapshot, RunnerContext
 from ..services.table_id_discovery import discover_table_ids
 from ..services.config_updater import update_config
 from ..services.status_calculator import calculate_result_status
@@ -35,12 +41,34 @@ logger = get_logger(__name__)
 # Runs exceeding this duration will be terminated and marked as "timeout"
 MAX_RUN_DURATION_SECONDS = int(os.getenv("MAX_RUN_DURATION_SECONDS", "1800"))  # 30 minutes default
 
+# Number of entities fetched from Airtable in parallel (1 = sequential)
+FETCH_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS", "4"))
+# How often the fetch stage wakes up to check for cancellation/timeout (seconds)
+FETCH_POLL_INTERVAL_SECONDS = float(os.getenv("FETCH_POLL_INTERVAL_SECONDS", "0.5"))
+# Resolve open issues that a successful run's checks no longer detect
+ISSUE_AUTO_RESOLVE = os.getenv("ISSUE_AUTO_RESOLVE", "true").lower() == "true"
+
 
 class IntegrityRunner:
     def __init__(
         self,
         runtime_config: RuntimeConfig | None = None,
+        context: RunnerContext | None = None,
     ):
+        """Create a runner.
+
+        Args:
+            runtime_config: Config to start from instead of loading rules.yaml
+            context: Shared RunnerContext; its warm clients and config snapshot
+                are used instead of loading configs and creating clients here
+        """
+        self._context = context
+        if context is not None:
+            self._firestore_client = context.firestore_client
+            self._firestore_writer = context.firestore_writer
+            self._apply_snapshot(context.snapshot())
+            return
+
         # #region agent log
         import json as _json
         debug_log_path = '/Users/joshuaedwards/Library/CloudStorage/GoogleDrive-jedwards@che.school/My Drive/CHE/che-data-integrity-monitor/.cursor/debug.log'
@@ -129,7 +157,8 @@ class IntegrityRunner:
         trigger: str = "manual",
         cancel_event=None,
         entities: List[str] | None = None,
-        run_config: Dict[str, Any] | None = None
+        run_config: Dict[str, Any] | None = None,
+        mode: str = "full",
     ) -> Dict[str, Any]:
         # Explicitly reference module-level time to avoid UnboundLocalError
         # (Python may treat time as local if used in nested scopes)
@@ -146,7 +175,7 @@ class IntegrityRunner:
         status = "running"  # Start with "running" status
         error_message: str | None = None
 
-        logger.info("Integrity run started", extra={"run_id": run_id, "trigger": trigger})
+        logger.info("Integrity run started", extra={"run_id": run_id, "trigger": trigger, "mode": mode})
         
         # Store run_id for use in _fetch_records
         self._current_run_id = run_id
@@ -161,6 +190,11 @@ class IntegrityRunner:
         # Store run_config for use in filtering
         self._run_config = run_config
         
+        # "incremental" fetches only records changed since the local snapshot
+        if run_config and run_config.get("mode"):
+            mode = run_config["mode"]
+        self._fetch_mode = mode
+        
         # Initialize summary to empty dict so it's always available in finally block
         summary: Dict[str, Any] = {}
 
@@ -382,9 +416,13 @@ class IntegrityRunner:
                     # #endregion agent log
                 
                 # Reload configs dynamically to get latest rules from Firestore
-                self._runtime_config = load_runtime_config(firestore_client=self._firestore_client, attempt_discovery=True)
-                self._schema_config = load_schema_config(firestore_client=self._firestore_client)
-                self._airtable_client = AirtableClient(self._runtime_config.airtable)
+                if self._context is not None:
+                    # Rebuilt only if a config version or the discovered IDs changed
+                    self._apply_snapshot(self._context.snapshot(discovery_result))
+                else:
+                    self._runtime_config = load_runtime_config(firestore_client=self._firestore_client, attempt_discovery=True)
+                    self._schema_config = load_schema_config(firestore_client=self._firestore_client)
+                    self._airtable_client = AirtableClient(self._runtime_config.airtable)
                 
                 logger.info(
                     "Reloaded configs dynamically",
@@ -397,6 +435,15 @@ class IntegrityRunner:
                     extra={"run_id": run_id, "error": str(exc)},
                 )
                 # Continue with scan even if config update fails
+        elif self._context is not None:
+            # No discovery this run; still pick up config and rule changes
+            try:
+                self._apply_snapshot(self._context.snapshot())
+            except Exception as exc:
+                logger.warning(
+                    "Failed to refresh config snapshot, continuing with current config",
+                    extra={"run_id": run_id, "error": str(exc)},
+                )
         
         # Check for cancellation after discovery
         check_cancelled()
@@ -433,14 +480,33 @@ class IntegrityRunner:
             log_config_load(logger, run_id, config_duration_ms, config_version)
 
             # Fetch records
+            check_pipeline: CheckPipeline | None = None
             try:
                 entities_param = getattr(self, '_selected_entities', None)
                 if entities_param:
                     self._firestore_writer.write_log(run_id, "info", f"Starting to fetch records (entities: {', '.join(entities_param)})...")
                 else:
                     self._firestore_writer.write_log(run_id, "info", "Starting to fetch records...")
+                # Only request the columns the selected rules read, and start
+                # each check as soon as the entities it reads have been fetched
+                schema_config_to_use = self._active_schema_config()
+                attendance_rules_to_use = self._active_attendance_rules()
+                fields_by_entity = fields_read_by_checks(schema_config_to_use, attendance_rules_to_use)
+                check_pipeline = CheckPipeline(
+                    plan_checks(
+                        schema_config_to_use,
+                        attendance_rules_to_use,
+                        self._select_fetchers(entities_param).keys(),
+                    )
+                )
                 with timed("fetch", metrics):
-                    records, entity_counts = self._fetch_records(entities_param)
+                    records, entity_counts = self._fetch_records(
+                        entities_param,
+                        check_cancelled,
+                        incremental=self._fetch_mode == "incremental",
+                        fields_by_entity=fields_by_entity,
+                        on_entity_fetched=check_pipeline.entity_ready,
+                    )
                 fetch_duration = metrics.get("duration_fetch", 0)
                 total_records = sum(entity_counts.values())
                 log_fetch(logger, run_id, entity_counts, fetch_duration)
@@ -453,8 +519,10 @@ class IntegrityRunner:
                 # Check for cancellation after fetching
                 check_cancelled()
             except Exception as exc:
-                # If it's already a specific CustomError, re-raise it (or wrap it preserving details)
-                if isinstance(exc, (FetchError, IntegrityRunError)):
+                if check_pipeline is not None:
+                    check_pipeline.shutdown()
+                # If it's already a specific CustomError (or a timeout), re-raise it
+                if isinstance(exc, (FetchError, IntegrityRunError, TimeoutError)):
                     raise
                 # Otherwise wrap in FetchError
                 try:
@@ -466,7 +534,7 @@ class IntegrityRunner:
             # Execute checks
             issues: List[IssuePayload] = []
             try:
-                # Log entity counts before starting checks
+                # Log entity counts before waiting on the checks
                 total_records_count = sum(len(recs) for recs in records.values())
                 entity_list = ", ".join(f"{k} ({len(v)})" for k, v in records.items())
                 self._firestore_writer.write_log(
@@ -475,103 +543,35 @@ class IntegrityRunner:
                 )
                 
                 with timed("checks", metrics):
-                    # Run each check individually with logging
+                    # Checks may already be done; wait for whatever is still running
+                    try:
+                        results_by_check = check_pipeline.results(check_cancelled)
+                    except BaseException:
+                        check_pipeline.shutdown()
+                        raise
                     check_results: List[IssuePayload] = []
                     
-                    # Get filtered schema config if run_config has rule selection
-                    schema_config_to_use = self._schema_config
-                    if hasattr(self, "_run_config") and self._run_config:
-                        schema_config_to_use = self._filter_rules_by_selection(
-                            self._schema_config,
-                            self._run_config
-                        )
-                    
-                    # Duplicates check
-                    import time as _time_module
-                    self._firestore_writer.write_log(run_id, "info", "Running duplicates check...")
-                    check_start = _time_module.time()
-                    dup_issues = duplicates.run(records, schema_config_to_use)
-                    check_results.extend(dup_issues)
-                    dup_summary = scorer.summarize(dup_issues)
-                    dup_duration = int((_time_module.time() - check_start) * 1000)
-                    log_check(
-                        logger,
-                        run_id,
-                        "duplicates",
-                        len(dup_issues),
-                        dup_duration,
-                        {k: v for k, v in dup_summary.items() if "duplicate" in k},
-                    )
-                    self._firestore_writer.write_log(run_id, "info", f"Duplicates check: {len(dup_issues)} issues found in {(dup_duration/1000):.1f}s")
-                    check_cancelled()
-                    
-                    # Links check
-                    import time as _time_module
-                    self._firestore_writer.write_log(run_id, "info", "Running links check...")
-                    check_start = _time_module.time()
-                    link_issues = links.run(records, schema_config_to_use)
-                    check_results.extend(link_issues)
-                    link_summary = scorer.summarize(link_issues)
-                    link_duration = int((_time_module.time() - check_start) * 1000)
-                    log_check(
-                        logger,
-                        run_id,
-                        "links",
-                        len(link_issues),
-                        link_duration,
-                        {k: v for k, v in link_summary.items() if "link" in k},
-                    )
-                    self._firestore_writer.write_log(run_id, "info", f"Links check: {len(link_issues)} issues found in {(link_duration/1000):.1f}s")
-                    check_cancelled()
-                    
-                    # Required fields check
-                    import time as _time_module
-                    self._firestore_writer.write_log(run_id, "info", "Running required fields check...")
-                    check_start = _time_module.time()
-                    req_issues = required_fields.run(records, schema_config_to_use)
-                    check_results.extend(req_issues)
-                    req_summary = scorer.summarize(req_issues)
-                    req_duration = int((_time_module.time() - check_start) * 1000)
-                    log_check(
-                        logger,
-                        run_id,
-                        "required_fields",
-                        len(req_issues),
-                        req_duration,
-                        {k: v for k, v in req_summary.items() if "required" in k},
-                    )
-                    self._firestore_writer.write_log(run_id, "info", f"Required fields check: {len(req_issues)} issues found in {(req_duration/1000):.1f}s")
-                    check_cancelled()
-                    
-                    # Attendance check
-                    attendance_rules_to_use = self._runtime_config.attendance_rules
-                    if (hasattr(self, "_run_config") and self._run_config and
-                        self._run_config.get("rules") and
-                        "attendance_rules" in self._run_config["rules"]):
-                        # If attendance_rules is False in selection, skip attendance check
-                        if self._run_config["rules"]["attendance_rules"] is False:
-                            attendance_rules_to_use = None
-                    
-                    import time as _time_module
-                    if attendance_rules_to_use:
-                        self._firestore_writer.write_log(run_id, "info", "Running attendance check...")
-                        check_start = _time_module.time()
-                        att_issues = attendance.run(records, attendance_rules_to_use)
-                        check_results.extend(att_issues)
-                        att_summary = scorer.summarize(att_issues)
-                        att_duration = int((_time_module.time() - check_start) * 1000)
+                    for check_name, label, summary_prefix in (
+                        ("duplicates", "Duplicates check", "duplicate"),
+                        ("links", "Links check", "link"),
+                        ("required_fields", "Required fields check", "required"),
+                        ("attendance", "Attendance check", "attendance"),
+                    ):
+                        if check_name == "attendance" and not attendance_rules_to_use:
+                            self._firestore_writer.write_log(run_id, "info", "Attendance check skipped (not selected in rules)")
+                            continue
+                        result = results_by_check.get(check_name, CheckResult())
+                        check_results.extend(result.issues)
+                        check_summary = scorer.summarize(result.issues)
                         log_check(
                             logger,
                             run_id,
-                            "attendance",
-                            len(att_issues),
-                            att_duration,
-                            {k: v for k, v in att_summary.items() if "attendance" in k},
+                            check_name,
+                            len(result.issues),
+                            result.duration_ms,
+                            {k: v for k, v in check_summary.items() if summary_prefix in k},
                         )
-                        self._firestore_writer.write_log(run_id, "info", f"Attendance check: {len(att_issues)} issues found in {(att_duration/1000):.1f}s")
-                    else:
-                        att_issues = []
-                        self._firestore_writer.write_log(run_id, "info", "Attendance check skipped (not selected in rules)")
+                        self._firestore_writer.write_log(run_id, "info", f"{label}: {len(result.issues)} issues found in {(result.duration_ms/1000):.1f}s")
                     
                     # Merge and summarize issues
                     issues = check_results
@@ -633,6 +633,7 @@ class IntegrityRunner:
                     
                     # Write individual issues to Firestore
                     new_issues_count = 0
+                    issues_written = not issues
                     if issues:
                         check_cancelled()  # Check before starting long write operation
                         try:
@@ -644,6 +645,7 @@ class IntegrityRunner:
                             updated_count = total_issues_to_write - new_issues_count
                             log_write(logger, run_id, "firestore_issues", total_issues_to_write, write_issues_duration)
                             self._firestore_writer.write_log(run_id, "info", f"Wrote {total_issues_to_write:,} issues to Firestore ({new_issues_count:,} new, {updated_count:,} updated) in {(write_issues_duration/1000):.1f}s")
+                            issues_written = True
                         except Exception as exc:
                             logger.error("Failed to write issues to Firestore", extra={"run_id": run_id}, exc_info=True)
                             try:
@@ -651,6 +653,26 @@ class IntegrityRunner:
                             except Exception:
                                 pass
                             # Don't fail the run if issue writing fails
+
+                    # Resolve open issues the checks that ran no longer produce
+                    # (only once this run's issues are safely written)
+                    if ISSUE_AUTO_RESOLVE and issues_written and check_pipeline is not None and not failed_checks:
+                        check_cancelled()
+                        try:
+                            with timed("resolve_issues_firestore", metrics):
+                                resolved_count = self._firestore_writer.resolve_missing_issues(
+                                    merged if issues else [], check_pipeline.issue_scopes(), run_id
+                                )
+                            metrics["issues_resolved"] = resolved_count
+                            self._firestore_writer.write_log(
+                                run_id, "info", f"Resolved {resolved_count:,} issues that were not detected again"
+                            )
+                        except Exception as exc:
+                            logger.error("Failed to resolve missing issues", extra={"run_id": run_id}, exc_info=True)
+                            try:
+                                self._firestore_writer.write_log(run_id, "error", f"Failed to resolve missing issues: {str(exc)}")
+                            except Exception:
+                                pass
                     
                     # Analyze ignored issues and flag rules (nightly runs only)
                     # Only run feedback analysis if run completed successfully (not failed)
@@ -848,6 +870,10 @@ class IntegrityRunner:
             except Exception:
                 pass  # Already logged above
 
+            # Completed, failed or cancelled: write whatever is still buffered
+            if not self._firestore_writer.flush_logs():
+                logger.warning("Timed out flushing run logs", extra={"run_id": run_id})
+
         logger.info(
             "Integrity run completed",
             extra={
@@ -875,71 +901,161 @@ class IntegrityRunner:
 
         return result
 
-    def _fetch_records(self, entities: List[str] | None = None) -> Tuple[Dict[str, List[dict]], Dict[str, int]]:
+    def _fetch_records(
+        self,
+        entities: List[str] | None = None,
+        check_cancelled: Callable[[], None] | None = None,
+        incremental: bool = False,
+        fields_by_entity: Dict[str, Set[str]] | None = None,
+        on_entity_fetched: Callable[[str, List[dict]], None] | None = None,
+    ) -> Tuple[Dict[str, List[dict]], Dict[str, int]]:
         """Fetch records for the specified entities.
         
+        Entities are fetched concurrently on a bounded worker pool
+        (FETCH_MAX_WORKERS); set it to 1 to fetch one entity at a time.
+        Rate limiting stays per base because all workers share the same
+        AirtableClient.
+        
         Args:
             entities: Optional list of entity names to fetch. If None, fetches all entities.
+            check_cancelled: Optional callable that raises when the run is cancelled or timed out.
+            incremental: Fetch only records modified since each table's local snapshot.
+            fields_by_entity: Optional column names to request per entity (see
+                fields_read_by_checks). Entities missing from the mapping are
+                fetched with their primary field only. None fetches every column.
+            on_entity_fetched: Optional callback(entity, records) invoked on this
+                thread as each entity finishes, e.g. to start checks early.
         """
-        logger.info("Performing full scan")
+        logger.info("Performing incremental scan" if incremental else "Performing full scan")
         
-        fetchers = build_fetchers(self._airtable_client)
-        
-        # Filter fetchers by selected entities if provided
+        fetchers = self._select_fetchers(entities)
         if entities:
-            fetchers = {key: fetcher for key, fetcher in fetchers.items() if key in entities}
             logger.info(f"Filtered to {len(fetchers)} entities: {', '.join(entities)}")
         
-        records: Dict[str, List[dict]] = {}
-        counts: Dict[str, int] = {}
-        for key, fetcher in fetchers.items():
+        run_id = self._resolve_log_run_id()
+        max_workers = max(1, min(FETCH_MAX_WORKERS, len(fetchers)))
+        
+        def fields_for(key: str) -> Set[str] | None:
+            if fields_by_entity is None:
+                return None
+            return fields_by_entity.get(key, set())
+        
+        fetched: Dict[str, List[dict]] = {}
+        if max_workers == 1:
+            for key, fetcher in fetchers.items():
+                if check_cancelled:
+                    check_cancelled()
+                fetched[key] = self._fetch_entity(
+                    key, fetcher, run_id, incremental=incremental, fields=fields_for(key)
+                )
+                if on_entity_fetched:
+                    on_entity_fetched(key, fetched[key])
+        else:
+            if run_id:
+                try:
+                    self._firestore_writer.write_log(
+                        run_id, "info", f"Fetching {len(fetchers)} entities with {max_workers} concurrent workers..."
+                    )
+                except Exception:
+                    pass
+            
+            stop_event = threading.Event()
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="airtable-fetch")
+            futures = {
+                executor.submit(
+                    self._fetch_entity, key, fetcher, run_id, stop_event, incremental, fields_for(key)
+                ): key
+                for key, fetcher in fetchers.items()
+            }
+            pending = set(futures)
             try:
-                # Extract run_id from logger context if available
-                run_id = None
-                if hasattr(self, '_current_run_id'):
-                    run_id = self._current_run_id
-                elif hasattr(logger, 'extra') and logger.extra:
-                    run_id = logger.extra.get('run_id')
-                
-                if run_id:
-                    try:
-                        self._firestore_writer.write_log(run_id, "info", f"Fetching {key} records...")
-                    except Exception:
-                        pass
-                
-                # Create progress callback that writes to Firestore logs
-                def log_progress(message: str, metadata: Optional[Dict[str, Any]] = None) -> None:
-                    if run_id:
-                        try:
-                            self._firestore_writer.write_log(run_id, "info", message, metadata)
-                        except Exception:
-                            pass
-                
-                data = fetcher.fetch(progress_callback=log_progress if run_id else None)
-                records[key] = data
-                counts[key] = len(data)
-                
-                if run_id:
-                    try:
-                        self._firestore_writer.write_log(run_id, "info", f"Fetched {len(data)} {key} records")
-                    except Exception:
-                        pass
-            except Exception as exc:
-                run_id = None
-                if hasattr(self, '_current_run_id'):
-                    run_id = self._current_run_id
-                elif hasattr(logger, 'extra') and logger.extra:
-                    run_id = logger.extra.get('run_id')
-                
+                while pending:
+                    done, pending = wait(pending, timeout=FETCH_POLL_INTERVAL_SECONDS, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        key = futures[future]
+                        fetched[key] = future.result()
+                        if on_entity_fetched:
+                            on_entity_fetched(key, fetched[key])
+                    if check_cancelled:
+                        check_cancelled()
+            except BaseException:
+                # Stop the remaining fetchers at their next page and don't wait for them
+                stop_event.set()
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            executor.shutdown(wait=True)
+        
+        # Keep registry order so entity_counts is stable regardless of completion order
+        records: Dict[str, List[dict]] = {key: fetched[key] for key in fetchers}
+        counts: Dict[str, int] = {key: len(data) for key, data in records.items()}
+        return records, counts
+
+    def _select_fetchers(self, entities: List[str] | None = None) -> Dict[str, BaseFetcher]:
+        """Fetchers for the selected entities (all entities if None), in registry order."""
+        fetchers = build_fetchers(self._airtable_client)
+        if entities:
+            fetchers = {key: fetcher for key, fetcher in fetchers.items() if key in entities}
+        return fetchers
+
+    def _resolve_log_run_id(self) -> str | None:
+        """Return the run_id used for Firestore progress logs, if any."""
+        if hasattr(self, '_current_run_id'):
+            return self._current_run_id
+        if hasattr(logger, 'extra') and logger.extra:
+            return logger.extra.get('run_id')
+        return None
+
+    def _fetch_entity(
+        self,
+        key: str,
+        fetcher: BaseFetcher,
+        run_id: str | None,
+        stop_event: threading.Event | None = None,
+        incremental: bool = False,
+        fields: Set[str] | None = None,
+    ) -> List[dict]:
+        """Fetch a single entity, logging per-entity progress to Firestore."""
+        try:
+            if run_id:
+                try:
+                    self._firestore_writer.write_log(run_id, "info", f"Fetching {key} records...")
+                except Exception:
+                    pass
+            
+            # Create progress callback that writes to Firestore logs
+            def log_progress(message: str, metadata: Optional[Dict[str, Any]] = None) -> None:
                 if run_id:
                     try:
-                        self._firestore_writer.write_log(run_id, "error", f"Failed to fetch {key}: {str(exc)}")
+                        self._firestore_writer.write_log(
+                            run_id, "info", f"[{key}] {message}", metadata, coalesce_key=f"fetch:{key}"
+                        )
                     except Exception:
                         pass
-                
-                logger.error(f"Failed to fetch {key}", extra={"entity": key, "error": str(exc)}, exc_info=True)
-                raise FetchError(key, f"Failed to fetch {key}: {str(exc)}", "unknown") from exc
-        return records, counts
+            
+            data = fetcher.fetch(
+                progress_callback=log_progress if run_id else None,
+                cancel_event=stop_event,
+                incremental=incremental,
+                fields=fields,
+            )
+            
+            if run_id:
+                try:
+                    self._firestore_writer.write_log(run_id, "info", f"Fetched {len(data)} {key} records")
+                except Exception:
+                    pass
+            return data
+        except FetchCancelledError:
+            raise
+        except Exception as exc:
+            if run_id:
+                try:
+                    self._firestore_writer.write_log(run_id, "error", f"Failed to fetch {key}: {str(exc)}")
+                except Exception:
+                    pass
+            
+            logger.error(f"Failed to fetch {key}", extra={"entity": key, "error": str(exc)}, exc_info=True)
+            raise FetchError(key, f"Failed to fetch {key}: {str(exc)}", "unknown") from exc
 
     def _filter_rules_by_selection(
         self, schema_config: SchemaConfig, run_config: Dict[str, Any] | None
@@ -1126,29 +1242,39 @@ class IntegrityRunner:
         
         return filtered_config
     
-    def _execute_checks(self, records: Dict[str, List[dict]]) -> List[IssuePayload]:
-        # Get filtered schema config if run_config has rule selection
-        schema_config_to_use = self._schema_config
+    def _apply_snapshot(self, snapshot: ConfigSnapshot) -> None:
+        """Use the configs and Airtable client of a RunnerContext snapshot."""
+        self._runtime_config = snapshot.runtime_config
+        self._schema_config = snapshot.schema_config
+        self._airtable_client = snapshot.airtable_client
+
+    def _active_schema_config(self) -> SchemaConfig:
+        """SchemaConfig for this run, filtered by the run_config rule selection."""
         if hasattr(self, "_run_config") and self._run_config:
-            schema_config_to_use = self._filter_rules_by_selection(
-                self._schema_config,
-                self._run_config
-            )
-        
-        results: List[IssuePayload] = []
-        results.extend(duplicates.run(records, schema_config_to_use))
-        results.extend(links.run(records, schema_config_to_use))
-        results.extend(required_fields.run(records, schema_config_to_use))
-        
-        # Handle attendance rules filtering
-        attendance_rules_to_use = self._runtime_config.attendance_rules
+            return self._filter_rules_by_selection(self._schema_config, self._run_config)
+        return self._schema_config
+    
+    def _active_attendance_rules(self) -> AttendanceRules | None:
+        """Attendance rules for this run, or None if deselected in run_config."""
+        attendance_rules = self._runtime_config.attendance_rules
         if (hasattr(self, "_run_config") and self._run_config and
             self._run_config.get("rules") and
             "attendance_rules" in self._run_config["rules"]):
             # If attendance_rules is False in selection, skip attendance check
             if self._run_config["rules"]["attendance_rules"] is False:
-                attendance_rules_to_use = None
+                attendance_rules = None
+        return attendance_rules
+    
+    def _execute_checks(self, records: Dict[str, List[dict]]) -> List[IssuePayload]:
+        schema_config_to_use = self._active_schema_config()
+        records = RecordStore.wrap(records)
+        
+        results: List[IssuePayload] = []
+        results.extend(duplicates.run(records, schema_config_to_use))
+        results.extend(links.run(records, schema_config_to_use))
+        results.extend(required_fields.run(records, schema_config_to_use))
         
+        attendance_rules_to_use = self._active_attendance_rules()
         if attendance_rules_to_use:
             results.extend(attendance.run(records, attendance_rules_to_use))
         
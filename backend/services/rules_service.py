@@ -21,6 +21,10 @@ from ..config.settings import AttendanceRules
 
 logger = logging.getLogger(__name__)
 
+# Document whose version field is incremented on every rule change, so rule
+# snapshots can be reused until it moves (see services/runner_context.py)
+RULES_VERSION_DOCUMENT = ("rules", "_version")
+
 
 class RulesService:
     """Service for managing integrity rules from new rules/ collection."""
@@ -282,6 +286,7 @@ class RulesService:
         # Save to Firestore
         self.db.collection(collection_path).document(rule_id).set(rule_data)
         logger.info(f"Created rule {rule_id} in {collection_path}")
+        self._bump_version()
 
         return rule_data
 
@@ -345,6 +350,7 @@ class RulesService:
         # Save to Firestore
         doc_ref.update(updated_data)
         logger.info(f"Updated rule {rule_id} in {collection_path}")
+        self._bump_version()
 
         return updated_data
 
@@ -395,6 +401,17 @@ class RulesService:
         # Note: This doesn't affect the YAML source files, only the Firestore copy
         doc_ref.delete()
         logger.info(f"Deleted rule {rule_id} from {collection_path}")
+        self._bump_version()
+
+    def _bump_version(self) -> None:
+        """Record that the rules changed (best effort)."""
+        try:
+            self.db.collection(RULES_VERSION_DOCUMENT[0]).document(RULES_VERSION_DOCUMENT[1]).set(
+                {"version": firestore.Increment(1), "updated_at": datetime.now(timezone.utc)},
+                merge=True,
+            )
+        except Exception as exc:
+            logger.warning(f"Failed to bump rules version: {exc}")
 
     def _generate_rule_id(self, category: str, entity: Optional[str], rule_data: Dict[str, Any]) -> str:
         """Generate a unique rule ID."""
@@ -0,0 +1,238 @@
+"""Bounded queue and worker pool for integrity runs.
+
+Triggered runs wait in a priority queue and at most RUN_MAX_CONCURRENT of
+them execute at once, so bursts of triggers can't exhaust memory or the
+Airtable rate limit. Scheduled runs (nightly, weekly, schedule) go ahead of
+manual ones; runs of the same priority start in the order they were
+submitted. A manual run whose entities, mode and run_config match a run
+already queued or running is coalesced into that run instead of being
+queued again.
+
+Queue positions (1 = next to start, 0 = started) are reported through a
+callback whenever they change, so they can be shown on the run status
+document.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Runs executing at the same time
+RUN_MAX_CONCURRENT = int(os.getenv("RUN_MAX_CONCURRENT", "1"))
+# Runs waiting to start; further triggers are rejected
+RUN_QUEUE_MAX = int(os.getenv("RUN_QUEUE_MAX", "20"))
+# Queue priority per trigger (lower starts first); unknown triggers rank as manual
+TRIGGER_PRIORITIES = {"nightly": 0, "weekly": 0, "schedule": 0, "manual": 1}
+
+logger = logging.getLogger(__name__)
+
+
+class RunQueueFullError(Exception):
+    """Raised when RUN_QUEUE_MAX runs are already waiting."""
+
+
+@dataclass
+class RunJob:
+    run_id: str
+    trigger: str
+    cancel_event: threading.Event
+    entities: Optional[List[str]] = None
+    run_config: Optional[Dict[str, Any]] = None
+    mode: str = "full"
+    key: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        # Identical requests produce identical runs
+        self.key = json.dumps(
+            {"entities": self.entities, "mode": self.mode, "run_config": self.run_config},
+            sort_keys=True,
+            default=str,
+        )
+
+    @property
+    def priority(self) -> int:
+        return TRIGGER_PRIORITIES.get(self.trigger, TRIGGER_PRIORITIES["manual"])
+
+
+@dataclass
+class Submission:
+    """Outcome of RunScheduler.submit."""
+
+    run_id: str
+    # True when the request was merged into an existing run
+    coalesced: bool
+    # 1-based queue position, or 0 if the run has already started
+    position: int
+
+
+class RunScheduler:
+    """Priority queue of RunJobs drained by a fixed pool of worker threads.
+
+    Args:
+        execute: Runs one job to completion on a worker thread
+        report_position: Called with (run_id, position) when a run's queue
+            position changes; calls are serialized and in state order
+        max_concurrent: Worker threads (runs executing at once)
+        max_queued: Runs allowed to wait
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[RunJob], None],
+        report_position: Optional[Callable[[str, int], None]] = None,
+        max_concurrent: int = RUN_MAX_CONCURRENT,
+        max_queued: int = RUN_QUEUE_MAX,
+    ):
+        self._execute = execute
+        self._report_position = report_position
+        self._max_concurrent = max(1, max_concurrent)
+        self._max_queued = max_queued
+        self._lock = threading.Condition()
+        self._queue: List[Tuple[int, int, RunJob]] = []
+        self._order = itertools.count()
+        self._running: Dict[str, RunJob] = {}
+        self._workers: List[threading.Thread] = []
+        # Serializes position reports; held while reporting so writes land in state order
+        self._report_lock = threading.Lock()
+        self._reported: Dict[str, int] = {}
+
+    def submit(
+        self,
+        run_id: str,
+        trigger: str,
+        cancel_event: threading.Event,
+        entities: Optional[List[str]] = None,
+        run_config: Optional[Dict[str, Any]] = None,
+        mode: str = "full",
+    ) -> Submission:
+        """Queue a run, or coalesce a manual run into an identical one.
+
+        Raises:
+            RunQueueFullError: If max_queued runs are already waiting
+        """
+        job = RunJob(run_id, trigger, cancel_event, entities, run_config, mode)
+        with self._lock:
+            if job.priority == TRIGGER_PRIORITIES["manual"]:
+                existing = self._find_active(job.key)
+                if existing is not None:
+                    logger.info(
+                        "Coalesced run request into an identical run",
+                        extra={"run_id": existing.run_id, "trigger": trigger},
+                    )
+                    return Submission(existing.run_id, True, self._position(existing.run_id))
+            if len(self._queue) >= self._max_queued:
+                raise RunQueueFullError(f"{len(self._queue)} runs are already queued")
+            heapq.heappush(self._queue, (job.priority, next(self._order), job))
+            self._start_workers()
+            self._lock.notify()
+            position = self._position(run_id)
+            if position <= self._max_concurrent - len(self._running):
+                # An idle worker picks it up right away
+                position = 0
+        logger.info(
+            "Integrity run queued",
+            extra={"run_id": run_id, "trigger": trigger, "position": position, "running": len(self._running)},
+        )
+        self._report()
+        return Submission(run_id, False, position)
+
+    def cancel(self, run_id: str) -> bool:
+        """Remove a queued run; False if it isn't queued (running or unknown)."""
+        with self._lock:
+            remaining = [item for item in self._queue if item[2].run_id != run_id]
+            if len(remaining) == len(self._queue):
+                return False
+            heapq.heapify(remaining)
+            self._queue = remaining
+        self._report()
+        return True
+
+    def position(self, run_id: str) -> Optional[int]:
+        """Queue position of ``run_id`` (0 = running), or None if unknown."""
+        with self._lock:
+            return self._position(run_id)
+
+    def snapshot(self) -> Dict[str, List[str]]:
+        """Run ids executing and waiting, in start order."""
+        with self._lock:
+            return {
+                "running": list(self._running),
+                "queued": [job.run_id for _, _, job in sorted(self._queue)],
+            }
+
+    def _find_active(self, key: str) -> Optional[RunJob]:
+        for job in itertools.chain(self._running.values(), (item[2] for item in self._queue)):
+            if job.key == key and not job.cancel_event.is_set():
+                return job
+        return None
+
+    def _position(self, run_id: str) -> Optional[int]:
+        if run_id in self._running:
+            return 0
+        for index, (_, _, job) in enumerate(sorted(self._queue), start=1):
+            if job.run_id == run_id:
+                return index
+        return None
+
+    def _start_workers(self) -> None:
+        # Workers start with the first submission and live for the process
+        while len(self._workers) < self._max_concurrent:
+            worker = threading.Thread(
+                target=self._work, name=f"integrity-run-{len(self._workers)}", daemon=True
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                while not self._queue:
+                    self._lock.wait()
+                _, _, job = heapq.heappop(self._queue)
+                if job.cancel_event.is_set():
+                    # Cancelled while queued; cancel endpoints record the status
+                    skipped = True
+                else:
+                    skipped = False
+                    self._running[job.run_id] = job
+            self._report()
+            if skipped:
+                continue
+            try:
+                self._execute(job)
+            except Exception:
+                logger.error("Integrity run job failed", extra={"run_id": job.run_id}, exc_info=True)
+            finally:
+                with self._lock:
+                    self._running.pop(job.run_id, None)
+                with self._report_lock:
+                    self._reported.pop(job.run_id, None)
+
+    def _report(self) -> None:
+        if self._report_position is None:
+            return
+        with self._report_lock:
+            with self._lock:
+                positions = {run_id: 0 for run_id in self._running}
+                for index, (_, _, job) in enumerate(sorted(self._queue), start=1):
+                    positions[job.run_id] = index
+            for run_id in [run_id for run_id in self._reported if run_id not in positions]:
+                del self._reported[run_id]
+            for run_id, position in positions.items():
+                if self._reported.get(run_id) == position:
+                    continue
+                self._reported[run_id] = position
+                try:
+                    self._report_position(run_id, position)
+                except Exception as exc:
+                    logger.warning(
+                        "Failed to report queue position",
+                        extra={"run_id": run_id, "position": position, "error": str(exc)},
+                    )
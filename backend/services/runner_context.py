@@ -0,0 +1,139 @@
+"""Process-wide warm state shared by integrity runs.
+
+Building an IntegrityRunner used to load the runtime config twice, read every
+rule from Firestore and create new Firestore and Airtable clients, and each
+run then reloaded all of it again. RunnerContext keeps one Firestore client
+and writer for the process, and keeps the runtime config, schema config and
+Airtable client as a snapshot that is rebuilt only when one of its inputs
+changes:
+
+    rules.yaml                  file mtime and size
+    Firestore config document   update time
+    Firestore rules             RULES_VERSION_DOCUMENT version (bumped by RulesService)
+    discovered table ids        env placeholders resolve to them
+
+Rules edited outside RulesService don't bump the version, so snapshots are
+also rebuilt once they are RUNNER_CONTEXT_MAX_AGE_SECONDS old.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from ..clients.airtable import AirtableClient
+from ..clients.firestore import FirestoreClient
+from ..config.config_loader import CONFIG_PATH, load_runtime_config
+from ..config.models import SchemaConfig
+from ..config.schema_loader import load_schema_config
+from ..config.settings import RuntimeConfig
+from ..writers.firestore_writer import FirestoreWriter
+from .rules_service import RULES_VERSION_DOCUMENT
+
+# Rebuild a snapshot at least this often even if no version changed (seconds)
+RUNNER_CONTEXT_MAX_AGE_SECONDS = float(os.getenv("RUNNER_CONTEXT_MAX_AGE_SECONDS", "900"))
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Configs and the Airtable client built from them, for one version."""
+
+    version: Tuple[Any, ...]
+    runtime_config: RuntimeConfig
+    schema_config: SchemaConfig
+    airtable_client: AirtableClient
+    loaded_at: float
+
+
+class RunnerContext:
+    """Warm clients plus a versioned ConfigSnapshot, shared by every runner."""
+
+    def __init__(self, runtime_config: Optional[RuntimeConfig] = None):
+        bootstrap = runtime_config or load_runtime_config(attempt_discovery=True)
+        self.firestore_client = FirestoreClient(bootstrap.firestore)
+        self.firestore_writer = FirestoreWriter(self.firestore_client)
+        self._snapshot: Optional[ConfigSnapshot] = None
+        # Last discovered (base id, table ids); runs without discovery keep it
+        self._table_ids: Optional[Tuple[Any, ...]] = None
+        self._lock = threading.Lock()
+
+    def snapshot(self, discovery: Optional[Dict[str, Any]] = None) -> ConfigSnapshot:
+        """Current configs, rebuilt only if an input changed.
+
+        Args:
+            discovery: Result of discover_table_ids() for this run, if any;
+                a different result means env placeholders resolve differently.
+                None keeps the last result.
+        """
+        with self._lock:
+            version = self._version(discovery)
+            current = self._snapshot
+            if current is not None and time.monotonic() - current.loaded_at >= RUNNER_CONTEXT_MAX_AGE_SECONDS:
+                current = None
+            if current is not None and current.version == version:
+                return current
+
+            start = time.monotonic()
+            runtime_config = load_runtime_config(firestore_client=self.firestore_client, attempt_discovery=True)
+            if current is not None and version[2] is not None and current.version[2] == version[2]:
+                # Only the runtime config inputs changed; rules are the same
+                schema_config = current.schema_config
+            else:
+                schema_config = load_schema_config(firestore_client=self.firestore_client)
+            if self._snapshot is not None and self._snapshot.runtime_config.airtable == runtime_config.airtable:
+                # Keep the warm client (connection pool, per-base rate limits)
+                airtable_client = self._snapshot.airtable_client
+            else:
+                airtable_client = AirtableClient(runtime_config.airtable)
+            self._snapshot = ConfigSnapshot(version, runtime_config, schema_config, airtable_client, time.monotonic())
+            logger.info(
+                "Loaded runner config snapshot",
+                extra={
+                    "config_version": runtime_config.metadata.get("config_version"),
+                    "rules_version": version[2],
+                    "duration_ms": int((time.monotonic() - start) * 1000),
+                },
+            )
+            return self._snapshot
+
+    def _version(self, discovery: Optional[Dict[str, Any]]) -> Tuple[Any, ...]:
+        try:
+            stat = CONFIG_PATH.stat()
+            file_stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            file_stamp = None
+        config_stamp = rules_version = None
+        try:
+            client = self.firestore_client._get_client()
+            collection_name, _, doc_id = self.firestore_client._config.config_document.partition("/")
+            if doc_id:
+                config_doc = client.collection(collection_name).document(doc_id).get()
+                config_stamp = config_doc.update_time if config_doc.exists else "missing"
+            rules_doc = client.collection(RULES_VERSION_DOCUMENT[0]).document(RULES_VERSION_DOCUMENT[1]).get()
+            rules_version = (rules_doc.to_dict() or {}).get("version", 0) if rules_doc.exists else 0
+        except Exception as exc:
+            # Unknown versions never match, so the snapshot is rebuilt
+            logger.warning("Failed to read config versions", extra={"error": str(exc)})
+            return (file_stamp, object(), None, None)
+        if discovery and discovery.get("table_ids"):
+            self._table_ids = (discovery.get("base_id"), tuple(sorted(discovery["table_ids"].items())))
+        return (file_stamp, config_stamp, rules_version, self._table_ids)
+
+
+_default_context: Optional[RunnerContext] = None
+_default_context_lock = threading.Lock()
+
+
+def get_runner_context() -> RunnerContext:
+    """Process-wide RunnerContext, created on first use."""
+    global _default_context
+    with _default_context_lock:
+        if _default_context is None:
+            _default_context = RunnerContext()
+        return _default_context
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import copy
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import yaml
 
@@ -14,6 +16,11 @@ logger = logging.getLogger(__name__)
 DEFAULT_SCHEMA_PATH = Path(__file__).resolve().parent.parent / "config" / "airtable_schema.json"
 DEFAULT_MAPPING_PATH = Path(__file__).resolve().parent.parent / "config" / "table_mapping.yaml"
 
+# (schema path, mapping path) -> (file stamps, result) of the last discovery;
+# the schema JSON is large, so it is only parsed again when a file changes
+_discovery_cache: Dict[Tuple[str, str], Tuple[Tuple, Dict[str, Dict[str, str]]]] = {}
+_discovery_cache_lock = threading.Lock()
+
 
 def load_schema_json(schema_path: Path) -> Dict:
     """Load Airtable schema JSON file.
@@ -78,6 +85,8 @@ def discover_table_ids(
     mapping_path: Optional[Path] = None,
 ) -> Dict[str, Dict[str, str]]:
     """Discover table IDs and base ID from schema JSON using entity-to-table mapping.
+
+    A successful result is reused until either file's mtime or size changes.
     
     Args:
         schema_path: Optional path to schema JSON (defaults to DEFAULT_SCHEMA_PATH)
@@ -96,7 +105,30 @@ def discover_table_ids(
     """
     schema_file = schema_path or DEFAULT_SCHEMA_PATH
     mapping_file = mapping_path or DEFAULT_MAPPING_PATH
-    
+    cache_key = (str(schema_file), str(mapping_file))
+    stamps = (_file_stamp(schema_file), _file_stamp(mapping_file))
+    with _discovery_cache_lock:
+        cached = _discovery_cache.get(cache_key)
+    if cached is not None and cached[0] == stamps and None not in stamps:
+        return copy.deepcopy(cached[1])
+
+    result = _discover_table_ids(schema_file, mapping_file)
+    if result.get("table_ids"):
+        with _discovery_cache_lock:
+            _discovery_cache[cache_key] = (stamps, copy.deepcopy(result))
+    return result
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of ``path``, or None if it can't be read."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _discover_table_ids(schema_file: Path, mapping_file: Path) -> Dict[str, Dict[str, str]]:
     try:
         schema = load_schema_json(schema_file)
         mapping = load_mapping_config(mapping_file)
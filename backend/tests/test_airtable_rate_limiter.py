@@ -0,0 +1,55 @@
+"""Unit tests for the shared Airtable rate limiter."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+from backend.clients.airtable_rate_limiter import (
+    TokenBucket,
+    base_id_from_url,
+    get_base_limiter,
+    parse_retry_after,
+)
+
+
+def test_token_bucket_spaces_concurrent_callers():
+    """Test that threads sharing a bucket are held to its rate."""
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # First token is free, the remaining five need 5 / 50 = 0.1s
+    assert time.monotonic() - start >= 0.09
+
+
+def test_token_bucket_pause_does_not_stack():
+    """Test that concurrent pauses wait for the longest, not the sum."""
+    bucket = TokenBucket(rate=10, capacity=1)
+    bucket.pause(0.5)
+    bucket.pause(0.5)
+    delay = bucket.reserve()
+    assert 0.5 <= delay < 0.7
+
+
+def test_get_base_limiter_is_shared_per_base():
+    """Test that every caller of a base gets the same bucket."""
+    assert get_base_limiter("appAAAAAAAAAAAAAA") is get_base_limiter("appAAAAAAAAAAAAAA")
+    assert get_base_limiter("appAAAAAAAAAAAAAA") is not get_base_limiter("appBBBBBBBBBBBBBB")
+
+
+def test_base_id_from_url():
+    """Test base ID extraction from data and meta endpoints."""
+    assert base_id_from_url("https://api.airtable.com/v0/appnol2rxwLMp4WfV/tblX") == "appnol2rxwLMp4WfV"
+    assert base_id_from_url("https://api.airtable.com/v0/meta/bases/appnol2rxwLMp4WfV/tables") == "appnol2rxwLMp4WfV"
+    assert base_id_from_url("https://api.airtable.com/v0/meta/whoami") is None
+
+
+def test_parse_retry_after():
+    """Test Retry-After parsing with a default penalty fallback."""
+    response = Mock(headers={"Retry-After": "2"})
+    assert parse_retry_after(response) == 2.0
+    response = Mock(headers={})
+    assert parse_retry_after(response) == 30.0
@@ -0,0 +1,70 @@
+"""Unit tests for incremental Airtable fetches backed by local snapshots."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from backend.clients.airtable import AirtableClient
+from backend.clients.airtable_snapshots import SnapshotStore, TableSnapshot, modified_since_formula
+from backend.config.settings import AirtableConfig
+
+
+def _client(tmp_path):
+    config = AirtableConfig(students={"base_env": "AT_STUDENTS_BASE", "table_env": "AT_STUDENTS_TABLE"})
+    return AirtableClient(config, snapshot_store=SnapshotStore(tmp_path))
+
+
+def test_snapshot_store_round_trip(tmp_path):
+    """Test that a saved snapshot loads back unchanged."""
+    store = SnapshotStore(tmp_path)
+    now = datetime.now(timezone.utc)
+    snapshot = TableSnapshot("appX", "tblY", watermark=now, last_full_sync=now)
+    snapshot.merge([{"id": "rec1", "fields": {"Name": "A"}}])
+    store.save(snapshot)
+
+    loaded = store.load("appX", "tblY")
+    assert loaded.watermark == now
+    assert loaded.records == {"rec1": {"id": "rec1", "fields": {"Name": "A"}}}
+
+
+def test_modified_since_formula():
+    """Test the filterByFormula built from a watermark."""
+    watermark = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert modified_since_formula(watermark) == (
+        "IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('2025-01-02T03:04:05.000Z'))"
+    )
+
+
+def test_incremental_fetch_merges_changes(tmp_path, monkeypatch):
+    """Test that the first incremental fetch is full and later ones merge changes."""
+    monkeypatch.setenv("AT_STUDENTS_BASE", "appX")
+    monkeypatch.setenv("AT_STUDENTS_TABLE", "tblY")
+    client = _client(tmp_path)
+
+    full = [{"id": "rec1", "fields": {"Name": "A"}}, {"id": "rec2", "fields": {"Name": "B"}}]
+    with patch.object(AirtableClient, "_fetch_with_retry", return_value=full) as fetch:
+        assert client.fetch_records("students", incremental=True) == full
+        assert fetch.call_args.kwargs.get("formula") is None
+
+    changed = [{"id": "rec2", "fields": {"Name": "B2"}}, {"id": "rec3", "fields": {"Name": "C"}}]
+    with patch.object(AirtableClient, "_fetch_with_retry", return_value=changed) as fetch:
+        records = client.fetch_records("students", incremental=True)
+        assert "LAST_MODIFIED_TIME()" in fetch.call_args.kwargs["formula"]
+
+    assert {r["id"]: r["fields"]["Name"] for r in records} == {"rec1": "A", "rec2": "B2", "rec3": "C"}
+
+
+def test_incremental_fetch_reconciles_stale_snapshot(tmp_path, monkeypatch):
+    """Test that an old snapshot triggers a full fetch that drops deleted records."""
+    monkeypatch.setenv("AT_STUDENTS_BASE", "appX")
+    monkeypatch.setenv("AT_STUDENTS_TABLE", "tblY")
+    client = _client(tmp_path)
+
+    old = datetime.now(timezone.utc) - timedelta(days=30)
+    snapshot = TableSnapshot("appX", "tblY", watermark=old, last_full_sync=old)
+    snapshot.merge([{"id": "recDeleted", "fields": {}}])
+    SnapshotStore(tmp_path).save(snapshot)
+
+    full = [{"id": "rec1", "fields": {}}]
+    with patch.object(AirtableClient, "_fetch_with_retry", return_value=full):
+        assert client.fetch_records("students", incremental=True) == full
+    assert list(SnapshotStore(tmp_path).load("appX", "tblY").records) == ["rec1"]
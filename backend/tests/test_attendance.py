@@ -1,8 +1,17 @@
 """Unit tests for attendance anomaly detection."""
 
 import pytest
+import random
+from collections import defaultdict
 from datetime import date, timedelta
-from backend.checks.attendance import run, _normalize_attendance, AttendanceEntry
+from backend.checks.attendance import (
+    run,
+    _normalize_attendance,
+    _calculate_all_metrics,
+    _calculate_metrics,
+    AttendanceEntry,
+    StudentInfo,
+)
 from backend.config.settings import AttendanceRules, MetricThresholds
 
 
@@ -84,3 +93,72 @@ def test_attendance_no_issues():
     rules = AttendanceRules(thresholds={})
     issues = run(records, rules)
     assert len(issues) == 0
+
+
+def test_vectorized_metrics_match_per_student():
+    """Test that the vectorized engine returns the per-student metric values."""
+    rng = random.Random(7)
+    statuses = ["present", "absent", "tardy", "excused absence", "no show"]
+    grouped = defaultdict(list)
+    students = {}
+    for index in range(40):
+        student_id = f"recStudent{index}"
+        # 2020 has an ISO week 53, so streaks cross a long year boundary
+        start = date(2020, 11, 1) + timedelta(days=rng.randint(0, 30))
+        students[student_id] = StudentInfo(
+            record_id=student_id,
+            enrollment_start=start + timedelta(days=rng.randint(-10, 30)) if index % 3 else None,
+            classes_per_week=rng.choice([None, 2.0, 5.0]),
+        )
+        for _ in range(rng.randint(1, 60)):
+            grouped[student_id].append(
+                AttendanceEntry(
+                    record_id="att",
+                    student_id=student_id,
+                    class_id=rng.choice([None, "recClass1", "recClass2"]),
+                    date=start + timedelta(days=rng.randint(0, 90)),
+                    status=rng.choice(statuses),
+                    minutes_attended=rng.choice([None, 10.0, 45.0]),
+                    minutes_scheduled=rng.choice([None, 0.0, 60.0]),
+                )
+            )
+    rules = AttendanceRules(thresholds={})
+    expected = {}
+    for student_id, entries in grouped.items():
+        metrics = _calculate_metrics(entries, students[student_id], rules)
+        if metrics:
+            expected[student_id] = metrics
+    assert _calculate_all_metrics(grouped, students, rules) == expected
+
+
+def test_attendance_state_matches_full_run(tmp_path, sample_records, monkeypatch):
+    """Test that runs through the attendance state match full runs and only renormalize changes."""
+    import copy
+
+    from backend.checks import attendance
+    from backend.checks.attendance_state import AttendanceState
+
+    rules = AttendanceRules(
+        thresholds={
+            "consecutive_absences": MetricThresholds(warning=3, critical=5),
+            "absence_rate_30d": MetricThresholds(warning=0.1),
+        }
+    )
+    state = AttendanceState(tmp_path / "attendance.sqlite3")
+    records = copy.deepcopy(sample_records)
+    assert run(records, rules, state=state) == run(records, rules)
+
+    normalized = []
+    normalize = attendance._normalize_attendance
+    monkeypatch.setattr(
+        attendance, "_normalize_attendance", lambda raw: normalized.extend(raw) or normalize(raw)
+    )
+    records["attendance"][0]["fields"]["Status"] = "Present"
+    removed = records["attendance"].pop()
+    assert run(records, rules, state=state) == run(records, rules)
+    # The state run normalized only the edited record; the full run all of them
+    assert normalized[0]["id"] == records["attendance"][0]["id"]
+    assert len(normalized) == 1 + len(records["attendance"])
+
+    records["attendance"].append(removed)
+    assert run(records, rules, state=state) == run(records, rules)
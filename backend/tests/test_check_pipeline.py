@@ -0,0 +1,113 @@
+"""Unit tests for dependency-aware check scheduling."""
+
+import threading
+
+from backend.checks import links, required_fields
+from backend.config.models import EntitySchema, FieldRequirement, RelationshipRule, SchemaConfig
+from backend.config.settings import AttendanceRules
+from backend.services.check_pipeline import CheckPipeline, CheckTask, plan_checks
+from backend.utils.issues import IssueScope
+
+
+def _schema():
+    return SchemaConfig(
+        entities={
+            "students": EntitySchema(
+                description="Test Student Entity",
+                key_identifiers=["Name"],
+                identity_fields=["Name"],
+                relationships={
+                    "parents": RelationshipRule(
+                        target="parents",
+                        min_links=1,
+                        message="Student must have at least one parent",
+                    )
+                },
+                missing_key_data=[FieldRequirement(field="grade_level", message="Grade is required")],
+            )
+        },
+        duplicates={},
+        metadata={"source": "test", "generated": "now"},
+    )
+
+
+def test_plan_checks_dependencies():
+    """Test that tasks depend only on the entities they read and that are fetched."""
+    tasks = plan_checks(_schema(), None, ["students", "parents"])
+    deps = {(task.check, task.entities) for task in tasks}
+    assert deps == {
+        ("duplicates", frozenset({"students", "parents"})),
+        ("links", frozenset({"students", "parents"})),
+        ("required_fields", frozenset({"students"})),
+    }
+
+
+def test_plan_checks_issue_scopes():
+    """Test that tasks scope the issues their rules produce on the fetched entities."""
+    scopes = CheckPipeline(plan_checks(_schema(), None, ["students", "parents"])).issue_scopes()
+    assert IssueScope("students", rule_prefixes=("link.students.parents.",)) in scopes
+    assert IssueScope("students", rule_ids=frozenset({"required.students.grade_level"})) in scopes
+    link_scope = next(scope for scope in scopes if scope.rule_prefixes == ("link.students.parents.",))
+    assert link_scope.covers("students", "link.students.parents.min")
+    assert not link_scope.covers("parents", "link.students.parents.min")
+
+
+def test_plan_checks_scopes_skip_unfetched_targets():
+    """Test that a students-only run doesn't scope issues it can't reproduce."""
+    schema = _schema()
+    schema.entities["students"].relationships["campus"] = RelationshipRule(
+        target="campuses", min_links=1, message="Student must have a campus"
+    )
+    scopes = CheckPipeline(plan_checks(schema, AttendanceRules(thresholds={}), ["students"])).issue_scopes()
+    prefixes = {prefix for scope in scopes for prefix in scope.rule_prefixes}
+    assert "link.students.parents." not in prefixes
+    assert "link.students.campus." not in prefixes
+    assert "attendance." not in prefixes
+    assert IssueScope("students", rule_ids=frozenset({"required.students.grade_level"})) in scopes
+
+
+def test_task_starts_before_other_entities_arrive():
+    """Test that a task runs as soon as its own entities are ready."""
+    started = threading.Event()
+
+    def run_task(records):
+        started.set()
+        return []
+
+    pipeline = CheckPipeline([CheckTask("required_fields", frozenset({"students"}), run_task)])
+    pipeline.entity_ready("students", [])
+    assert started.wait(timeout=5)
+    pipeline.entity_ready("parents", [])
+    assert pipeline.results()["required_fields"].issues == []
+
+
+def test_pipeline_matches_sequential_checks(sample_records):
+    """Test that pipelined results equal running the checks after the fetch."""
+    schema = _schema()
+    pipeline = CheckPipeline(plan_checks(schema, None, sample_records.keys()))
+    for entity in reversed(list(sample_records)):
+        pipeline.entity_ready(entity, sample_records[entity])
+    results = pipeline.results()
+
+    assert results["links"].issues == links.run(sample_records, schema)
+    assert results["required_fields"].issues == required_fields.run(sample_records, schema)
+
+
+def test_pipeline_tasks_share_record_tables():
+    """Test that tasks reading the same entity get the same columnar table."""
+    tables = []
+
+    def run_task(records):
+        tables.append(records.table("students"))
+        return []
+
+    pipeline = CheckPipeline(
+        [
+            CheckTask("required_fields", frozenset({"students"}), run_task),
+            CheckTask("links", frozenset({"students", "parents"}), run_task),
+        ]
+    )
+    pipeline.entity_ready("students", [{"id": "rec1", "fields": {}}])
+    pipeline.entity_ready("parents", [])
+    pipeline.results()
+    assert len(tables) == 2 and tables[0] is tables[1]
@@ -49,3 +49,190 @@ def test_duplicate_detection_empty():
     records = {"students": [], "parents": [], "contractors": []}
     issues = run(records)
     assert len(issues) == 0
+
+
+def test_oversized_block_is_sub_blocked(monkeypatch):
+    """Test that a block above the size cap is not compared exhaustively."""
+    from backend.checks import duplicate_blocking, duplicates
+
+    monkeypatch.setattr(duplicate_blocking, "DUPLICATE_MAX_BLOCK_SIZE", 50)
+    first_names = ["john", "mary", "ana", "peter", "lucia", "omar", "wei", "sara", "liam", "nora"]
+    records = [
+        {
+            "id": f"rec{i:03d}",
+            "fields": {
+                "legal_first_name": first_names[i % 10],
+                "legal_last_name": f"family{i}",
+                "phone": "303-555-0100",  # shared school phone number
+            },
+        }
+        for i in range(200)
+    ]
+    normalized = duplicates._normalize_students(records)
+
+    exact_stats = {}
+    exact = duplicates._candidate_pairs(normalized, strategy="exact", stats=exact_stats)
+    capped_stats = {}
+    capped = duplicates._candidate_pairs(normalized, strategy="capped", stats=capped_stats)
+
+    assert len(exact) == 200 * 199 // 2
+    assert len(capped) < len(exact) // 4
+    block = next(iter(capped_stats.values()))
+    assert block.records == 200
+    assert block.strategy == "lsh"
+    assert block.pairs_compared == len(capped)
+    assert block.pairs_generated >= block.pairs_compared
+
+
+def test_sorted_neighbourhood_compares_window_neighbours():
+    """Test that each record is paired with the next ``window`` records by name."""
+    from types import SimpleNamespace
+    from backend.checks.duplicate_blocking import sorted_neighbourhood_pairs
+
+    normalized = {f"rec{i}": SimpleNamespace(normalized_name=f"name{i}") for i in range(6)}
+    pairs = list(sorted_neighbourhood_pairs(list(normalized), normalized, window=2))
+
+    assert [b for a, b in pairs if a == "rec0"] == ["rec1", "rec2"]
+    assert len(pairs) == 4 * 2 + 1
+
+
+def test_compiled_rule_plan_orders_and_matches():
+    """Test that compiled rules test exact matches first and keep full evidence."""
+    from datetime import date
+
+    from backend.checks import duplicates
+    from backend.config.models import DuplicateCondition, DuplicateDefinition, DuplicateRule
+
+    dup_def = DuplicateDefinition(
+        likely=[
+            DuplicateRule(
+                rule_id="dup.student.name_email",
+                description="Similar name and same email",
+                conditions=[
+                    DuplicateCondition(type="similarity", fields=["legal_first_name", "legal_last_name"], similarity=0.9),
+                    DuplicateCondition(type="exact_match", field="primary_email"),
+                ],
+            )
+        ]
+    )
+    plan = duplicates.compile_rule_plan(dup_def, "student")
+    assert [item.condition.type for item in plan.rules[0].conditions] == ["exact_match", "similarity"]
+
+    def student(record_id, name, email):
+        return duplicates.StudentRecord(
+            record_id=record_id, name=name, normalized_name=name, last_name_norm=name.split()[-1],
+            last_name_soundex="", campus="", grade="", parents=set(), truth_id="", dob=date(2015, 1, 1),
+            email=email, email_local="", email_domain="", phone="", normalized_phone="",
+        )
+
+    a = student("rec1", "john smith", "j@x.com")
+    b = student("rec2", "jon smith", "j@x.com")
+    c = student("rec3", "jon smith", "other@x.com")
+    matches = duplicates._classify_pairs([a, a], [b, c], "student", dup_def)
+
+    assert matches[1] is None
+    assert matches[0].rule_id == "dup.student.name_email"
+    assert set(matches[0].evidence) == {"legal_first_name_legal_last_name", "primary_email"}
+
+
+def test_group_issues_long_chain():
+    """Test that a long chain of matches forms one group without recursion errors."""
+    from backend.checks import duplicates
+
+    ids = [f"rec{i:05d}" for i in range(5000)]
+    normalized = {record_id: duplicates.ParentRecord(record_id, "", "", "", set(), "", "", "", "", "") for record_id in ids}
+    matches = [
+        duplicates.PairMatch("parent", ids[i + 1], ids[i], "dup.parent.phone", "likely", "warning", 0.9, {})
+        for i in range(len(ids) - 1)
+    ]
+    issues = duplicates._build_group_issues("parent", normalized, matches)
+    assert len(issues) == 1
+    assert len(issues[0].metadata["members"]) == 5000
+    assert len(issues[0].metadata["confidences"]) == 4999
+
+
+def test_process_pool_matches_serial(monkeypatch):
+    """Test that sharding pairs across worker processes gives the serial output."""
+    from backend.checks import duplicates
+
+    students = [
+        {
+            "id": f"stu{i:03d}",
+            "fields": {
+                "legal_first_name": ["John", "Jon", "Johnny"][i % 3],
+                "legal_last_name": "Smith",
+                "primary_email": f"family{i // 4}@example.com",
+                "primary_phone": f"303-555-{1000 + i // 5:04d}",
+                "date_of_birth": f"2015-0{1 + i % 2}-15",
+                "primary_campus": "north",
+            },
+        }
+        for i in range(40)
+    ]
+    parents = [
+        {
+            "id": f"par{i:03d}",
+            "fields": {
+                "full_name": ["Mary Smith", "Marie Smith"][i % 2],
+                "contact_email": f"parent{i // 3}@example.com",
+                "contact_phone": "303-555-2000",
+            },
+        }
+        for i in range(30)
+    ]
+    records = {"students": students, "parents": parents, "contractors": []}
+
+    monkeypatch.setattr(duplicates, "DUPLICATE_PROCESS_WORKERS", 1)
+    serial = run(records)
+
+    monkeypatch.setattr(duplicates, "DUPLICATE_PROCESS_WORKERS", 2)
+    monkeypatch.setattr(duplicates, "DUPLICATE_PARALLEL_MIN_PAIRS", 0)
+    monkeypatch.setattr(duplicates, "DUPLICATE_SHARDS_PER_WORKER", 3)
+    try:
+        parallel = run(records)
+    finally:
+        duplicates._shutdown_process_pool()
+
+    assert serial
+    assert parallel == serial
+
+
+def test_duplicate_index_reuses_unchanged_pairs(tmp_path, monkeypatch):
+    """Test that indexed runs match plain runs and only rescore changed records."""
+    import copy
+
+    from backend.checks import duplicates
+    from backend.checks.duplicate_index import DuplicateIndex
+
+    students = [
+        {
+            "id": f"stu{i:02d}",
+            "fields": {
+                "legal_first_name": ["John", "Jon"][i % 2],
+                "legal_last_name": "Smith",
+                "primary_email": f"family{i // 2}@example.com",
+                "primary_phone": "303-555-1000",
+                "date_of_birth": "2015-01-15",
+                "primary_campus": "north",
+            },
+        }
+        for i in range(8)
+    ]
+    index = DuplicateIndex(tmp_path / "index.sqlite3")
+    records = {"students": students, "parents": [], "contractors": []}
+    assert run(records, index=index) == run(records)
+
+    scored = []
+    classify = duplicates._classify_batch
+    monkeypatch.setattr(
+        duplicates,
+        "_classify_batch",
+        lambda entity, a, b, dup_def: scored.extend(zip(a, b)) or classify(entity, a, b, dup_def),
+    )
+    changed = copy.deepcopy(records)
+    changed["students"][3]["fields"]["legal_first_name"] = "Jonathan"
+    assert run(changed, index=index) == run(changed)
+
+    # 7 pairs touch the changed record; the second run() above had no index
+    assert len(scored) == 7 + 28
+    assert all("stu03" in (a.record_id, b.record_id) for a, b in scored[:7])
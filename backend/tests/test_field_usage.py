@@ -0,0 +1,77 @@
+"""Unit tests for rule-driven Airtable field projection."""
+
+from unittest.mock import patch
+
+from backend.checks.field_usage import fields_read_by_checks
+from backend.clients.airtable import AirtableClient
+from backend.clients.airtable_snapshots import SnapshotStore
+from backend.config.models import EntitySchema, FieldRequirement, RelationshipRule, SchemaConfig
+from backend.config.settings import AirtableConfig
+
+
+def _schema():
+    return SchemaConfig(
+        entities={
+            "students": EntitySchema(
+                description="Test Student Entity",
+                key_identifiers=["Name"],
+                identity_fields=["Name"],
+                relationships={
+                    "classes": RelationshipRule(
+                        target="classes",
+                        min_links=1,
+                        require_active=True,
+                        message="Student must be enrolled in an active class",
+                    )
+                },
+                missing_key_data=[
+                    FieldRequirement(field="grade_level", message="Grade is required"),
+                ],
+            )
+        },
+        duplicates={},
+        metadata={"source": "test", "generated": "now"},
+    )
+
+
+def test_fields_read_by_checks():
+    """Test that rule fields, link candidates and status fields are collected."""
+    usage = fields_read_by_checks(_schema(), None)
+
+    assert {"grade_level", "Grade Level", "classes", "Classes", "classes_ids"} <= usage["students"]
+    # Duplicate detection reads these regardless of the schema
+    assert {"email", "Email", "phone", "Phone"} <= usage["students"]
+    # require_active needs the target's status columns
+    assert {"status", "Status", "is_archived"} <= usage["classes"]
+    assert "attendance" not in usage
+
+
+def test_project_fields_uses_schema_columns(tmp_path):
+    """Test that projection keeps real columns plus the primary field."""
+    config = AirtableConfig(students={"base_env": "AT_STUDENTS_BASE", "table_env": "AT_STUDENTS_TABLE"})
+    client = AirtableClient(config, snapshot_store=SnapshotStore(tmp_path))
+    projection = client._project_fields(
+        "appnol2rxwLMp4WfV", "tblFBuVmDQ8TRKbLY", {"Enrollment Date", "not_a_column"}
+    )
+    assert projection == ["Enrollment Date", "Entry Id"]
+
+    assert client._project_fields("appnol2rxwLMp4WfV", "tblUnknown0000000", {"Enrollment Date"}) is None
+    assert client._project_fields("appnol2rxwLMp4WfV", "tblFBuVmDQ8TRKbLY", None) is None
+
+
+def test_snapshot_with_narrower_fields_triggers_full_fetch(tmp_path, monkeypatch):
+    """Test that an incremental fetch needing new columns refetches the table."""
+    monkeypatch.setenv("AT_STUDENTS_BASE", "appnol2rxwLMp4WfV")
+    monkeypatch.setenv("AT_STUDENTS_TABLE", "tblFBuVmDQ8TRKbLY")
+    config = AirtableConfig(students={"base_env": "AT_STUDENTS_BASE", "table_env": "AT_STUDENTS_TABLE"})
+    client = AirtableClient(config, snapshot_store=SnapshotStore(tmp_path))
+
+    with patch.object(AirtableClient, "_fetch_with_retry", return_value=[]) as fetch:
+        client.fetch_records("students", incremental=True, fields={"Enrollment Date"})
+        assert fetch.call_args.kwargs["fields"] == ["Enrollment Date", "Entry Id"]
+
+        client.fetch_records("students", incremental=True, fields={"Enrollment Date"})
+        assert fetch.call_args.kwargs["formula"] is not None
+
+        client.fetch_records("students", incremental=True, fields={"Enrollment Date", "Enrollment Code"})
+        assert fetch.call_args.kwargs["formula"] is None
@@ -0,0 +1,398 @@
+"""Unit tests for Firestore issue writes."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from backend.clients import firestore as firestore_module
+from backend.clients.firestore import FirestoreClient
+from backend.clients.issue_manifest import IssueManifest
+from backend.config.settings import FirestoreConfig
+from backend.utils.issues import IssueScope
+
+
+class FakeRef:
+    def __init__(self, store, path):
+        self.id = path.rsplit("/", 1)[-1]
+        self.path = path
+        self._store = store
+
+    def collection(self, name):
+        return FakeCollection(self._store, f"{self.path}/{name}")
+
+    def get(self):
+        data = self._store.get(self.path)
+        return SimpleNamespace(exists=data is not None, to_dict=lambda: dict(data or {}))
+
+    def set(self, data, merge=False):
+        doc = self._store.setdefault(self.path, {})
+        if merge is False:
+            doc.clear()
+        for name, value in data.items():
+            if value is firestore_module.firestore.DELETE_FIELD:
+                doc.pop(name, None)
+                continue
+            if isinstance(value, firestore_module.firestore.Increment):
+                value = doc.get(name, 0) + value._value
+            doc[name] = value
+
+    def delete(self):
+        self._store.pop(self.path, None)
+
+
+class FakeCollection:
+    def __init__(self, store, path):
+        self._store = store
+        self._path = path
+
+    def document(self, doc_id):
+        return FakeRef(self._store, f"{self._path}/{doc_id}")
+
+    def _docs(self):
+        prefix = f"{self._path}/"
+        return {
+            path[len(prefix):]: data
+            for path, data in self._store.items()
+            if path.startswith(prefix) and "/" not in path[len(prefix):]
+        }
+
+    def count(self):
+        total = len(self._docs())
+        return SimpleNamespace(get=lambda: [[SimpleNamespace(value=total)]])
+
+    def where(self, field, op, value):
+        return FakeQuery(self, [(field, op, value)])
+
+    def select(self, fields):
+        return FakeQuery(self, []).select(fields)
+
+
+class FakeQuery:
+    def __init__(self, collection, filters, fields=None, order=None):
+        self._collection = collection
+        self._filters = filters
+        self._fields = fields
+        self._order = order
+
+    def where(self, field, op, value):
+        return FakeQuery(self._collection, self._filters + [(field, op, value)], self._fields, self._order)
+
+    def select(self, fields):
+        return FakeQuery(self._collection, self._filters, fields, self._order)
+
+    def order_by(self, field, direction="ASCENDING"):
+        return FakeQuery(self._collection, self._filters, self._fields, (field, direction))
+
+    def count(self):
+        total = sum(1 for _ in self.stream())
+        return SimpleNamespace(get=lambda: [[SimpleNamespace(value=total)]])
+
+    def stream(self):
+        # Mirrors firestore.indexes.json: created_at ranges are indexed DESCENDING only
+        if any(field == "created_at" for field, _, _ in self._filters):
+            assert self._order == ("created_at", "DESCENDING"), "no index for created_at ascending"
+        for doc_id, data in self._collection._docs().items():
+            if all(_OPS[op](data.get(field), value) for field, op, value in self._filters):
+                projected = {f: data[f] for f in self._fields or () if f in data}
+                yield SimpleNamespace(
+                    id=doc_id,
+                    reference=self._collection.document(doc_id),
+                    to_dict=lambda projected=projected: projected,
+                )
+
+
+_OPS = {
+    "==": lambda field, value: field == value,
+    "in": lambda field, value: field in value,
+    ">=": lambda field, value: field is not None and field >= value,
+    "<=": lambda field, value: field is not None and field <= value,
+}
+
+
+class FakeBatch:
+    def __init__(self):
+        self.ops = []
+
+    def set(self, ref, data, merge=False):
+        self.ops.append((ref, data, merge))
+
+    def delete(self, ref):
+        self.ops.append((ref, None, None))
+
+    def commit(self):
+        for ref, data, merge in self.ops:
+            if data is None:
+                ref.delete()
+            else:
+                ref.set(data, merge=merge)
+
+
+class FakeBulkWriter:
+    """Writes on close(); the first write fails once with UNAVAILABLE.
+
+    Writes at ``dropped`` indices are lost without a callback, like a batch
+    whose commit RPC raised.
+    """
+
+    def __init__(self, dropped=()):
+        self.ops = []
+        self.dropped = set(dropped)
+
+    def on_write_result(self, callback):
+        self._on_result = callback
+
+    def on_write_error(self, callback):
+        self._on_error = callback
+
+    def set(self, ref, data, merge=False):
+        self.ops.append((ref, data, merge))
+
+    def close(self):
+        for index, (ref, data, merge) in enumerate(self.ops):
+            if index in self.dropped:
+                continue
+            if index == 0:
+                failure = SimpleNamespace(code=14, message="unavailable", attempts=0)
+                assert self._on_error(failure, self)
+            ref.set(data, merge=merge)
+            self._on_result(ref, None, self)
+
+
+class FakeFirestore:
+    def __init__(self):
+        self.store = {}
+        self.writes = 0
+        self.dropped_bulk_writes = ()
+        self.reads = 0
+
+    def collection(self, name):
+        return FakeCollection(self.store, name)
+
+    def get_all(self, refs, field_paths=None):
+        for ref in refs:
+            self.reads += 1
+            data = self.store.get(ref.path)
+            projected = {f: data[f] for f in field_paths or data or () if f in data} if data is not None else None
+            yield SimpleNamespace(id=ref.id, exists=data is not None, to_dict=lambda projected=projected: projected)
+
+    def batch(self):
+        batch = FakeBatch()
+        commit = batch.commit
+
+        def counted_commit():
+            self.writes += len(batch.ops)
+            commit()
+
+        batch.commit = counted_commit
+        return batch
+
+    def bulk_writer(self, options=None):
+        writer = FakeBulkWriter(self.dropped_bulk_writes)
+        close = writer.close
+
+        def counted_close():
+            self.writes += len(writer.ops)
+            close()
+
+        writer.close = counted_close
+        return writer
+
+
+def _client(fake, tmp_path):
+    client = FirestoreClient(
+        FirestoreConfig(
+            runs_collection="runs",
+            metrics_collection="metrics",
+            issues_collection="issues",
+            config_document="config",
+        ),
+        manifest=IssueManifest(tmp_path / "manifest.sqlite3"),
+    )
+    client._client = fake
+    return client
+
+
+def _issues(run_id, severity="warning"):
+    return [
+        {
+            "rule_id": "rule",
+            "entity": "students",
+            "record_id": f"rec{i}",
+            "severity": severity if i == 0 else "info",
+            "run_id": run_id,
+        }
+        for i in range(5)
+    ]
+
+
+@pytest.mark.parametrize("mode", ["batch", "bulk"])
+def test_record_issues_write_modes(tmp_path, monkeypatch, mode):
+    """Test that batch and bulk writes store the same documents and report progress."""
+    monkeypatch.setattr(firestore_module, "FIRESTORE_WRITE_MODE", mode)
+    monkeypatch.setattr(firestore_module, "FIRESTORE_BATCH_SIZE", 2)
+    fake = FakeFirestore()
+    progress = []
+
+    assert _client(fake, tmp_path).record_issues(_issues("run1"), lambda done, total, pct: progress.append(done)) == (5, 5)
+    assert fake.store["issues/rule_rec3"]["first_seen_in_run"] == "run1"
+    assert [done for done in progress if done] == [2, 4, 5]
+
+
+def test_bulk_write_detects_dropped_batch(tmp_path, monkeypatch):
+    """Test that writes the BulkWriter never acknowledges fail the run and stay out of the manifest."""
+    monkeypatch.setattr(firestore_module, "FIRESTORE_WRITE_MODE", "bulk")
+    fake = FakeFirestore()
+    fake.dropped_bulk_writes = (2, 3)
+    client = _client(fake, tmp_path)
+    with pytest.raises(RuntimeError, match="2 of 5 issue writes were never acknowledged"):
+        client.record_issues(_issues("run1"))
+
+    fake.dropped_bulk_writes = ()
+    assert client.record_issues(_issues("run2")) == (2, 5)
+    assert all(f"issues/rule_rec{i}" in fake.store for i in range(5))
+
+
+def test_record_issues_skips_unchanged(tmp_path, monkeypatch):
+    """Test that repeat runs count new issues from the manifest and rewrite only changes."""
+    monkeypatch.setattr(firestore_module, "ISSUE_SKIP_UNCHANGED", True)
+    fake = FakeFirestore()
+    client = _client(fake, tmp_path)
+    assert client.record_issues(_issues("run1")) == (5, 5)
+
+    fake.writes = 0
+    issues = _issues("run2", severity="critical") + [{"rule_id": "rule", "record_id": "rec9", "run_id": "run2"}]
+    assert client.record_issues(issues) == (1, 6)
+    # One changed issue, one new issue and one seen_issues marker
+    assert fake.writes == 3
+    assert fake.store["issues/rule_rec0"]["severity"] == "critical"
+    assert fake.store["issues/rule_rec0"]["first_seen_in_run"] == "run1"
+    assert fake.store["runs/run2/seen_issues/00000"]["doc_ids"] == [f"rule_rec{i}" for i in range(1, 5)]
+
+    # An issue deleted elsewhere (the delete endpoint bumps the generation) is recreated
+    del fake.store["issues/rule_rec1"]
+    _client(fake, tmp_path / "other").mark_issues_changed()
+    fake.reads = 0
+    assert client.record_issues(issues) == (1, 6)
+    assert "issues/rule_rec1" in fake.store
+    # The stale manifest is refreshed with the run's issues only
+    assert fake.reads == 6
+
+
+def test_record_issues_reads_only_run_issues(tmp_path):
+    """Test that a cold manifest looks up the run's issues, not the whole collection."""
+    fake = FakeFirestore()
+    for i in range(50):
+        fake.store[f"issues/old_rec{i}"] = {"status": "resolved", "fingerprint": "x"}
+    client = _client(fake, tmp_path)
+    assert client.record_issues(_issues("run1")) == (5, 5)
+    assert fake.reads == 5
+
+    fake.reads = 0
+    assert client.record_issues(_issues("run2")) == (0, 5)
+    assert fake.reads == 0
+
+
+def test_record_issues_detects_other_instance_writes(tmp_path, monkeypatch):
+    """Test that a manifest goes stale when another instance writes, even at the same count."""
+    monkeypatch.setattr(firestore_module, "ISSUE_SKIP_UNCHANGED", True)
+    fake = FakeFirestore()
+    client = _client(fake, tmp_path)
+    other = _client(fake, tmp_path / "other")
+    assert client.record_issues(_issues("run1")) == (5, 5)
+    assert other.record_issues(_issues("run2", severity="critical")) == (0, 5)
+    assert fake.store["issues/rule_rec0"]["severity"] == "critical"
+
+    # Same document count, but this instance's fingerprints are stale
+    assert client.record_issues(_issues("run3")) == (0, 5)
+    assert fake.store["issues/rule_rec0"]["severity"] == "warning"
+    assert fake.store["integrity_meta/issues"]["generation"] == 3
+
+    # Only this instance wrote since, so its manifest is trusted again
+    fake.writes = 0
+    assert client.record_issues(_issues("run4")) == (0, 5)
+    assert fake.writes == 1  # the seen_issues marker
+
+
+def test_resolve_missing_issues(tmp_path):
+    """Test that open in-scope issues not detected again are resolved, then reopened when back."""
+    fake = FakeFirestore()
+    client = _client(fake, tmp_path)
+    client.record_issues(_issues("run1") + [{"rule_id": "other", "entity": "students", "record_id": "rec0"}])
+    fake.store["issues/rule_rec4"]["status"] = "ignored"
+
+    scopes = [IssueScope("students", rule_ids=frozenset({"rule"}))]
+    detected = {f"rule_rec{i}" for i in range(3)}
+    assert client.resolve_missing_issues(detected, scopes, "run2") == 1
+    assert fake.store["issues/rule_rec3"]["status"] == "resolved"
+    assert fake.store["issues/rule_rec3"]["resolved_in_run"] == "run2"
+    # Ignored issues and rules outside the scopes are left alone
+    assert fake.store["issues/rule_rec4"]["status"] == "ignored"
+    assert fake.store["issues/other_rec0"]["status"] == "open"
+
+    # The manifest stays current and names the issue to reopen; only it is read again
+    fake.reads = 0
+    assert client.record_issues(_issues("run3")) == (0, 5)
+    assert fake.store["issues/rule_rec3"]["status"] == "open"
+    assert "resolved_by" not in fake.store["issues/rule_rec3"]
+    assert fake.reads == 1
+
+
+def test_reopen_issue_resolved_by_other_instance(tmp_path):
+    """Test that reopening follows Firestore state, not the local manifest."""
+    fake = FakeFirestore()
+    client = _client(fake, tmp_path)
+    other = _client(fake, tmp_path / "other")
+    client.record_issues(_issues("run1"))
+
+    scopes = [IssueScope("students", rule_ids=frozenset({"rule"}))]
+    assert other.resolve_missing_issues({f"rule_rec{i}" for i in range(3)}, scopes, "run2") == 2
+    # A user's own resolution is left alone
+    fake.store["issues/rule_rec4"]["resolved_by"] = "user@example.com"
+
+    assert client.record_issues(_issues("run3")) == (0, 5)
+    assert fake.store["issues/rule_rec3"]["status"] == "open"
+    assert "resolved_by" not in fake.store["issues/rule_rec3"]
+    assert fake.store["issues/rule_rec4"]["status"] == "resolved"
+
+
+def test_record_issues_refreshes_run_id_by_default(tmp_path):
+    """Test that unchanged issues are stamped with the latest run_id unless skipping is enabled."""
+    fake = FakeFirestore()
+    client = _client(fake, tmp_path)
+    client.record_issues(_issues("run1"))
+    assert client.record_issues(_issues("run2")) == (0, 5)
+    assert {fake.store[f"issues/rule_rec{i}"]["run_id"] for i in range(5)} == {"run2"}
+    assert not any("seen_issues" in path for path in fake.store)
+
+
+def test_bulk_issue_count_and_delete(tmp_path, monkeypatch):
+    """Test that bulk count and delete match issues of any selected type or entity once."""
+    monkeypatch.setattr(firestore_module, "FIRESTORE_BATCH_SIZE", 2)
+    fake = FakeFirestore()
+    issues = [
+        ("dup1", "duplicate", "students", 5),
+        ("dup2", "duplicate", "parents", 5),
+        ("link1", "missing_link", "students", 5),
+        ("link2", "missing_link", "parents", 5),
+        ("old", "duplicate", "students", 1),
+    ]
+    for doc_id, issue_type, entity, day in issues:
+        fake.store[f"issues/{doc_id}"] = {
+            "issue_type": issue_type,
+            "entity": entity,
+            "created_at": datetime(2024, 1, day, tzinfo=timezone.utc),
+        }
+    client = _client(fake, tmp_path)
+    client._manifest.replace("issues", {doc_id: "" for doc_id, *_ in issues}, 0)
+    start = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+    assert client.count_bulk_issues(start=start) == 4
+    # Deleting nothing leaves every instance's manifest current
+    assert client.delete_bulk_issues(["unknown"], None, start) == 0
+    assert "integrity_meta/issues" not in fake.store
+    assert client.count_bulk_issues(["duplicate"], ["students", "students"], start) == 3
+    assert client.delete_bulk_issues(["duplicate"], ["students"], start) == 3
+    assert sorted(path for path in fake.store if path.startswith("issues/")) == ["issues/link2", "issues/old"]
+    assert fake.store["integrity_meta/issues"]["generation"] == 1
+    assert client._manifest.load("issues", 1, ["link2"]) is None
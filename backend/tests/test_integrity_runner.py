@@ -150,7 +150,7 @@ def test_integrity_runner_write_error(mock_firestore_class, mock_airtable_class,
     
     mock_firestore_instance = Mock()
     mock_firestore_instance.record_run = Mock(side_effect=Exception("Write failed"))
-    mock_firestore_instance.record_issues = Mock()
+    mock_firestore_instance.record_issues = Mock(return_value=(0, 0))
     mock_firestore_class.return_value = mock_firestore_instance
     
     runner = IntegrityRunner(runtime_config=mock_runtime_config)
@@ -159,5 +159,56 @@ def test_integrity_runner_write_error(mock_firestore_class, mock_airtable_class,
     
     result = runner.run(mode="full", trigger="test")
     
-    # Should complete with success status (firestore write failure doesn't fail the run)
-    assert result["status"] == "success"
+    # The run still completes and reports its result status (firestore write failure doesn't fail the run)
+    assert result["status"] == "critical"
+    mock_firestore_instance.record_issues.assert_called()
+
+
+@patch("backend.services.integrity_runner.AirtableClient")
+@patch("backend.services.integrity_runner.FirestoreClient")
+def test_fetch_records_concurrent(mock_firestore_class, mock_airtable_class, sample_records, mock_runtime_config):
+    """Test concurrent fetch returns every entity in registry order."""
+    mock_airtable_instance = Mock()
+    mock_airtable_instance.fetch_records = Mock(side_effect=lambda key, *args, **kwargs: sample_records.get(key, []))
+    mock_airtable_class.return_value = mock_airtable_instance
+    
+    runner = IntegrityRunner(runtime_config=mock_runtime_config)
+    runner._airtable_client = mock_airtable_instance
+    
+    with patch("backend.services.integrity_runner.FETCH_MAX_WORKERS", 4):
+        records, counts = runner._fetch_records(["students", "parents", "attendance"])
+    
+    assert list(records.keys()) == ["students", "parents", "attendance"]
+    assert counts["students"] == len(sample_records["students"])
+    assert counts["attendance"] == len(sample_records["attendance"])
+
+
+@patch("backend.services.integrity_runner.AirtableClient")
+@patch("backend.services.integrity_runner.FirestoreClient")
+def test_fetch_records_concurrent_cancelled(mock_firestore_class, mock_airtable_class, mock_runtime_config):
+    """Test cancellation stops the concurrent fetch and signals running fetchers."""
+    from backend.utils.errors import IntegrityRunError
+    
+    seen_events = []
+    
+    def slow_fetch(key, progress_callback=None, cancel_event=None, **kwargs):
+        seen_events.append(cancel_event)
+        cancel_event.wait(timeout=5)
+        return []
+    
+    mock_airtable_instance = Mock()
+    mock_airtable_instance.fetch_records = Mock(side_effect=slow_fetch)
+    mock_airtable_class.return_value = mock_airtable_instance
+    
+    runner = IntegrityRunner(runtime_config=mock_runtime_config)
+    runner._airtable_client = mock_airtable_instance
+    
+    def check_cancelled():
+        raise IntegrityRunError("Scan cancelled by user")
+    
+    with patch("backend.services.integrity_runner.FETCH_MAX_WORKERS", 2):
+        with pytest.raises(IntegrityRunError):
+            runner._fetch_records(["students", "parents"], check_cancelled)
+    
+    assert seen_events
+    assert all(event.is_set() for event in seen_events)
@@ -101,3 +101,76 @@ def test_link_check_no_issues(sample_records):
         if i.issue_type == "missing_link" and i.record_id == "recStudent1"
     ]
     assert len(missing_issues) == 0
+
+
+def test_link_check_missing_reverse_link():
+    """Test that a linked record without the reverse link is reported once."""
+    records = {
+        "students": [
+            {"id": "recStudent1", "fields": {"Parents": ["recParent1", "recParent2"]}},
+        ],
+        "parents": [
+            {"id": "recParent1", "fields": {"Students": ["recStudent1"]}},
+            {"id": "recParent2", "fields": {"Students": []}},
+        ],
+    }
+    schema = SchemaConfig(
+        entities={
+            "students": EntitySchema(
+                description="Test Student Entity",
+                key_identifiers=["Name"],
+                identity_fields=["Name"],
+                relationships={
+                    "Parents": RelationshipRule(
+                        target="parents",
+                        message="Student parent link",
+                        validate_bidirectional=True,
+                        reverse_relationship_key="students",
+                    )
+                }
+            )
+        },
+        duplicates={},
+        metadata={"source": "test", "generated": "now"}
+    )
+
+    issues = [i for i in run(records, schema) if i.issue_type == "missing_reverse_link"]
+    assert [i.metadata["linked_record_id"] for i in issues] == ["recParent2"]
+
+
+def test_link_check_active_status_evaluated_once(monkeypatch):
+    """Test that a target linked from many records has its status read once."""
+    from backend.checks import links
+
+    calls = []
+    is_active = links.is_record_active
+    monkeypatch.setattr(
+        links, "is_record_active", lambda record, **kwargs: calls.append(record["id"]) or is_active(record, **kwargs)
+    )
+    records = {
+        "students": [{"id": f"recStudent{i}", "fields": {"Campus": ["recCampus1"]}} for i in range(5)],
+        "campuses": [{"id": "recCampus1", "fields": {"Status": "Archived"}}],
+    }
+    schema = SchemaConfig(
+        entities={
+            "students": EntitySchema(
+                description="Test Student Entity",
+                key_identifiers=["Name"],
+                identity_fields=["Name"],
+                relationships={
+                    "campus": RelationshipRule(
+                        target="campuses",
+                        min_links=1,
+                        require_active=True,
+                        message="Student must have an active campus",
+                    )
+                }
+            )
+        },
+        duplicates={},
+        metadata={"source": "test", "generated": "now"}
+    )
+
+    issues = run(records, schema)
+    assert calls == ["recCampus1"]
+    assert len([i for i in issues if i.issue_type == "inactive_link"]) == 5
@@ -1,11 +1,16 @@
 """Unit tests for required field validation."""
 
 import pytest
-from backend.checks.required_fields import run, _violates
+from backend.checks.required_fields import run, _violation_mask
 from backend.config.models import SchemaConfig, EntitySchema, FieldRequirement
+from backend.utils.record_store import RecordTable
 
 
-def test_violates_missing_field():
+def _table(*field_dicts):
+    return RecordTable([{"id": f"rec{i}", "fields": fields} for i, fields in enumerate(field_dicts)])
+
+
+def test_violation_mask_missing_field():
     """Test violation detection for missing fields."""
     req = FieldRequirement(
         field="Email",
@@ -13,11 +18,11 @@ def test_violates_missing_field():
         severity="warning",
     )
     
-    assert _violates({}, req) is True
-    assert _violates({"Email": "test@example.com"}, req) is False
+    mask = _violation_mask(_table({}, {"Email": "test@example.com"}), req)
+    assert mask.tolist() == [True, False]
 
 
-def test_violates_alternate_fields():
+def test_violation_mask_alternate_fields():
     """Test violation detection with alternate fields."""
     req = FieldRequirement(
         field="Email",
@@ -26,10 +31,13 @@ def test_violates_alternate_fields():
         severity="warning",
     )
     
-    assert _violates({}, req) is True
-    assert _violates({"Email": "test@example.com"}, req) is False
-    assert _violates({"Email Address": "test@example.com"}, req) is False
-    assert _violates({"email": "test@example.com"}, req) is False
+    table = _table(
+        {},
+        {"Email": "test@example.com"},
+        {"Email Address": "test@example.com"},
+        {"email": "test@example.com"},
+    )
+    assert _violation_mask(table, req).tolist() == [True, False, False, False]
 
 
 def test_required_field_check_missing(sample_records):
@@ -92,3 +100,21 @@ def test_required_field_check_present(sample_records):
         if i.issue_type == "missing_field" and "Name" in i.rule_id
     ]
     assert len(missing_name_issues) == 0
+
+
+def test_field_resolver_matches_get_field():
+    """Test that resolver lookups return what get_field returns."""
+    from backend.utils.records import FieldResolver, get_field
+
+    records = [
+        {"id": "rec1", "fields": {"Grade Level": "5", "status": "Active"}},
+        {"id": "rec2", "fields": {"Status": "Inactive"}},
+        {"id": "rec3", "fields": {}},
+    ]
+    resolver = FieldResolver.for_records(records)
+    for record in records:
+        fields = record["fields"]
+        for key in ("grade_level", "status", "campus"):
+            assert resolver.get(fields, key) == get_field(fields, key)
+    assert resolver.column("grade_level") == "Grade Level"
+    assert resolver.column("campus") is None
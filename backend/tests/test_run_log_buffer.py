@@ -0,0 +1,50 @@
+"""Unit tests for the buffered run log writer."""
+
+import threading
+
+from backend.writers.run_log_buffer import RunLogBuffer
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def record_run_logs(self, run_id, entries):
+        self.release.wait(timeout=5)
+        self.calls.append((run_id, [entry["message"] for entry in entries]))
+
+
+def test_flush_writes_entries_in_batches():
+    """Test that flush writes queued entries per run, in order, with progress coalesced."""
+    client = FakeClient()
+    buffer = RunLogBuffer(client, batch_size=100, flush_interval=60)
+    buffer.add("run1", "info", "started")
+    for page in range(5):
+        buffer.add("run1", "info", f"page {page}", coalesce_key="fetch:students")
+    buffer.add("run2", "info", "other run")
+    buffer.add("run1", "info", "done")
+
+    assert buffer.flush(timeout=5)
+    assert client.calls == [("run1", ["started", "page 4", "done"]), ("run2", ["other run"])]
+    assert buffer.coalesced == 4
+
+
+def test_progress_dropped_under_back_pressure():
+    """Test that progress entries are dropped while too many entries are waiting."""
+    client = FakeClient()
+    client.release.clear()
+    buffer = RunLogBuffer(client, batch_size=1, flush_interval=60, max_pending=2)
+    buffer.add("run1", "info", "first")
+    # Wait until the worker holds "first" in a write that can't finish yet
+    while buffer._pending:
+        threading.Event().wait(0.01)
+    buffer.add("run1", "info", "second")
+    buffer.add("run1", "warning", "third")
+    buffer.add("run1", "info", "progress", coalesce_key="write_issues")
+    client.release.set()
+
+    assert buffer.flush(timeout=5)
+    assert [message for _, messages in client.calls for message in messages] == ["first", "second", "third"]
+    assert buffer.dropped == 1
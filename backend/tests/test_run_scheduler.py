@@ -0,0 +1,70 @@
+"""Unit tests for the integrity run queue."""
+
+import threading
+
+import pytest
+
+from backend.services.run_scheduler import RunQueueFullError, RunScheduler
+
+
+class Recorder:
+    """execute callback that blocks each run until released."""
+
+    def __init__(self):
+        self.started = []
+        self.release = threading.Event()
+        self.first_started = threading.Event()
+        self.done = threading.Event()
+        self.expected = 0
+
+    def __call__(self, job):
+        self.started.append(job.run_id)
+        self.first_started.set()
+        self.release.wait(timeout=5)
+        if len(self.started) == self.expected:
+            self.done.set()
+
+
+def _submit(scheduler, run_id, trigger="manual", run_config=None):
+    return scheduler.submit(run_id, trigger, threading.Event(), run_config=run_config)
+
+
+def test_scheduled_runs_go_first_and_manual_duplicates_coalesce():
+    """Test priority order, coalescing of identical manual runs and reported positions."""
+    recorder = Recorder()
+    positions = []
+    scheduler = RunScheduler(recorder, lambda run_id, position: positions.append((run_id, position)), max_concurrent=1)
+
+    assert _submit(scheduler, "m1", run_config={"entities": ["students"]}).position == 0
+    assert recorder.first_started.wait(timeout=5)
+    assert _submit(scheduler, "m2", run_config={"entities": ["parents"]}).position == 1
+    assert _submit(scheduler, "n1", trigger="nightly").position == 1
+
+    duplicate = _submit(scheduler, "m3", run_config={"entities": ["parents"]})
+    assert (duplicate.run_id, duplicate.coalesced, duplicate.position) == ("m2", True, 2)
+    assert scheduler.snapshot() == {"running": ["m1"], "queued": ["n1", "m2"]}
+    assert ("m2", 2) in positions
+
+    recorder.expected = 3
+    recorder.release.set()
+    assert recorder.done.wait(timeout=5)
+    assert recorder.started == ["m1", "n1", "m2"]
+
+
+def test_queue_is_bounded_and_cancel_removes_queued_runs():
+    """Test that a full queue rejects runs and cancelled queued runs never start."""
+    recorder = Recorder()
+    scheduler = RunScheduler(recorder, max_concurrent=1, max_queued=1)
+    _submit(scheduler, "m1", run_config={"n": 1})
+    assert recorder.first_started.wait(timeout=5)
+    _submit(scheduler, "m2", run_config={"n": 2})
+    with pytest.raises(RunQueueFullError):
+        _submit(scheduler, "m3", run_config={"n": 3})
+
+    assert scheduler.cancel("m2")
+    assert not scheduler.cancel("m1")
+    _submit(scheduler, "m4", run_config={"n": 4})
+    recorder.expected = 2
+    recorder.release.set()
+    assert recorder.done.wait(timeout=5)
+    assert recorder.started == ["m1", "m4"]
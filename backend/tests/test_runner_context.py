@@ -0,0 +1,92 @@
+"""Unit tests for the shared runner context."""
+
+from types import SimpleNamespace
+
+from backend.config.settings import FirestoreConfig
+from backend.services import runner_context
+from backend.services import table_id_discovery
+from backend.services.runner_context import RunnerContext
+
+
+class FakeDoc:
+    def __init__(self, docs, path):
+        self._docs = docs
+        self._path = path
+
+    def get(self):
+        data = self._docs.get(self._path)
+        return SimpleNamespace(
+            exists=data is not None,
+            update_time=(data or {}).get("update_time"),
+            to_dict=lambda: data,
+        )
+
+
+class FakeFirestore:
+    def __init__(self):
+        self.docs = {"integrity_config/current": {"update_time": 1}, "rules/_version": {"version": 1}}
+
+    def collection(self, name):
+        return SimpleNamespace(document=lambda doc_id: FakeDoc(self.docs, f"{name}/{doc_id}"))
+
+
+def test_snapshot_reloads_only_on_version_change(monkeypatch):
+    """Test that configs are reused until the config document or rules version changes."""
+    loads = {"runtime": 0, "schema": 0}
+
+    def load_runtime_config(**kwargs):
+        loads["runtime"] += 1
+        return SimpleNamespace(airtable={"base": "app1"}, metadata={"config_version": "v"})
+
+    def load_schema_config(**kwargs):
+        loads["schema"] += 1
+        return object()
+
+    monkeypatch.setattr(runner_context, "load_runtime_config", load_runtime_config)
+    monkeypatch.setattr(runner_context, "load_schema_config", load_schema_config)
+    monkeypatch.setattr(runner_context, "AirtableClient", lambda config: object())
+    context = RunnerContext(
+        SimpleNamespace(firestore=FirestoreConfig(
+            runs_collection="runs",
+            metrics_collection="metrics",
+            issues_collection="issues",
+            config_document="integrity_config/current",
+        ))
+    )
+    fake = FakeFirestore()
+    context.firestore_client._client = fake
+
+    first = context.snapshot()
+    assert context.snapshot({"base_id": None, "table_ids": {}}) is first
+    assert loads == {"runtime": 1, "schema": 1}
+
+    fake.docs["integrity_config/current"]["update_time"] = 2
+    second = context.snapshot()
+    assert second is not first
+    assert second.schema_config is first.schema_config
+    assert second.airtable_client is first.airtable_client
+    assert loads == {"runtime": 2, "schema": 1}
+
+    fake.docs["rules/_version"]["version"] = 2
+    assert context.snapshot().schema_config is not first.schema_config
+    assert loads == {"runtime": 3, "schema": 2}
+
+
+def test_discover_table_ids_cached_until_files_change(tmp_path, monkeypatch):
+    """Test that the schema JSON is parsed again only after a file changes."""
+    schema = tmp_path / "schema.json"
+    mapping = tmp_path / "mapping.yaml"
+    schema.write_text('{"baseId": "app1", "tables": [{"id": "tbl1", "name": "Students"}]}')
+    mapping.write_text("entity_table_mapping:\n  students: Students\n")
+    parses = []
+    load = table_id_discovery.load_schema_json
+    monkeypatch.setattr(table_id_discovery, "load_schema_json", lambda path: parses.append(path) or load(path))
+
+    first = table_id_discovery.discover_table_ids(schema, mapping)
+    first["table_ids"]["students"] = "mutated"
+    assert table_id_discovery.discover_table_ids(schema, mapping) == {"base_id": "app1", "table_ids": {"students": "tbl1"}}
+    assert len(parses) == 1
+
+    schema.write_text('{"baseId": "app1", "tables": [{"id": "tbl22", "name": "Students"}]}')
+    assert table_id_discovery.discover_table_ids(schema, mapping)["table_ids"] == {"students": "tbl22"}
+    assert len(parses) == 2
@@ -1,7 +1,7 @@
 """Unit tests for similarity utilities."""
 
 import pytest
-from backend.utils.similarity import jaro_winkler, jaccard_ratio
+from backend.utils.similarity import jaro_winkler, jaro_winkler_batch, jaccard_ratio
 
 
 def test_jaro_winkler_identical():
@@ -60,3 +60,19 @@ def test_jaccard_ratio_empty():
 def test_jaccard_ratio_filters_none():
     """Test Jaccard ratio filters None values."""
     assert jaccard_ratio(["a", None, "b"], ["b", None, "c"]) == pytest.approx(1.0 / 3.0)
+
+
+def test_jaro_winkler_batch_matches_scalar():
+    """Test that batched scores equal per-pair scores, in input order."""
+    names = ["john smith", "jon smith", "mary jones", "marie jones", "", "a", "ab", "josé", "jose"]
+    left = [a for a in names for _ in names]
+    right = [b for _ in names for b in names]
+    assert jaro_winkler_batch(left, right) == [jaro_winkler(a, b) for a, b in zip(left, right)]
+
+
+def test_jaro_winkler_batch_threshold():
+    """Test that pairs that cannot reach the threshold are skipped as 0.0."""
+    scores = jaro_winkler_batch(["john", "jo", "john"], ["john", "johnathan", "jon"], threshold=0.9)
+    assert scores[0] == 1.0
+    assert scores[1] == 0.0
+    assert scores[2] == jaro_winkler("john", "jon")
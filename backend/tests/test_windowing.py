@@ -0,0 +1,38 @@
+"""Unit tests for sorted-date window helpers."""
+
+import random
+from datetime import date, timedelta
+
+import numpy as np
+
+from backend.utils.windowing import (
+    count_in_sorted_window,
+    count_in_window,
+    counts_in_windows,
+    rolling_window,
+    window_ranges,
+)
+
+
+def _dates(count=200):
+    rng = random.Random(11)
+    return sorted(date(2024, 1, 1) + timedelta(days=rng.randint(0, 120)) for _ in range(count))
+
+
+def test_window_ranges_match_rolling_window():
+    """Test that index ranges select the same dates rolling_window copies."""
+    dates = _dates()
+    ranges = list(window_ranges(dates, 14))
+    assert [dates[start:end] for start, end in ranges] == rolling_window(dates, 14)
+
+
+def test_sorted_window_counts_match_scan():
+    """Test that bisect and batched counts equal the linear scan."""
+    dates = _dates()
+    anchors = [date(2024, 1, 1) + timedelta(days=offset) for offset in range(-5, 130, 3)]
+    expected = [count_in_window(dates, 30, anchor) for anchor in anchors]
+    assert [count_in_sorted_window(dates, 30, anchor) for anchor in anchors] == expected
+
+    ordinals = np.array([d.toordinal() for d in dates])
+    batched = counts_in_windows(ordinals, [anchor.toordinal() for anchor in anchors], 30)
+    assert batched.tolist() == expected
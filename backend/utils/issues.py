@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 
 @dataclass
@@ -16,3 +16,22 @@ class IssuePayload:
     description: str
     metadata: Dict[str, Any] = field(default_factory=dict)
     related_records: Optional[List[str]] = None
+
+
+@dataclass(frozen=True)
+class IssueScope:
+    """Issues a check re-evaluated in a run.
+
+    Covers issues on ``entity`` whose rule_id is one of ``rule_ids`` or starts
+    with one of ``rule_prefixes``. An open issue inside a run's scopes that the
+    run didn't produce again is no longer detected.
+    """
+
+    entity: str
+    rule_ids: FrozenSet[str] = frozenset()
+    rule_prefixes: Tuple[str, ...] = ()
+
+    def covers(self, entity: Optional[str], rule_id: Optional[str]) -> bool:
+        if entity != self.entity or not rule_id:
+            return False
+        return rule_id in self.rule_ids or rule_id.startswith(self.rule_prefixes)
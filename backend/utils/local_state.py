@@ -0,0 +1,82 @@
+"""State kept on the instance's local disk between runs.
+
+Airtable snapshots, the duplicate index, the attendance state and the issue
+manifest all live under LOCAL_STATE_DIR. Local disk belongs to one instance
+and disappears with it, so this state is only ever a cache of something that
+can be rebuilt: the SQLite-backed stores log any error, discard the file and
+carry on as if it were empty.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Generic, Optional, TypeVar
+
+# Cloud Run: /tmp is the only writable location
+LOCAL_STATE_DIR = os.getenv("LOCAL_STATE_DIR", os.path.join(tempfile.gettempdir(), "integrity-monitor"))
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def state_path(env_var: str, name: str) -> str:
+    """Path set by ``env_var``, else ``name`` under LOCAL_STATE_DIR."""
+    return os.getenv(env_var, os.path.join(LOCAL_STATE_DIR, name))
+
+
+def state_enabled(env_var: str) -> bool:
+    """Whether the state switched by ``env_var`` is on (the default)."""
+    return os.getenv(env_var, "true").lower() == "true"
+
+
+class SQLiteState:
+    """Base for stores backed by one SQLite file.
+
+    Subclasses set SCHEMA (run on every connect) and LABEL (used in logs).
+    """
+
+    SCHEMA = ""
+    LABEL = "local state"
+
+    def __init__(self, path: str | os.PathLike):
+        self._path = Path(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self._path, timeout=30)
+        conn.executescript(self.SCHEMA)
+        return conn
+
+    def _discard(self, exc: Exception) -> None:
+        logger.warning(
+            f"Discarding unreadable {self.LABEL}",
+            extra={"path": str(self._path), "error": str(exc)},
+        )
+        try:
+            self._path.unlink()
+        except OSError:
+            pass
+
+
+class ProcessDefault(Generic[T]):
+    """Process-wide instance created on first use, or None when disabled."""
+
+    def __init__(self, factory: Callable[[], T], enabled: bool):
+        self._factory = factory
+        self._enabled = enabled
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[T]:
+        if not self._enabled:
+            return None
+        with self._lock:
+            if self._instance is None:
+                self._instance = self._factory()
+            return self._instance
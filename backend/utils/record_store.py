@@ -0,0 +1,124 @@
+"""Columnar view of fetched records shared by the checks.
+
+Checks used to walk ``List[dict]`` per rule and probe each record's fields.
+A RecordTable extracts each logical field once into a column (one value per
+record, in fetch order) and derives boolean masks from it, so a rule is
+evaluated for every record of an entity in a few NumPy operations. Columns
+are built on first use and cached, so checks sharing a RecordStore also
+share the extracted columns.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .records import FieldResolver, as_list
+
+
+class RecordTable:
+    """One entity's records with lazily built, cached columns.
+
+    Columns follow FieldResolver (and so get_field) semantics: a logical key
+    maps to the column holding any of its name variants.
+    """
+
+    def __init__(self, records: List[dict]):
+        self.records = records
+        self.ids: List[Optional[str]] = [record.get("id") for record in records]
+        self.fields: List[Dict[str, Any]] = [record.get("fields", {}) for record in records]
+        self.resolver = FieldResolver.for_records(records)
+        self._cache: Dict[Any, Any] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _cached(self, key: Any, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            try:
+                return self._cache[key]
+            except KeyError:
+                value = self._cache[key] = build()
+                return value
+
+    def column(self, key: str) -> List[Any]:
+        """Value of logical field ``key`` for every record (None when absent)."""
+
+        def build() -> List[Any]:
+            column = self.resolver.column(key)
+            if column is None:
+                return [None] * len(self.fields)
+            if isinstance(column, str):
+                return [fields.get(column) for fields in self.fields]
+            return [self.resolver.get(fields, key) for fields in self.fields]
+
+        return self._cached(("column", key), build)
+
+    def list_column(self, key: str) -> List[List[str]]:
+        """get_list_field(fields, key) for every record."""
+        return self._cached(("list", key), lambda: [as_list(value) for value in self.column(key)])
+
+    def present(self, key: str) -> np.ndarray:
+        """Mask of records whose ``key`` value is truthy."""
+        return self._cached(
+            ("present", key),
+            lambda: np.fromiter(map(bool, self.column(key)), dtype=bool, count=len(self)),
+        )
+
+    def condition_mask(self, condition_field: Optional[str], condition_value: Optional[str]) -> np.ndarray:
+        """matches_condition(fields, condition_field, condition_value) for every record."""
+        if not condition_field:
+            return np.ones(len(self), dtype=bool)
+        if condition_value is None:
+            return self.present(condition_field)
+        lowered = self._cached(
+            ("lower", condition_field),
+            lambda: np.array([str(value).lower() for value in self.column(condition_field)], dtype=object),
+        )
+        return lowered == str(condition_value).lower()
+
+
+class RecordStore(dict):
+    """Entity name -> raw records, plus a shared RecordTable per entity.
+
+    Behaves like the plain records dict the checks always took; checks that
+    know about it call table() to get the columnar view. Stores created with
+    subset() share their tables with the parent store.
+    """
+
+    def __init__(
+        self,
+        records: Optional[Dict[str, List[dict]]] = None,
+        _tables: Optional[Dict[str, RecordTable]] = None,
+        _lock: Optional[threading.Lock] = None,
+    ):
+        super().__init__(records or {})
+        self._tables: Dict[str, RecordTable] = _tables if _tables is not None else {}
+        self._lock = _lock or threading.Lock()
+
+    @classmethod
+    def wrap(cls, records: Dict[str, List[dict]]) -> "RecordStore":
+        """Return ``records`` if it already is a RecordStore, else a store over it."""
+        return records if isinstance(records, RecordStore) else cls(records)
+
+    def table(self, entity: str) -> RecordTable:
+        if entity not in self:
+            return RecordTable([])
+        records = self[entity]
+        with self._lock:
+            table = self._tables.get(entity)
+            # A replaced record list (entity refetched) gets a fresh table
+            if table is None or table.records is not records:
+                table = self._tables[entity] = RecordTable(records)
+            return table
+
+    def subset(self, entities: Iterable[str]) -> "RecordStore":
+        """Store holding only ``entities`` that shares this store's tables."""
+        return RecordStore(
+            {entity: self[entity] for entity in entities if entity in self},
+            _tables=self._tables,
+            _lock=self._lock,
+        )
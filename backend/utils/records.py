@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# Fields consulted by is_record_active when no explicit status fields are given
+DEFAULT_STATUS_FIELDS = ["status", "is_active", "active", "enrollment_status", "record_status"]
+ARCHIVED_INDICATOR_FIELDS = ["archived", "is_archived", "deleted", "is_deleted"]
 
 
 def build_record_index(records: Dict[str, list]) -> Dict[str, Dict[str, dict]]:
@@ -25,12 +29,17 @@ def build_record_index(records: Dict[str, list]) -> Dict[str, Dict[str, dict]]:
     return index
 
 
-def is_record_active(record: dict, status_fields: Optional[List[str]] = None) -> bool:
+def is_record_active(
+    record: dict,
+    status_fields: Optional[List[str]] = None,
+    resolver: Optional["FieldResolver"] = None,
+) -> bool:
     """Check if a record is considered active based on status fields.
     
     Args:
         record: Record dictionary with 'fields' key
         status_fields: Optional list of field names to check. If None, uses common defaults.
+        resolver: Optional FieldResolver for the record's entity
         
     Returns:
         True if record appears active, False otherwise
@@ -42,13 +51,12 @@ def is_record_active(record: dict, status_fields: Optional[List[str]] = None) ->
     if not fields:
         return True  # Assume active if no fields (conservative)
     
-    # Default status field names to check
-    default_status_fields = ["status", "is_active", "active", "enrollment_status", "record_status"]
-    check_fields = status_fields or default_status_fields
+    lookup = resolver.get if resolver else get_field
+    check_fields = status_fields or DEFAULT_STATUS_FIELDS
     
     # Check each status field
     for field_name in check_fields:
-        value = get_field(fields, field_name)
+        value = lookup(fields, field_name)
         if value is None:
             continue
         
@@ -63,10 +71,9 @@ def is_record_active(record: dict, status_fields: Optional[List[str]] = None) ->
             return False
     
     # If no status field found or ambiguous, check for common "archived" patterns
-    archived_indicators = ["archived", "is_archived", "deleted", "is_deleted"]
-    for indicator in archived_indicators:
-        if get_field(fields, indicator):
-            value = get_field(fields, indicator)
+    for indicator in ARCHIVED_INDICATOR_FIELDS:
+        value = lookup(fields, indicator)
+        if value:
             if isinstance(value, bool) and value:
                 return False
             if str(value).lower() in ("true", "1", "yes"):
@@ -76,9 +83,14 @@ def is_record_active(record: dict, status_fields: Optional[List[str]] = None) ->
     return True
 
 
+def field_name_variants(key: str) -> Set[str]:
+    """Column names get_field will try for a logical key."""
+    return {key, key.replace("_", " "), key.title(), key.replace("_", " ").title()}
+
+
 def get_field(fields: Dict[str, Any], key: str) -> Any:
     """Attempt to retrieve a field by key or friendly variants."""
-    candidates = {key, key.replace("_", " "), key.title(), key.replace("_", " ").title()}
+    candidates = field_name_variants(key)
     for candidate in candidates:
         if candidate in fields:
             return fields[candidate]
@@ -86,7 +98,17 @@ def get_field(fields: Dict[str, Any], key: str) -> Any:
 
 
 def get_list_field(fields: Dict[str, Any], key: str) -> List[str]:
-    value = get_field(fields, key)
+    return as_list(get_field(fields, key))
+
+
+def matches_condition(fields: Dict[str, Any], condition_field: Optional[str], condition_value: Optional[str]) -> bool:
+    if not condition_field:
+        return True
+    return _condition_holds(get_field(fields, condition_field), condition_value)
+
+
+def as_list(value: Any) -> List[str]:
+    """Field value as a list of non-empty strings (linked record ids, multi-selects)."""
     if isinstance(value, list):
         return [str(v) for v in value if v]
     if isinstance(value, str) and value:
@@ -94,10 +116,72 @@ def get_list_field(fields: Dict[str, Any], key: str) -> List[str]:
     return []
 
 
-def matches_condition(fields: Dict[str, Any], condition_field: Optional[str], condition_value: Optional[str]) -> bool:
-    if not condition_field:
-        return True
-    current = get_field(fields, condition_field)
+def _condition_holds(current: Any, condition_value: Optional[str]) -> bool:
     if condition_value is None:
         return bool(current)
     return str(current).lower() == str(condition_value).lower()
+
+
+_AMBIGUOUS = object()
+
+
+class FieldResolver:
+    """Maps logical field keys to the columns one entity's records actually use.
+
+    get_field probes every name variant of a key on each call. A resolver
+    collects the column names present across an entity's records once, then
+    resolves each key to its single matching column on first use, so later
+    lookups are one dict access. Keys matching no column return None without
+    probing; keys matching several columns (e.g. both "status" and "Status")
+    fall back to get_field.
+
+    Only use a resolver with the records it was built from.
+    """
+
+    def __init__(self, columns: Iterable[str]):
+        self._columns = frozenset(columns)
+        self._resolved: Dict[str, Any] = {}
+
+    @classmethod
+    def for_records(cls, records: Iterable[dict]) -> "FieldResolver":
+        columns: Set[str] = set()
+        for record in records:
+            columns.update(record.get("fields", {}))
+        return cls(columns)
+
+    def column(self, key: str) -> Any:
+        """Column name for ``key``: a str, None if absent, or _AMBIGUOUS."""
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+        matches = field_name_variants(key) & self._columns
+        if not matches:
+            column = None
+        elif len(matches) == 1:
+            column = next(iter(matches))
+        else:
+            column = _AMBIGUOUS
+        self._resolved[key] = column
+        return column
+
+    def get(self, fields: Dict[str, Any], key: str) -> Any:
+        """Same result as get_field(fields, key)."""
+        column = self.column(key)
+        if column is None:
+            return None
+        if column is _AMBIGUOUS:
+            return get_field(fields, key)
+        return fields.get(column)
+
+    def get_list(self, fields: Dict[str, Any], key: str) -> List[str]:
+        """Same result as get_list_field(fields, key)."""
+        return as_list(self.get(fields, key))
+
+    def matches_condition(
+        self, fields: Dict[str, Any], condition_field: Optional[str], condition_value: Optional[str]
+    ) -> bool:
+        """Same result as matches_condition(fields, condition_field, condition_value)."""
+        if not condition_field:
+            return True
+        return _condition_holds(self.get(fields, condition_field), condition_value)
@@ -2,7 +2,17 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Batches smaller than this are scored with the scalar implementation
+BATCH_MIN_PAIRS = 16
+# Pairs scored per NumPy pass (bounds the (pairs x length) work arrays)
+BATCH_CHUNK_PAIRS = 4096
 
 
 def jaro_winkler(s1: str, s2: str) -> float:
@@ -64,6 +74,124 @@ def jaro_winkler(s1: str, s2: str) -> float:
     return jaro + 0.1 * prefix * (1 - jaro)
 
 
+def jaro_winkler_upper_bound(s1: str, s2: str) -> float:
+    """Highest Jaro-Winkler score two strings of these lengths could reach."""
+    len1 = len(s1 or "")
+    len2 = len(s2 or "")
+    if not len1 and not len2:
+        return 1.0
+    if not len1 or not len2:
+        return 0.0
+    shortest = min(len1, len2)
+    jaro = (shortest / len1 + shortest / len2 + 1) / 3
+    return jaro + 0.1 * min(4, shortest) * (1 - jaro)
+
+
+def jaro_winkler_batch(
+    left: Sequence[str],
+    right: Sequence[str],
+    threshold: Optional[float] = None,
+) -> List[float]:
+    """Score many string pairs at once; equal to calling jaro_winkler per pair.
+
+    Pairs are scored in NumPy passes over padded code-point arrays, one pass
+    per character position instead of one Python loop per pair. Falls back
+    to the scalar implementation for small batches or when NumPy is missing.
+
+    Args:
+        left: First string of each pair
+        right: Second string of each pair (same length as left)
+        threshold: If set, pairs whose length-based upper bound is below it
+            are not scored and get 0.0. Only use it when callers compare the
+            score against a threshold at least this high.
+
+    Returns:
+        Scores in input order.
+    """
+    if len(left) != len(right):
+        raise ValueError("left and right must have the same length")
+    left = [s or "" for s in left]
+    right = [s or "" for s in right]
+    scores = [0.0] * len(left)
+
+    todo: List[int] = []
+    for index, (s1, s2) in enumerate(zip(left, right)):
+        if threshold is not None and jaro_winkler_upper_bound(s1, s2) < threshold:
+            continue
+        if not s1 or not s2:
+            scores[index] = 1.0 if not s1 and not s2 else 0.0
+            continue
+        todo.append(index)
+
+    if np is None or len(todo) < BATCH_MIN_PAIRS:
+        for index in todo:
+            scores[index] = jaro_winkler(left[index], right[index])
+        return scores
+
+    # Group similar lengths so padding stays small
+    todo.sort(key=lambda index: max(len(left[index]), len(right[index])))
+    for start in range(0, len(todo), BATCH_CHUNK_PAIRS):
+        chunk = todo[start:start + BATCH_CHUNK_PAIRS]
+        chunk_scores = _jaro_winkler_numpy([left[i] for i in chunk], [right[i] for i in chunk])
+        for index, score in zip(chunk, chunk_scores.tolist()):
+            scores[index] = score
+    return scores
+
+
+def _encode(strings: List[str], pad: int) -> "tuple[np.ndarray, np.ndarray]":
+    """Code points as an (n, width) int64 array, padded with ``pad``."""
+    lengths = np.fromiter((len(s) for s in strings), dtype=np.int64, count=len(strings))
+    width = max(int(lengths.max()), 4)
+    codes = np.array(strings, dtype=f"<U{width}").view(np.uint32).reshape(len(strings), width).astype(np.int64)
+    codes[np.arange(width) >= lengths[:, None]] = pad
+    return codes, lengths
+
+
+def _jaro_winkler_numpy(left: List[str], right: List[str]) -> "np.ndarray":
+    """Vectorized jaro_winkler for non-empty strings (same arithmetic, same results)."""
+    # Different pad values so padding never matches padding
+    a, len1 = _encode(left, -1)
+    b, len2 = _encode(right, -2)
+    rows = len(left)
+    max_dist = np.maximum(len1, len2) // 2 - 1
+    positions = np.arange(b.shape[1])
+
+    matched1 = np.zeros(a.shape, dtype=bool)
+    matched2 = np.zeros(b.shape, dtype=bool)
+    for i in range(int(len1.max())):
+        start = np.maximum(0, i - max_dist)
+        end = np.minimum(i + max_dist + 1, len2)
+        candidates = (
+            (b == a[:, i:i + 1])
+            & ~matched2
+            & (positions >= start[:, None])
+            & (positions < end[:, None])
+        )
+        hit = np.flatnonzero(candidates.any(axis=1))
+        if hit.size:
+            first = candidates[hit].argmax(axis=1)
+            matched1[hit, i] = True
+            matched2[hit, first] = True
+
+    match = matched1.sum(axis=1)
+
+    # Transpositions: compare the k-th matched character of each string
+    width = max(a.shape[1], b.shape[1])
+    ordered1 = np.full((rows, width), -1, dtype=np.int64)
+    ordered2 = np.full((rows, width), -1, dtype=np.int64)
+    r, c = np.nonzero(matched1)
+    ordered1[r, (np.cumsum(matched1, axis=1) - 1)[r, c]] = a[r, c]
+    r, c = np.nonzero(matched2)
+    ordered2[r, (np.cumsum(matched2, axis=1) - 1)[r, c]] = b[r, c]
+    t = (ordered1 != ordered2).sum(axis=1) / 2
+
+    safe_match = np.maximum(match, 1)
+    jaro = (match / len1 + match / len2 + (match - t) / safe_match) / 3
+
+    prefix = np.cumprod(a[:, :4] == b[:, :4], axis=1).sum(axis=1)
+    return np.where(match > 0, jaro + 0.1 * prefix * (1 - jaro), 0.0)
+
+
 def jaccard_ratio(a: Iterable[str], b: Iterable[str]) -> float:
     set_a = set(filter(None, a))
     set_b = set(filter(None, b))
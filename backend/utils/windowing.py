@@ -1,21 +1,82 @@
-"""Window helpers for attendance calculations."""
+"""Window helpers for attendance calculations.
+
+A window of ``days`` ending at ``anchor`` holds the values ``v`` with
+``0 <= (anchor - v).days < days``, i.e. ``anchor - days < v <= anchor``.
+Over sorted values that is a contiguous index range, so the helpers below
+find it by binary search (one anchor), two pointers (every position as the
+anchor) or vectorized searchsorted (many anchors) instead of scanning or
+copying.
+"""
 
 from __future__ import annotations
 
+from bisect import bisect_right
 from datetime import date, datetime, timedelta
-from typing import Iterable, List
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 
 def rolling_window(dates: Iterable[datetime], days: int) -> List[List[datetime]]:
+    """The window ending at each date, as lists (prefer window_ranges)."""
     sorted_dates = sorted(dates)
-    windows: List[List[datetime]] = []
+    return [sorted_dates[start:end] for start, end in window_ranges(sorted_dates, days)]
+
+
+def window_ranges(sorted_dates: Sequence[date], days: int) -> Iterator[Tuple[int, int]]:
+    """Index range ``[start, end)`` of the window ending at each position.
+
+    Two pointers over dates sorted ascending: O(n) overall and no copies.
+    As in rolling_window, the window for position ``i`` ends at ``i + 1``.
+    """
     start = 0
     for idx, current in enumerate(sorted_dates):
         while start <= idx and (current - sorted_dates[start]).days >= days:
             start += 1
-        windows.append(sorted_dates[start : idx + 1])
-    return windows
+        yield start, idx + 1
+
+
+def window_bounds(
+    sorted_dates: Sequence[Any],
+    window_days: int,
+    anchor: date,
+    key: Optional[Callable[[Any], date]] = None,
+) -> Tuple[int, int]:
+    """Index range ``[start, end)`` of the items in the window ending at ``anchor``.
+
+    Args:
+        sorted_dates: Dates, or items sorted ascending by ``key``
+        window_days: Window length in days
+        anchor: Last day of the window
+        key: Date of an item, when the items aren't dates themselves
+    """
+    start = bisect_right(sorted_dates, anchor - timedelta(days=window_days), key=key)
+    end = bisect_right(sorted_dates, anchor, key=key)
+    return start, max(start, end)
 
 
 def count_in_window(dates: Iterable[date], window_days: int, anchor: date) -> int:
+    """Number of dates in the window ending at ``anchor`` (any order)."""
     return sum(1 for d in dates if 0 <= (anchor - d).days < window_days)
+
+
+def count_in_sorted_window(sorted_dates: Sequence[date], window_days: int, anchor: date) -> int:
+    """count_in_window for dates sorted ascending, in O(log n)."""
+    start, end = window_bounds(sorted_dates, window_days, anchor)
+    return end - start
+
+
+def window_starts(sorted_values: np.ndarray, anchors: np.ndarray, window: int) -> np.ndarray:
+    """Index of the first value in the window ending at each anchor.
+
+    Values and anchors are integers on the same scale (date ordinals, or
+    ordinals offset per group so that groups don't overlap).
+    """
+    return np.searchsorted(sorted_values, np.asarray(anchors) - window, side="right")
+
+
+def counts_in_windows(sorted_values: np.ndarray, anchors: np.ndarray, window: int) -> np.ndarray:
+    """Number of values in the window ending at each anchor, for many anchors at once."""
+    anchors = np.asarray(anchors)
+    ends = np.searchsorted(sorted_values, anchors, side="right")
+    return np.maximum(ends - window_starts(sorted_values, anchors, window), 0)
@@ -5,12 +5,14 @@ from __future__ import annotations
 from typing import Any, Dict, Iterable, Optional
 
 from ..clients.firestore import FirestoreClient
-from ..utils.issues import IssuePayload
+from ..utils.issues import IssuePayload, IssueScope
+from .run_log_buffer import RUN_LOG_BUFFERED, RUN_LOG_FLUSH_TIMEOUT_SECONDS, RunLogBuffer
 
 
 class FirestoreWriter:
-    def __init__(self, client: FirestoreClient):
+    def __init__(self, client: FirestoreClient, buffered: bool = RUN_LOG_BUFFERED):
         self._client = client
+        self._log_buffer = RunLogBuffer(client) if buffered else None
 
     def write_run(self, run_id: str, payload: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> None:
         """Write run summary to Firestore.
@@ -113,14 +115,16 @@ class FirestoreWriter:
                         self.write_log(
                             run_id,
                             "info",
-                            f"Checking which issues already exist: {current:,}/{total:,} ({percentage:.1f}%)"
+                            f"Checking which issues already exist: {current:,}/{total:,} ({percentage:.1f}%)",
+                            coalesce_key="write_issues",
                         )
                     else:
                         # During writing phase
                         self.write_log(
                             run_id,
                             "info",
-                            f"Writing issues to Firestore: {current:,}/{total:,} ({percentage:.1f}%)"
+                            f"Writing issues to Firestore: {current:,}/{total:,} ({percentage:.1f}%)",
+                            coalesce_key="write_issues",
                         )
                 except Exception:
                     pass  # Don't fail on logging errors
@@ -130,13 +134,51 @@ class FirestoreWriter:
         new_count, total_count = self._client.record_issues(issue_dicts, progress_callback=progress_callback)
         return new_count
 
-    def write_log(self, run_id: str, level: str, message: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+    def resolve_missing_issues(self, issues: Iterable[IssuePayload], scopes: Iterable[IssueScope], run_id: str) -> int:
+        """Resolve open issues within ``scopes`` that aren't among this run's ``issues``.
+
+        Args:
+            issues: Every issue the run wrote
+            scopes: Entities and rules the run's checks re-evaluated
+            run_id: Run identifier
+
+        Returns:
+            Number of issues resolved
+        """
+        detected = {
+            self._client.issue_doc_id({"rule_id": issue.rule_id, "record_id": issue.record_id})
+            for issue in issues
+        }
+        return self._client.resolve_missing_issues(detected, scopes, run_id)
+
+    def write_log(
+        self,
+        run_id: str,
+        level: str,
+        message: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        coalesce_key: Optional[str] = None,
+    ) -> None:
         """Write a log entry to Firestore for the run.
-        
+
+        Entries are buffered and written in the background (see RunLogBuffer);
+        call flush_logs() when the run ends.
+
         Args:
             run_id: Run identifier
             level: Log level (info, warning, error, debug)
             message: Log message
             metadata: Optional additional metadata
+            coalesce_key: Set for progress messages; a newer message with the
+                same key replaces one that hasn't been written yet
         """
-        self._client.record_run_log(run_id, level, message, metadata)
+        if self._log_buffer is None:
+            self._client.record_run_log(run_id, level, message, metadata)
+        else:
+            self._log_buffer.add(run_id, level, message, metadata, coalesce_key)
+
+    def flush_logs(self, timeout: float = RUN_LOG_FLUSH_TIMEOUT_SECONDS) -> bool:
+        """Wait until every buffered log entry is written; False on timeout."""
+        if self._log_buffer is None:
+            return True
+        return self._log_buffer.flush(timeout)
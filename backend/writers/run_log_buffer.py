@@ -0,0 +1,157 @@
+"""Background buffer for run log entries.
+
+Runs log dozens of milestones plus a progress line per fetched page, and a
+synchronous Firestore add() for each one sits on the run's critical path.
+RunLogBuffer timestamps entries when they are logged and hands them to a
+worker thread that writes them in batches, whenever RUN_LOG_BATCH_SIZE
+entries are waiting or RUN_LOG_FLUSH_INTERVAL_SECONDS have passed.
+
+Progress entries carry a coalesce key: a newer entry with the same key
+replaces one that hasn't been written yet, so a flush writes only the latest
+progress line per key. While RUN_LOG_MAX_PENDING entries are waiting, new
+progress entries are dropped; other entries are always kept.
+
+The worker exits once it has been idle for a flush interval and is started
+again by the next entry. It isn't a daemon thread, so entries still waiting
+at interpreter exit are written before the process ends.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# Buffer run logs (False writes each entry synchronously, as before)
+RUN_LOG_BUFFERED = os.getenv("RUN_LOG_BUFFERED", "true").lower() == "true"
+# Waiting entries that trigger an immediate flush
+RUN_LOG_BATCH_SIZE = int(os.getenv("RUN_LOG_BATCH_SIZE", "100"))
+# Longest an entry waits before it is written (seconds)
+RUN_LOG_FLUSH_INTERVAL_SECONDS = float(os.getenv("RUN_LOG_FLUSH_INTERVAL_SECONDS", "1.0"))
+# Waiting entries above which progress entries are dropped
+RUN_LOG_MAX_PENDING = int(os.getenv("RUN_LOG_MAX_PENDING", "1000"))
+# How long flush() waits for waiting entries to be written (seconds)
+RUN_LOG_FLUSH_TIMEOUT_SECONDS = float(os.getenv("RUN_LOG_FLUSH_TIMEOUT_SECONDS", "10"))
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    run_id: str
+    data: Dict[str, Any]
+
+
+class RunLogBuffer:
+    """Buffers run log entries and writes them with FirestoreClient.record_run_logs."""
+
+    def __init__(
+        self,
+        client: Any,
+        batch_size: int = RUN_LOG_BATCH_SIZE,
+        flush_interval: float = RUN_LOG_FLUSH_INTERVAL_SECONDS,
+        max_pending: int = RUN_LOG_MAX_PENDING,
+    ):
+        self._client = client
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._cond = threading.Condition()
+        self._pending: List[_Entry] = []
+        # (run_id, coalesce key) -> waiting entry it would replace
+        self._latest: Dict[Tuple[str, str], _Entry] = {}
+        # Entries appended / written (or failed) so far, for flush()
+        self._appended = 0
+        self._finished = 0
+        self._flush_requested = False
+        self._worker: Optional[threading.Thread] = None
+        self.dropped = 0
+        self.coalesced = 0
+
+    def add(
+        self,
+        run_id: str,
+        level: str,
+        message: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        coalesce_key: Optional[str] = None,
+    ) -> None:
+        """Queue a log entry; returns without waiting for Firestore."""
+        data: Dict[str, Any] = {
+            "level": level,
+            "message": message,
+            "timestamp": datetime.now(timezone.utc),
+        }
+        if metadata:
+            data.update(metadata)
+
+        with self._cond:
+            if coalesce_key is not None:
+                waiting = self._latest.get((run_id, coalesce_key))
+                if waiting is not None:
+                    waiting.data = data
+                    self.coalesced += 1
+                    return
+                if len(self._pending) >= self._max_pending:
+                    self.dropped += 1
+                    return
+            entry = _Entry(run_id, data)
+            self._pending.append(entry)
+            self._appended += 1
+            if coalesce_key is not None:
+                self._latest[(run_id, coalesce_key)] = entry
+            if len(self._pending) >= self._batch_size:
+                self._cond.notify_all()
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="run-log-writer")
+                self._worker.start()
+
+    def flush(self, timeout: float = RUN_LOG_FLUSH_TIMEOUT_SECONDS) -> bool:
+        """Write every entry queued so far; False if ``timeout`` ran out first."""
+        with self._cond:
+            target = self._appended
+            if self._finished >= target:
+                return True
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._finished >= target, timeout=timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._pending:
+                    self._cond.wait(timeout=self._flush_interval)
+                    if not self._pending:
+                        self._worker = None
+                        return
+                if len(self._pending) < self._batch_size and not self._flush_requested:
+                    self._cond.wait_for(
+                        lambda: len(self._pending) >= self._batch_size or self._flush_requested,
+                        timeout=self._flush_interval,
+                    )
+                batch, self._pending = self._pending, []
+                self._latest.clear()
+                self._flush_requested = False
+
+            self._write(batch)
+            with self._cond:
+                self._finished += len(batch)
+                self._cond.notify_all()
+
+    def _write(self, batch: List[_Entry]) -> None:
+        # One record_run_logs call per run, entries in the order they were logged
+        by_run: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in batch:
+            by_run.setdefault(entry.run_id, []).append(entry.data)
+        for run_id, entries in by_run.items():
+            try:
+                self._client.record_run_logs(run_id, entries)
+            except Exception as exc:
+                # Don't fail the scan if logging fails - just log to console
+                logger.warning(
+                    "Failed to record run logs",
+                    extra={"run_id": run_id, "entries": len(entries), "error": str(exc)},
+                )
@@ -41,7 +41,7 @@ echo "Current environment variables:"
 gcloud run services describe "${SERVICE_NAME}" \
   --region "${REGION}" \
   --project "${PROJECT_ID}" \
-  --format="get(spec.template.spec.containers[0].env)" 2>&1 | grep -E "(AIRTABLE_MIN_REQUEST_INTERVAL|ALLOWED_ORIGINS)" || echo "No relevant env vars found"
+  --format="get(spec.template.spec.containers[0].env)" 2>&1 | grep -E "(AIRTABLE_REQUESTS_PER_SECOND|ALLOWED_ORIGINS)" || echo "No relevant env vars found"
 
 echo ""
 echo "Expected configuration:"
@@ -49,7 +49,7 @@ echo "  Memory: 4Gi"
 echo "  CPU: 2"
 echo "  Concurrency: 80"
 echo "  Timeout: 1800s (30m)"
-echo "  AIRTABLE_MIN_REQUEST_INTERVAL: 0.05"
+echo "  AIRTABLE_REQUESTS_PER_SECOND: 5"
 echo ""
 echo "If these don't match, run: cd deploy && ./redeploy-backend.sh"
 
@@ -35,7 +35,7 @@ echo "Creating nightly job..."
 gcloud scheduler jobs create http integrity-nightly \
     --location=${REGION} \
     --schedule="0 2 * * *" \
-    --uri="${SERVICE_URL}/integrity/run" \
+    --uri="${SERVICE_URL}/integrity/run?mode=incremental" \
     --http-method=POST \
     --oidc-service-account-email=${INVOKER_SA} \
     --oidc-token-audience=${SERVICE_URL} \
@@ -51,7 +51,7 @@ gcloud scheduler jobs create http integrity-nightly \
     2>/dev/null || gcloud scheduler jobs update http integrity-nightly \
     --location=${REGION} \
     --schedule="0 2 * * *" \
-    --uri="${SERVICE_URL}/integrity/run" \
+    --uri="${SERVICE_URL}/integrity/run?mode=incremental" \
     --http-method=POST \
     --oidc-service-account-email=${INVOKER_SA} \
     --oidc-token-audience=${SERVICE_URL} \
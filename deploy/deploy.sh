@@ -274,7 +274,7 @@ if [ "$DEPLOY_BACKEND" = true ]; then
         "--min-instances" "0"
         "--max-instances" "10"
         "--concurrency" "80"
-        "--set-env-vars" "ALLOWED_ORIGINS=${ALLOWED_ORIGINS:-*},AIRTABLE_MIN_REQUEST_INTERVAL=0.05"
+        "--set-env-vars" "ALLOWED_ORIGINS=${ALLOWED_ORIGINS:-*},AIRTABLE_REQUESTS_PER_SECOND=5"
         "--set-secrets" "AIRTABLE_PAT=AIRTABLE_PAT:latest"
         "--set-secrets" "API_AUTH_TOKEN=API_AUTH_TOKEN:latest"
         "--set-secrets" "OPENAI_API_KEY=OPENAI_API_KEY:latest"
@@ -308,7 +308,7 @@ if [ "$DEPLOY_BACKEND" = true ]; then
             "--min-instances" "0"
             "--max-instances" "10"
             "--concurrency" "80"
-            "--set-env-vars" "ALLOWED_ORIGINS=${ALLOWED_ORIGINS:-*},AIRTABLE_MIN_REQUEST_INTERVAL=0.05"
+            "--set-env-vars" "ALLOWED_ORIGINS=${ALLOWED_ORIGINS:-*},AIRTABLE_REQUESTS_PER_SECOND=5"
             "--set-secrets" "AIRTABLE_PAT=AIRTABLE_PAT:latest"
             "--set-secrets" "API_AUTH_TOKEN=API_AUTH_TOKEN:latest"
             "--set-secrets" "OPENAI_API_KEY=OPENAI_API_KEY:latest"
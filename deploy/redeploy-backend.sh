@@ -47,7 +47,7 @@ gcloud run deploy "${SERVICE_NAME}" \
   --min-instances 0 \
   --max-instances 10 \
   --concurrency 80 \
-  --set-env-vars "ALLOWED_ORIGINS=*,AIRTABLE_MIN_REQUEST_INTERVAL=0.05" \
+  --set-env-vars "ALLOWED_ORIGINS=*,AIRTABLE_REQUESTS_PER_SECOND=5" \
   --set-secrets "AIRTABLE_PAT=AIRTABLE_PAT:latest" \
   --set-secrets "API_AUTH_TOKEN=API_AUTH_TOKEN:latest" \
   --set-secrets "OPENAI_API_KEY=OPENAI_API_KEY:latest" \